@@ -0,0 +1,213 @@
+#!/usr/bin/env python3.11
+"""
+Benchmarks for the hot paths of the game, with a stored baseline.
+
+Each benchmark reports the best time per operation over a few repeats. Results
+can be saved as a baseline, and later runs flag any benchmark that got slower
+than the baseline by more than the threshold (and exit with status 1):
+
+    python3 ./benchmarks/bench.py --save          # record a baseline
+    python3 ./benchmarks/bench.py                 # compare against it
+    python3 ./benchmarks/bench.py --quick -k deal # small sizes, matching names only
+
+Baselines depend on the machine, so compare runs from the same machine only.
+"""
+
+import argparse
+import json
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+from poker_game import Deck, PokerEngine, PokerHand  # noqa: E402
+from simulate import keep_pairs  # noqa: E402
+
+DEFAULT_BASELINE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "baseline.json")
+DEFAULT_THRESHOLD = 0.2
+HAND_SIZES = (1, 10_000, 1_000_000)
+QUICK_HAND_SIZES = (1, 10_000)
+PLAYER_COUNTS = (2, 6, 10)
+GAMES = 2_000
+QUICK_GAMES = 200
+REPEATS = 3
+
+# Larger sizes cycle through this many distinct hands so memory stays small.
+POOL_SIZE = 10_000
+
+
+def _hands(count: int, seed: int = 0) -> list[PokerHand]:
+    deck = Deck(random.Random(seed))
+    hands = []
+    for _ in range(min(count, POOL_SIZE)):
+        deck.reset_deck()
+        hands.append(PokerHand(deck.random_deal(5)))
+    return hands
+
+
+def _best_time(run, repeats: int) -> float:
+    best = float("inf")
+    for _ in range(repeats):
+        start = time.perf_counter()
+        run()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def bench_best_hand(size: int) -> tuple:
+    hands = _hands(size)
+    rounds, rest = divmod(size, len(hands))
+
+    def run():
+        for _ in range(rounds):
+            for hand in hands:
+                hand.best_hand()
+        for hand in hands[:rest]:
+            hand.best_hand()
+
+    return run, size
+
+
+def bench_compare(size: int) -> tuple:
+    hands = _hands(size + 1)
+    pairs = list(zip(hands, hands[1:] + hands[:1]))
+    rounds = max(1, size // len(pairs))
+
+    def run():
+        for _ in range(rounds):
+            for a, b in pairs:
+                a > b  # noqa: B015
+                a == b  # noqa: B015
+
+    return run, rounds * len(pairs)
+
+
+def bench_random_deal(size: int) -> tuple:
+    deck = Deck(random.Random(1))
+
+    def run():
+        for _ in range(size):
+            deck.reset_deck()
+            deck.random_deal(5)
+
+    return run, size
+
+
+def bench_random_deal_one(size: int) -> tuple:
+    deck = Deck(random.Random(2))
+
+    def run():
+        for _ in range(size):
+            deck.reset_deck()
+            for _ in range(10):
+                deck.random_deal_one()
+
+    return run, size * 10
+
+
+def bench_winners(players: int, games: int) -> tuple:
+    engine = PokerEngine(False, [f"Player{i}" for i in range(players)], rng=random.Random(3))
+    engine.deal_cards(5)
+
+    def run():
+        for _ in range(games):
+            engine.winners()
+
+    return run, games
+
+
+def bench_game(players: int, games: int, variant: str) -> tuple:
+    names = [f"Player{i}" for i in range(players)]
+    engine = PokerEngine(variant == "draw", names, rng=random.Random(4), holdem=variant == "holdem")
+    discards = keep_pairs if variant == "draw" else None
+
+    def run():
+        for _ in range(games):
+            engine.play(discards)
+
+    return run, games
+
+
+def benchmarks(quick: bool = False) -> dict:
+    """Return the benchmarks by name, each a function building (run, operations)."""
+    sizes = QUICK_HAND_SIZES if quick else HAND_SIZES
+    games = QUICK_GAMES if quick else GAMES
+    cases = {}
+    for size in sizes:
+        cases[f"best_hand[{size}]"] = lambda size=size: bench_best_hand(size)
+        cases[f"compare[{size}]"] = lambda size=size: bench_compare(size)
+        cases[f"random_deal[{size}]"] = lambda size=size: bench_random_deal(size)
+        cases[f"random_deal_one[{size}]"] = lambda size=size: bench_random_deal_one(size)
+    for players in PLAYER_COUNTS:
+        cases[f"winners[{players} players]"] = lambda players=players: bench_winners(players, games * 10)
+        cases[f"stud_game[{players} players]"] = lambda players=players: bench_game(players, games, "stud")
+        cases[f"holdem_game[{players} players]"] = lambda players=players: bench_game(players, games, "holdem")
+        if players <= 6:
+            cases[f"draw_game[{players} players]"] = lambda players=players: bench_game(players, games, "draw")
+    return cases
+
+
+def run_benchmarks(quick: bool = False, pattern: str | None = None, repeats: int = REPEATS, out=sys.stdout) -> dict:
+    """Run the benchmarks whose names contain pattern and return seconds per operation by name."""
+    results = {}
+    for name, build in benchmarks(quick).items():
+        if pattern and pattern not in name:
+            continue
+        run, operations = build()
+        results[name] = _best_time(run, repeats) / operations
+        print(f"{name:<32}{results[name] * 1e9:>14,.0f} ns/op", file=out)
+    return results
+
+
+def compare(results: dict, baseline: dict, threshold: float = DEFAULT_THRESHOLD) -> list[tuple[str, float]]:
+    """Return (name, slowdown) for each benchmark slower than its baseline by more than threshold."""
+    regressions = []
+    for name, seconds in results.items():
+        base = baseline.get(name)
+        if base and seconds > base * (1 + threshold):
+            regressions.append((name, seconds / base - 1))
+    return regressions
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark the game's hot paths against a stored baseline.")
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE, help="baseline JSON file")
+    parser.add_argument("--save", action="store_true", help="save the results as the new baseline")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD, help="allowed slowdown, e.g. 0.2 = 20%%")
+    parser.add_argument("--quick", action="store_true", help="skip the largest sizes and play fewer games")
+    parser.add_argument("-k", dest="pattern", help="only run benchmarks whose names contain this")
+    parser.add_argument("--repeats", type=int, default=REPEATS, help="runs per benchmark, the best is kept")
+    args = parser.parse_args(argv)
+
+    results = run_benchmarks(args.quick, args.pattern, args.repeats)
+
+    if args.save:
+        baseline = {}
+        if os.path.exists(args.baseline):
+            with open(args.baseline, encoding="utf-8") as f:
+                baseline = json.load(f)
+        baseline.update(results)
+        with open(args.baseline, "w", encoding="utf-8") as f:
+            json.dump(baseline, f, indent=2, sort_keys=True)
+        print(f"\nSaved {len(results)} results to {args.baseline}")
+        return 0
+
+    if not os.path.exists(args.baseline):
+        print(f"\nNo baseline at {args.baseline}; run with --save to create one.")
+        return 0
+    with open(args.baseline, encoding="utf-8") as f:
+        baseline = json.load(f)
+    regressions = compare(results, baseline, args.threshold)
+    if not regressions:
+        print(f"\nNo regressions beyond {args.threshold:.0%} of the baseline.")
+        return 0
+    print(f"\n{len(regressions)} regression(s) beyond {args.threshold:.0%} of the baseline:")
+    for name, slowdown in regressions:
+        print(f"  {name:<32}{slowdown:>+8.0%}")
+    return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
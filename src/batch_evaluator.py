@@ -0,0 +1,129 @@
+"""
+Vectorized NumPy evaluator for scoring many 5-card hands at once.
+
+Hands are given as an (N, 5) integer array of card ids (0 = 2♣ ... 51 = A♠, see
+Card.id) and scored with tables built from the evaluator module's, so the
+strengths agree with PokerHand.strength and decode with evaluator.CATEGORIES and
+evaluator.HAND_VALUES. Each card has a key, and the sum of a hand's five keys
+gives both its ranks and whether it is a flush, so scoring is one gather, four
+additions and two table lookups per hand.
+"""
+
+from collections import Counter
+from itertools import combinations_with_replacement
+from math import comb, prod
+
+import numpy as np
+
+import evaluator
+from poker_game import Card
+
+# Rows scored per block so the temporaries stay in cache.
+BLOCK_SIZE = 1 << 14
+
+# Rank weights chosen greedily, each the smallest that keeps the sums of every
+# 5-card rank multiset distinct, so a hand's ranks are identified by one sum.
+RANK_WEIGHTS = (0, 1, 5, 22, 94, 312, 992, 2422, 5624, 12522, 19998, 43258, 79415)
+# Rank sums fit below bit 19; above it each suit counts its cards in 3 bits.
+SUIT_SHIFT = 19
+FLUSH_OFFSET = 1 << SUIT_SHIFT
+
+# Each card's key; summing the five keys of a hand gives its rank sum and suit counts.
+KEYS = np.array([RANK_WEIGHTS[i >> 2] + (1 << (SUIT_SHIFT + 3 * (i & 3))) for i in range(52)], dtype=np.uint32)
+# FLUSH_OFFSET for suit counts with all five cards in one suit, otherwise 0.
+FLUSH_BITS = np.zeros(1 << 12, dtype=np.uint32)
+FLUSH_BITS[[5 << (3 * suit) for suit in range(4)]] = FLUSH_OFFSET
+CATEGORIES = np.array(evaluator.CATEGORIES, dtype=np.uint8)
+
+# BINOMIALS[k, n] is C(n, k), for rank table indexes.
+BINOMIALS = np.array([[comb(n, k) for n in range(52)] for k in range(6)], dtype=np.intp)
+
+# Strengths by rank sum, then by rank sum + FLUSH_OFFSET for flushes.
+SUM_TABLE = np.zeros(2 * FLUSH_OFFSET, dtype=np.uint16)
+
+
+def _build_sum_table() -> None:
+    sums = set()
+    for ranks in combinations_with_replacement(range(13), 5):
+        if max(Counter(ranks).values()) > 4:
+            continue
+        key = sum(RANK_WEIGHTS[rank] for rank in ranks)
+        assert key not in sums, "Rank weights must give every rank multiset its own sum"
+        sums.add(key)
+        if len(set(ranks)) == 5:
+            mask = sum(1 << rank for rank in ranks)
+            SUM_TABLE[key] = evaluator.UNIQUE5_TABLE[mask]
+            SUM_TABLE[key + FLUSH_OFFSET] = evaluator.FLUSH_TABLE[mask]
+        else:
+            SUM_TABLE[key] = evaluator.PRODUCT_TABLE[prod(evaluator.PRIMES[rank] for rank in ranks)]
+
+
+_build_sum_table()
+
+
+def card_ids(hands: list[list[Card]]) -> np.ndarray:
+    """Return the (N, 5) card id array for a list of 5-card hands."""
+    return np.array([[card.id for card in hand] for hand in hands], dtype=np.uint8)
+
+
+def _repeated_row(ids: np.ndarray) -> int:
+    # The first row holding a card twice, or -1. Ten column comparisons measured
+    # cheaper than OR-ing each row's card bits into a mask and counting them.
+    columns = ids.T
+    repeated = np.zeros(len(ids), dtype=bool)
+    for i in range(5):
+        for j in range(i + 1, 5):
+            repeated |= columns[i] == columns[j]
+    return int(np.argmax(repeated)) if repeated.any() else -1
+
+
+def _evaluate_block(ids: np.ndarray, out: np.ndarray) -> None:
+    keys = KEYS[ids]
+    k1, k2, k3, k4, k5 = keys.T
+    total = k1 + k2
+    total += k3
+    total += k4
+    total += k5
+    index = total & (FLUSH_OFFSET - 1)
+    index |= FLUSH_BITS[total >> SUIT_SHIFT]
+    out[:] = SUM_TABLE[index]
+
+
+def _lookup_block(ids: np.ndarray, out: np.ndarray, strengths: np.ndarray) -> None:
+    c = np.sort(ids, axis=1).astype(np.intp)
+    index = BINOMIALS[1, c[:, 0]] + BINOMIALS[2, c[:, 1]] + BINOMIALS[3, c[:, 2]]
+    index += BINOMIALS[4, c[:, 3]] + BINOMIALS[5, c[:, 4]]
+    out[:] = strengths[index]
+
+
+def evaluate_batch(ids: np.ndarray, table=None) -> np.ndarray:
+    """
+    Return the strengths of an (N, 5) array of card ids as an (N,) uint16 array.
+
+    Strengths run from 1 (worst) to 7462 (royal flush) exactly as PokerHand.strength.
+    Raises ValueError if a row repeats a card.
+    If a rank_table.RankTable is given, each hand is a single index computation and
+    read from the memory-mapped table instead.
+    """
+    ids = np.asarray(ids)
+    if ids.ndim != 2 or ids.shape[1] != 5:
+        raise ValueError(f"Expected an (N, 5) array of card ids, got shape {ids.shape}")
+    if ids.size and (ids.min() < 0 or ids.max() > 51):
+        raise ValueError("Card ids must be between 0 and 51")
+
+    out = np.empty(len(ids), dtype=np.uint16)
+    for start in range(0, len(ids), BLOCK_SIZE):
+        block = ids[start : start + BLOCK_SIZE]
+        row = _repeated_row(block)
+        if row >= 0:
+            raise ValueError(f"A card cannot appear twice in a hand (row {start + row})")
+        if table is None:
+            _evaluate_block(block, out[start : start + BLOCK_SIZE])
+        else:
+            _lookup_block(block, out[start : start + BLOCK_SIZE], table.arrays()[0])
+    return out
+
+
+def categories_batch(strengths: np.ndarray) -> np.ndarray:
+    """Return the hand categories (HIGH_CARD ... ROYAL_FLUSH) for an array of strengths."""
+    return CATEGORIES[strengths]
@@ -0,0 +1,191 @@
+"""
+Suit-isomorphism canonicalization of hands.
+
+Poker ranks no suit above another, so hands that differ only by a permutation of
+the suits (A♥ K♥ and A♠ K♠, say) have the same strength, the same discard
+values and the same equities. canonicalize() maps a hand to one representative
+of its class, the canonical hand, and says how many hands the class holds, so a
+computation can run once per class and be weighted by the multiplicity: 134,459
+classes cover all 2,598,960 five-card hands.
+
+Cards are card ids (0-51, rank-major with the suits in Card.SUIT_ORDER, see
+Card.id) or any objects with an id, such as Card. The canonical hand is the
+relabelling of the suits whose sorted card ids are smallest.
+
+Dead or known cards (a board, exposed stud cards, cards already folded) break
+the symmetry between suits. Passing them as dead canonicalizes the hand together
+with them: two hands are equivalent only if one permutation maps both the hand
+and the dead cards onto the other's. The dead cards are canonicalized first, so
+hands that share canonical dead cards get those same dead cards back. Known cards
+that belong to different owners, such as each player's exposed cards, are passed
+as separate groups in known, so that no relabelling moves a card between owners.
+"""
+
+from itertools import combinations, permutations
+from math import factorial
+
+import evaluator
+
+NUM_RANKS = 13
+NUM_SUITS = len(evaluator.SUIT_BITS)
+
+# Rank masks with their bit order reversed, so that comparing reversed masks compares
+# suits by their lowest ranks first, as comparing sorted card ids does.
+_REVERSED = tuple(int(f"{mask:0{NUM_RANKS}b}"[::-1], 2) for mask in range(1 << NUM_RANKS))
+
+
+def card_ids(cards) -> list[int]:
+    """Return the ids of cards given as card ids or objects with an id."""
+    return [card if isinstance(card, int) else card.id for card in cards]
+
+
+class CanonicalHand:
+    """
+    The canonical representative of a hand's suit-isomorphism class.
+
+    Attributes:
+        ids (tuple[int, ...]): Canonical card ids of the hand, ascending
+        dead (tuple[int, ...]): Canonical card ids of the dead cards, ascending
+        multiplicity (int): Number of different hands that are in this class alongside
+            the same dead cards (1-24; with no dead cards, the size of the class)
+        order (tuple[int, ...]): order[i] is the position in the given hand of the card
+            that became ids[i]
+        suits (tuple[int, ...]): suits[s] is the canonical suit given to suit index s
+        known (tuple[tuple[int, ...], ...]): Canonical card ids of each group of known cards, ascending
+    """
+
+    def __init__(
+        self,
+        ids: tuple[int, ...],
+        dead: tuple[int, ...],
+        multiplicity: int,
+        order: tuple[int, ...],
+        suits: tuple[int, ...],
+        known: tuple[tuple[int, ...], ...] = (),
+    ) -> None:
+        self.ids = ids
+        self.dead = dead
+        self.multiplicity = multiplicity
+        self.order = order
+        self.suits = suits
+        self.known = known
+
+    @property
+    def key(self) -> int:
+        """The canonical card ids packed 6 bits each, smallest in the lowest bits."""
+        key = 0
+        for card in reversed(self.ids):
+            key = (key << 6) | card
+        return key
+
+    def map(self, cards) -> list[int]:
+        """Return the ids of other cards under the same relabelling of suits."""
+        suits = self.suits
+        return [(card & ~3) | suits[card & 3] for card in card_ids(cards)]
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, CanonicalHand):
+            return NotImplemented
+        return self.ids == other.ids and self.dead == other.dead and self.known == other.known
+
+    def __hash__(self) -> int:
+        return hash((self.ids, self.dead, self.known))
+
+    def __repr__(self) -> str:
+        return f"CanonicalHand({list(self.ids)}, dead={list(self.dead)}, multiplicity={self.multiplicity})"
+
+
+def canonicalize(cards, dead=(), known=()) -> CanonicalHand:
+    """
+    Return the canonical form of a hand, with optional dead cards, and its multiplicity.
+
+    known is a sequence of card groups kept apart from each other and from dead.
+    Raises ValueError if a card appears twice.
+    """
+    ids = card_ids(cards)
+    groups = [card_ids(dead), *(card_ids(group) for group in known)]
+    num_cards = len(ids) + sum(len(group) for group in groups)
+    if len(set(ids).union(*groups)) != num_cards:
+        raise ValueError("A card cannot appear twice.")
+
+    # Each suit's signature packs its reversed rank mask in every group, dead cards
+    # first and the hand last. The smallest sorted ids give suit 0 to the suit holding
+    # the lowest cards, and so on, so suits are ordered by signature, largest first.
+    # Suits with equal signatures can be swapped without changing anything.
+    group_signatures = [0] * NUM_SUITS
+    for group in groups:
+        masks = [0] * NUM_SUITS
+        for card in group:
+            masks[card & 3] |= 1 << (card >> 2)
+        for s in range(NUM_SUITS):
+            group_signatures[s] = (group_signatures[s] << NUM_RANKS) | _REVERSED[masks[s]]
+    hand_masks = [0] * NUM_SUITS
+    for card in ids:
+        hand_masks[card & 3] |= 1 << (card >> 2)
+    signatures = [(group_signatures[s] << NUM_RANKS) | _REVERSED[hand_masks[s]] for s in range(NUM_SUITS)]
+
+    by_signature = sorted(range(NUM_SUITS), key=signatures.__getitem__, reverse=True)
+    suits = [0] * NUM_SUITS
+    for canonical_suit, suit in enumerate(by_signature):
+        suits[suit] = canonical_suit
+
+    mapped = sorted(((card & ~3) | suits[card & 3], pos) for pos, card in enumerate(ids))
+    canonical_groups = [tuple(sorted((card & ~3) | suits[card & 3] for card in group)) for group in groups]
+    return CanonicalHand(
+        tuple(card for card, _ in mapped),
+        canonical_groups[0],
+        _symmetries(group_signatures) // _symmetries(signatures),
+        tuple(pos for _, pos in mapped),
+        tuple(suits),
+        tuple(canonical_groups[1:]),
+    )
+
+
+def _symmetries(signatures) -> int:
+    # Number of suit permutations that leave every suit's signature unchanged.
+    count = 1
+    for signature in set(signatures):
+        count *= factorial(signatures.count(signature))
+    return count
+
+
+def canonical_hands(size: int, dead=(), known=()):
+    """
+    Yield the CanonicalHand of every class of size-card hands drawn from the cards not
+    in dead or known.
+
+    The multiplicities add up to the number of such hands. The dead and known cards are
+    canonicalized first, so the hands are drawn alongside the canonical dead and known cards.
+    """
+    base = canonicalize((), dead, known)
+    groups = (base.dead, *base.known)
+    used = set(base.dead).union(*base.known)
+    live = [card for card in range(NUM_RANKS * NUM_SUITS) if card not in used]
+    identity = tuple(range(NUM_SUITS))
+
+    # The relabellings that leave the dead and known cards unchanged, as card id maps.
+    # A hand is canonical if none of them makes it smaller, and its multiplicity is its
+    # number of distinct images.
+    relabellings = []
+    for suits in permutations(range(NUM_SUITS)):
+        relabel = [(card & ~3) | suits[card & 3] for card in range(NUM_RANKS * NUM_SUITS)]
+        if suits != identity and all(tuple(sorted(relabel[card] for card in group)) == group for group in groups):
+            relabellings.append(relabel)
+
+    order = tuple(range(size))
+    # Checking many relabellings costs more than canonicalizing directly.
+    if len(relabellings) >= 6:
+        for hand in combinations(live, size):
+            canonical = canonicalize(hand, base.dead, base.known)
+            if canonical.ids == hand:
+                yield canonical
+        return
+    for hand in combinations(live, size):
+        images = {hand}
+        for relabel in relabellings:
+            image = tuple(sorted(relabel[card] for card in hand))
+            if image < hand:
+                break
+            images.add(image)
+        else:
+            yield CanonicalHand(hand, base.dead, len(images), order, identity, base.known)
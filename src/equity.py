@@ -0,0 +1,507 @@
+"""
+Monte Carlo and exact equity engines for 5-card stud and 5-card draw.
+
+Given each player's known cards (anywhere from none to a full hand), the engine
+deals random completions from the rest of the deck, scores every hand with the
+same tables as PokerHand and counts how often each player wins, ties or loses.
+Trials are split into chunks that run on a process pool; workers only exchange
+card codes and win/tie/loss counts, never Card or PokerHand objects.
+
+Every block of STREAM_BLOCK trials draws from its own child of a single
+SeedSequence, so a seeded run gives identical counts however the blocks are
+grouped into chunks or spread across processes.
+
+exact_equity() instead enumerates every way the rest of the deck can complete the
+hands and returns exact counts, as ground truth for the simulation. Completions
+of the first drawing player that differ only by a permutation of suits (among the
+suits the known cards leave interchangeable) are enumerated once and weighted by
+their multiplicity. The last player's completions are never enumerated per
+deal. Either their strengths are tabulated once, and the ones that are still
+possible after the other players' draws are counted by inclusion-exclusion over
+the cards those players drew, or they are counted by rank multiset from the
+cards left of each rank, with flushes corrected suit by suit. The cheaper of the
+two is picked for each spot.
+"""
+
+import os
+import random
+from bisect import bisect_left, bisect_right
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
+from fractions import Fraction
+from functools import lru_cache
+from itertools import accumulate, combinations, combinations_with_replacement
+from math import comb, prod
+
+import evaluator
+from canonical import canonical_hands, canonicalize
+from poker_game import CARDS, Card
+from seeding import SeedSequence
+
+STUD = "stud"
+DRAW = "draw"
+
+# Player limits match PokerGame.
+MAX_PLAYERS = {STUD: 10, DRAW: 6}
+MAX_DISCARDS = 3
+HAND_SIZE = 5
+NUM_RANKS = 13
+NUM_SUITS = 4
+
+# Number of trials drawn from each random stream.
+STREAM_BLOCK = 1024
+
+# Canonical first draws per task sent to a worker process by exact_equity.
+EXACT_CHUNK = 512
+
+# Rough cost, in table lookups, of counting the last player's completions by rank for
+# one deal, used to pick a method.
+RANK_STEP = 6
+
+_CODES = tuple(card.code for card in CARDS)
+
+
+class EquityResult:
+    """
+    Win, tie and loss counts for each player over a number of trials.
+
+    Attributes:
+        trials (int): Number of simulated deals
+        wins (list[int]): Trials each player won outright
+        ties (list[int]): Trials each player shared the best hand
+        losses (list[int]): Trials each player lost
+    """
+
+    def __init__(self, wins: list[int], ties: list[int], losses: list[int], trials: int) -> None:
+        self.wins = wins
+        self.ties = ties
+        self.losses = losses
+        self.trials = trials
+
+    def win_rate(self, player: int) -> float:
+        return self.wins[player] / self.trials
+
+    def tie_rate(self, player: int) -> float:
+        return self.ties[player] / self.trials
+
+    def loss_rate(self, player: int) -> float:
+        return self.losses[player] / self.trials
+
+    def win_fraction(self, player: int) -> Fraction:
+        return Fraction(self.wins[player], self.trials)
+
+    def tie_fraction(self, player: int) -> Fraction:
+        return Fraction(self.ties[player], self.trials)
+
+    def loss_fraction(self, player: int) -> Fraction:
+        return Fraction(self.losses[player], self.trials)
+
+    def merge(self, other: "EquityResult") -> "EquityResult":
+        return EquityResult(
+            [a + b for a, b in zip(self.wins, other.wins)],
+            [a + b for a, b in zip(self.ties, other.ties)],
+            [a + b for a, b in zip(self.losses, other.losses)],
+            self.trials + other.trials,
+        )
+
+
+def _simulate_chunk(
+    known: tuple[tuple[int, ...], ...], stub: tuple[int, ...], blocks: list[tuple[int, int]]
+) -> tuple[list[int], list[int], list[int]]:
+    num_players = len(known)
+    wins = [0] * num_players
+    ties = [0] * num_players
+    losses = [0] * num_players
+    missing = [HAND_SIZE - len(cards) for cards in known]
+    needed = sum(missing)
+    evaluate5 = evaluator.evaluate5
+
+    for seed, trials in blocks:
+        rng = random.Random(seed)
+        for _ in range(trials):
+            dealt = rng.sample(stub, needed)
+            strengths = []
+            pos = 0
+            for cards, count in zip(known, missing):
+                strengths.append(evaluate5(*cards, *dealt[pos : pos + count]))
+                pos += count
+
+            best = max(strengths)
+            num_best = strengths.count(best)
+            for player, strength in enumerate(strengths):
+                if strength != best:
+                    losses[player] += 1
+                elif num_best == 1:
+                    wins[player] += 1
+                else:
+                    ties[player] += 1
+
+    return wins, ties, losses
+
+
+def _known_cards(hands, variant, discards, dead) -> tuple[list[list[Card]], set[Card]]:
+    # Checks the players' cards and returns the cards each player keeps and every card out of the deck.
+    if variant not in MAX_PLAYERS:
+        raise ValueError(f"Unknown variant: {variant}")
+    if not 2 <= len(hands) <= MAX_PLAYERS[variant]:
+        raise ValueError(f"There must be 2 to {MAX_PLAYERS[variant]} players in a game of 5 card {variant}.")
+    if discards is not None and variant != DRAW:
+        raise ValueError("Only 5 card draw allows discards.")
+
+    discards = discards or [[] for _ in hands]
+    if len(discards) != len(hands):
+        raise ValueError("discards must have one entry per player.")
+
+    held = []
+    for hand, traded in zip(hands, discards):
+        if len(hand) > HAND_SIZE:
+            raise ValueError(f"A hand cannot have more than {HAND_SIZE} cards.")
+        if len(traded) > MAX_DISCARDS:
+            raise ValueError(f"A player cannot trade more than {MAX_DISCARDS} cards.")
+        if any(card not in hand for card in traded):
+            raise ValueError("A player can only trade cards from their own hand.")
+        held.append([card for card in hand if card not in traded])
+
+    used = [card for hand in hands for card in hand] + list(dead or [])
+    used_set = set(used)
+    if len(used_set) != len(used):
+        raise ValueError("A card cannot appear more than once.")
+    return held, used_set
+
+
+def equity(
+    hands: list[list[Card]],
+    variant: str = STUD,
+    discards: list[list[Card]] | None = None,
+    dead: list[Card] | None = None,
+    trials: int = 100_000,
+    chunk_size: int = 10_000,
+    processes: int | None = None,
+    seed: int | SeedSequence | None = None,
+) -> EquityResult:
+    """
+    Estimate each player's win, tie and loss frequencies by simulation.
+
+    Args:
+        hands: The known cards of each player, 0 to 5 cards per player.
+        variant: STUD or DRAW.
+        discards: For DRAW, the known cards each player trades in (at most 3). Traded
+            cards are dead and are replaced by random cards.
+        dead: Other cards known to be out of the deck.
+        trials: Number of deals to simulate.
+        chunk_size: Number of trials per task sent to a worker process, rounded up to
+            a multiple of STREAM_BLOCK.
+        processes: Number of worker processes; defaults to the CPU count. With 1
+            the simulation runs in the calling process.
+        seed: Root seed for reproducible results, or a SeedSequence to draw from.
+    """
+    if trials < 1 or chunk_size < 1:
+        raise ValueError("trials and chunk_size must be positive.")
+    held, used = _known_cards(hands, variant, discards, dead)
+    known = tuple(tuple(card.code for card in cards) for cards in held)
+    stub = tuple(card.code for card in CARDS if card not in used)
+
+    root = seed if isinstance(seed, SeedSequence) else SeedSequence(seed)
+    blocks = [
+        (stream.generate_state(), min(STREAM_BLOCK, trials - start))
+        for stream, start in zip(root.spawn(-(-trials // STREAM_BLOCK)), range(0, trials, STREAM_BLOCK))
+    ]
+    blocks_per_chunk = -(-chunk_size // STREAM_BLOCK)
+    chunks = [blocks[i : i + blocks_per_chunk] for i in range(0, len(blocks), blocks_per_chunk)]
+
+    if processes == 1 or len(chunks) == 1:
+        results = [_simulate_chunk(known, stub, chunk) for chunk in chunks]
+    else:
+        with ProcessPoolExecutor(max_workers=processes or os.cpu_count()) as pool:
+            results = list(pool.map(_simulate_chunk, [known] * len(chunks), [stub] * len(chunks), chunks))
+
+    total = EquityResult([0] * len(hands), [0] * len(hands), [0] * len(hands), 0)
+    for (wins, ties, losses), chunk in zip(results, chunks):
+        total = total.merge(EquityResult(wins, ties, losses, sum(count for _, count in chunk)))
+    return total
+
+
+def _draw_table(known: tuple[int, ...], stub: tuple[int, ...], missing: int, depth: int) -> dict[int, list[int]]:
+    # Sorted strengths of every completion of one player's hand from the stub, listed
+    # under each subset of up to depth of the drawn cards, keyed by card id bit mask.
+    table = defaultdict(list)
+    evaluate5 = evaluator.evaluate5
+    codes = [_CODES[card] for card in known]
+    for draw in combinations(stub, missing):
+        strength = evaluate5(*codes, *(_CODES[card] for card in draw))
+        bits = [1 << card for card in draw]
+        for size in range(min(depth, missing) + 1):
+            for subset in combinations(bits, size):
+                table[sum(subset)].append(strength)
+    for strengths in table.values():
+        strengths.sort()
+    return dict(table)
+
+
+@lru_cache(maxsize=64)
+def _rank_draws(known_ranks: tuple[int, ...]) -> tuple[list[int], list[tuple[int, ...]]]:
+    # The multisets of ranks that complete a hand holding known_ranks, each as indexes
+    # rank * (HAND_SIZE + 1) + count into a table of binomials, with the non-flush
+    # strengths of the whole hands. Sorted by strength, which is different for each.
+    draws = []
+    for ranks in combinations_with_replacement(range(NUM_RANKS), HAND_SIZE - len(known_ranks)):
+        hand = known_ranks + ranks
+        if max(hand.count(rank) for rank in hand) > NUM_SUITS:
+            continue
+        if len(set(hand)) == HAND_SIZE:
+            strength = evaluator.UNIQUE5_TABLE[sum(1 << rank for rank in hand)]
+        else:
+            strength = evaluator.PRODUCT_TABLE[prod(evaluator.PRIMES[rank] for rank in hand)]
+        draws.append((strength, tuple(rank * (HAND_SIZE + 1) + ranks.count(rank) for rank in sorted(set(ranks)))))
+    draws.sort()
+    return [strength for strength, _ in draws], [indexes for _, indexes in draws]
+
+
+_COMBS = tuple(tuple(comb(n, k) for k in range(HAND_SIZE + 1)) for n in range(NUM_SUITS + 1))
+
+
+@lru_cache(maxsize=4096)
+def _unsuited_counts(known_ranks: tuple[int, ...], available: tuple[int, ...]) -> tuple[list[int], list[int]]:
+    # For each of _rank_draws(known_ranks), the number of ways to draw it from a deck with
+    # available[r] cards of each rank, and the running totals before it: scored as if
+    # none were a flush, below[i] completions are weaker than the i-th draw.
+    binomials = [ways for count in available for ways in _COMBS[count]].__getitem__
+    ways = [prod(map(binomials, indexes)) for indexes in _rank_draws(known_ranks)[1]]
+    return ways, list(accumulate(ways, initial=0))
+
+
+@lru_cache(maxsize=4096)
+def _suit_flushes(known_mask: int, missing: int, mask: int) -> tuple[list[int], list[int]]:
+    # The sorted flush strengths and non-flush strengths of the hands made by adding
+    # missing ranks from mask, all of one suit, to suited known cards with ranks known_mask.
+    flushes = []
+    unsuited = []
+    for chosen in combinations([rank for rank in range(NUM_RANKS) if mask >> rank & 1], missing):
+        rank_mask = known_mask | sum(1 << rank for rank in chosen)
+        flushes.append(evaluator.FLUSH_TABLE[rank_mask])
+        unsuited.append(evaluator.UNIQUE5_TABLE[rank_mask])
+    flushes.sort()
+    unsuited.sort()
+    return flushes, unsuited
+
+
+def _rank_counts(known: tuple[int, ...], available: list[int], suit_masks: list[int], best: int) -> tuple[int, int]:
+    # The number of completions of the known cards weaker than and equal to best, from a
+    # deck with available[r] cards of each rank and the ranks in suit_masks[s] left in
+    # each suit. Completions are counted by rank multiset, then the flushes are moved
+    # from their non-flush strength to their flush strength.
+    known_ranks = tuple(sorted(card >> 2 for card in known))
+    ways, below = _unsuited_counts(known_ranks, tuple(available))
+    strengths = _rank_draws(known_ranks)[0]
+    i = bisect_left(strengths, best)
+    weaker = below[i]
+    equal = ways[i] if i < len(strengths) and strengths[i] == best else 0
+    suits = {card & 3 for card in known}
+    if len(suits) > 1:
+        return weaker, equal
+    known_mask = sum(1 << (card >> 2) for card in known)
+    for suit in suits or range(NUM_SUITS):
+        flushes, unsuited = _suit_flushes(known_mask, HAND_SIZE - len(known), suit_masks[suit])
+        if flushes:
+            lo = bisect_left(flushes, best)
+            hi = bisect_left(unsuited, best)
+            weaker += lo - hi
+            equal += (lo < len(flushes) and flushes[lo] == best) - (hi < len(unsuited) and unsuited[hi] == best)
+    return weaker, equal
+
+
+# The last player's table for the deal most recently enumerated in this process, so
+# each worker builds it once however many chunks it is sent.
+_table_cache: tuple[tuple, dict[int, list[int]]] | None = None
+
+
+def _last_player_table(key: tuple) -> dict[int, list[int]]:
+    global _table_cache
+    if _table_cache is None or _table_cache[0] != key:
+        _table_cache = (key, _draw_table(*key))
+    return _table_cache[1]
+
+
+def _enumerate_chunk(
+    known: tuple[tuple[int, ...], ...],
+    stub: tuple[int, ...],
+    outer: tuple[int, ...],
+    last: int,
+    by_rank: bool,
+    firsts: list[tuple[tuple[int, ...], int]],
+) -> tuple[list[int], list[int], list[int]]:
+    # Counts every deal that starts with one of firsts, the (draw, weight) pairs of the
+    # first player in outer. The other players in outer draw in turn, then the last
+    # player's completions are counted by rank if by_rank is set, otherwise from the table.
+    num_players = len(known)
+    wins = [0] * num_players
+    ties = [0] * num_players
+    losses = [0] * num_players
+    missing = [HAND_SIZE - len(cards) for cards in known]
+    depth = sum(missing[player] for player in outer)
+    last_missing = missing[last]
+    if by_rank:
+        stub_ranks = [0] * NUM_RANKS
+        stub_suits = [0] * NUM_SUITS
+        for card in stub:
+            stub_ranks[card >> 2] += 1
+            stub_suits[card & 3] |= 1 << (card >> 2)
+    else:
+        table = _last_player_table((known[last], stub, last_missing, depth))
+    evaluate5 = evaluator.evaluate5
+
+    strengths = [0] * num_players
+    for player in range(num_players):
+        if player != last and not missing[player]:
+            strengths[player] = evaluate5(*(_CODES[card] for card in known[player]))
+    others = [player for player in range(num_players) if player != last]
+
+    def count(drawn: list[int], weight: int) -> None:
+        best = max(strengths[player] for player in others)
+        num_best = sum(strengths[player] == best for player in others)
+        # Last-player completions below and equal to best that avoid every drawn card.
+        if by_rank:
+            available = stub_ranks.copy()
+            suits = stub_suits.copy()
+            for bit in drawn:
+                card = bit.bit_length() - 1
+                available[card >> 2] -= 1
+                suits[card & 3] &= ~(1 << (card >> 2))
+            below, equal = _rank_counts(known[last], available, suits, best)
+        else:
+            below = equal = 0
+            for size in range(min(last_missing, len(drawn)) + 1):
+                sign = -1 if size % 2 else 1
+                for subset in combinations(drawn, size):
+                    completions = table.get(sum(subset))
+                    if completions:
+                        lo = bisect_left(completions, best)
+                        hi = bisect_right(completions, best, lo)
+                        below += sign * lo
+                        equal += sign * (hi - lo)
+        total = comb(len(stub) - len(drawn), last_missing)
+        above = total - below - equal
+
+        wins[last] += weight * above
+        ties[last] += weight * equal
+        losses[last] += weight * below
+        for player in others:
+            if strengths[player] == best:
+                (wins if num_best == 1 else ties)[player] += weight * below
+                ties[player] += weight * equal
+                losses[player] += weight * above
+            else:
+                losses[player] += weight * total
+
+    def deal(level: int, drawn: list[int], weight: int) -> None:
+        if level == len(outer):
+            count(drawn, weight)
+            return
+        player = outer[level]
+        codes = [_CODES[card] for card in known[player]]
+        used = sum(drawn)
+        left = [card for card in stub if not used >> card & 1]
+        for draw in combinations(left, missing[player]):
+            strengths[player] = evaluate5(*codes, *(_CODES[card] for card in draw))
+            deal(level + 1, drawn + [1 << card for card in draw], weight)
+
+    for first, weight in firsts:
+        if outer:
+            player = outer[0]
+            strengths[player] = evaluate5(*(_CODES[card] for card in (*known[player], *first)))
+        deal(1 if outer else 0, [1 << card for card in first], weight)
+
+    return wins, ties, losses
+
+
+def _enumeration_cost(missing: list[int], drawing: list[int], last: int, num_stub: int) -> tuple[int, bool]:
+    # Rough number of steps to enumerate with last as the counted player, and whether
+    # counting its completions by rank is cheaper than tabulating them.
+    depth = sum(missing[player] for player in drawing if player != last)
+    deals = 1
+    left = num_stub
+    for player in drawing:
+        if player != last:
+            deals *= comb(left, missing[player])
+            left -= missing[player]
+    terms = [comb(missing[last], size) for size in range(min(depth, missing[last]) + 1)]
+    table = comb(num_stub, missing[last]) * sum(terms) + deals * sum(comb(depth, size) for size in range(len(terms)))
+    # Each distinct set of drawn ranks costs a pass over the last player's rank draws.
+    rank_sets = min(deals, comb(NUM_RANKS + depth - 1, depth))
+    by_rank = RANK_STEP * deals + rank_sets * comb(NUM_RANKS + missing[last] - 1, missing[last])
+    return min(table, by_rank), by_rank < table
+
+
+def exact_equity(
+    hands: list[list[Card]],
+    variant: str = STUD,
+    discards: list[list[Card]] | None = None,
+    dead: list[Card] | None = None,
+    chunk_size: int = EXACT_CHUNK,
+    processes: int | None = None,
+) -> EquityResult:
+    """
+    Count each player's wins, ties and losses over every possible completion of the hands.
+
+    The arguments are as for equity(). The result's trials is the number of distinct
+    deals of the missing cards to the players, and its counts are exact; use
+    win_fraction() and the like for exact probabilities. chunk_size is the number of
+    canonical first draws per task sent to a worker process. The counts do not depend
+    on chunk_size or processes.
+
+    The work grows with the number of ways to deal every drawing player but one. On one
+    core, heads-up spots with two or more known cards take under a second (about 0.6 s
+    for [[], [A♠, A♥]]); one known card each takes about 3 s, and one known card against
+    none about 7 s. Multiway spots with several unknown cards per player can take minutes.
+    """
+    if chunk_size < 1:
+        raise ValueError("chunk_size must be positive.")
+    held, used = _known_cards(hands, variant, discards, dead)
+    held_set = {card for cards in held for card in cards}
+
+    # Relabelling every card's suit changes no one's result, so work on the canonical deal.
+    base = canonicalize((), [card for card in used if card not in held_set], held)
+    known = base.known
+    out = set(base.dead).union(*known)
+    stub = tuple(card for card in range(len(CARDS)) if card not in out)
+
+    num_players = len(known)
+    missing = [HAND_SIZE - len(cards) for cards in known]
+    drawing = [player for player in range(num_players) if missing[player]]
+    if drawing:
+        last = min(drawing, key=lambda player: _enumeration_cost(missing, drawing, player, len(stub)))
+        by_rank = _enumeration_cost(missing, drawing, last, len(stub))[1]
+    else:
+        last = 0
+        by_rank = False
+    outer = tuple(player for player in drawing if player != last)
+
+    if outer:
+        firsts = [(hand.ids, hand.multiplicity) for hand in canonical_hands(missing[outer[0]], base.dead, known)]
+    else:
+        firsts = [((), 1)]
+    chunks = [firsts[i : i + chunk_size] for i in range(0, len(firsts), chunk_size)]
+
+    # Build the last player's table here; forked workers inherit it instead of each building it.
+    if not by_rank:
+        depth = sum(missing[player] for player in outer)
+        _last_player_table((known[last], stub, missing[last], depth))
+
+    n = len(chunks)
+    if processes == 1 or n == 1:
+        results = [_enumerate_chunk(known, stub, outer, last, by_rank, chunk) for chunk in chunks]
+    else:
+        with ProcessPoolExecutor(max_workers=processes or os.cpu_count()) as pool:
+            results = list(
+                pool.map(_enumerate_chunk, [known] * n, [stub] * n, [outer] * n, [last] * n, [by_rank] * n, chunks)
+            )
+
+    deals = 1
+    left = len(stub)
+    for player in drawing:
+        deals *= comb(left, missing[player])
+        left -= missing[player]
+    total = EquityResult([0] * num_players, [0] * num_players, [0] * num_players, deals)
+    for wins, ties, losses in results:
+        total = total.merge(EquityResult(wins, ties, losses, 0))
+    return total
@@ -0,0 +1,152 @@
+"""
+Bounded least-recently-used cache of hand evaluations.
+
+Simulations and discard searches score the same card sets again and again. With
+a cache in use, PokerHand.evaluate (and so strength, best_hand and every
+comparison) first looks the hand up by its card mask, a 52-bit int with one bit
+per card id. The mask does not depend on the order of the cards, so a hand that
+was dealt, traded or sorted differently is the same entry. Once capacity entries
+are held the least recently used one is dropped, so memory stays capped in
+long-running workers.
+
+Caching is off by default:
+
+    cache = eval_cache.enable(capacity=100_000)
+    engine.play()
+    print(cache.hits, cache.misses)
+
+Each process has its own cache. A process forked while caching is enabled,
+such as a ProcessPoolExecutor worker on Linux, starts with an empty cache and
+zeroed counters rather than a copy of its parent's.
+"""
+
+import os
+from collections import OrderedDict
+from contextlib import contextmanager
+
+from poker_game import CARDS, PokerHand
+
+DEFAULT_CAPACITY = 65_536
+
+# Maps each card's evaluator code to its bit in a card mask.
+_CARD_BITS = {card.code: 1 << index for index, card in enumerate(CARDS)}
+
+
+def hand_key(cards) -> int:
+    """Return the card mask of cards, the same for any order of the same cards."""
+    key = 0
+    for card in cards:
+        key |= _CARD_BITS[card._code]
+    return key
+
+
+class EvaluationCache:
+    """
+    Strengths of recently evaluated hands, keyed by card mask.
+
+    Attributes:
+        capacity (int): Most entries held before the least recently used is dropped
+        hits (int): Lookups answered from the cache
+        misses (int): Lookups that had to evaluate the hand
+        _entries (OrderedDict[int, int]): Strength by card mask, least recently used first
+    """
+
+    def __init__(self, capacity: int = DEFAULT_CAPACITY) -> None:
+        if capacity < 1:
+            raise ValueError("Cache capacity must be at least 1")
+        self.capacity = capacity
+        self.hits = 0
+        self.misses = 0
+        self._entries: OrderedDict[int, int] = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def strength(self, hand: PokerHand) -> int:
+        """Return the hand's strength, evaluating and storing it on a miss."""
+        key = hand_key(hand._cards)
+        entries = self._entries
+        strength = entries.get(key)
+        if strength is not None:
+            entries.move_to_end(key)
+            self.hits += 1
+            return strength
+        self.misses += 1
+        strength = entries[key] = hand._evaluate()
+        if len(entries) > self.capacity:
+            entries.popitem(last=False)
+        return strength
+
+    @property
+    def hit_rate(self) -> float:
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+    def resize(self, capacity: int) -> None:
+        """Change the capacity, dropping the least recently used entries if it shrinks."""
+        if capacity < 1:
+            raise ValueError("Cache capacity must be at least 1")
+        self.capacity = capacity
+        while len(self._entries) > capacity:
+            self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        """Drop every entry and zero the counters."""
+        self._entries.clear()
+        self.hits = 0
+        self.misses = 0
+
+
+# The cache enabled in this process, if any.
+_cache: EvaluationCache | None = None
+
+
+def enable(capacity: int = DEFAULT_CAPACITY) -> EvaluationCache:
+    """
+    Cache evaluations of every PokerHand in this process and return the cache.
+
+    If caching is already enabled the existing cache is kept and resized.
+    """
+    if _cache is None:
+        _set(EvaluationCache(capacity))
+    else:
+        _cache.resize(capacity)
+    return _cache  # type: ignore
+
+
+def disable() -> None:
+    """Stop caching and free the cache."""
+    _set(None)
+
+
+def current() -> EvaluationCache | None:
+    """Return the cache enabled in this process, or None."""
+    return _cache
+
+
+@contextmanager
+def caching(capacity: int = DEFAULT_CAPACITY):
+    """Enable caching for the enclosed block, then restore the previous cache (or none)."""
+    previous = _cache
+    cache = EvaluationCache(capacity)
+    _set(cache)
+    try:
+        yield cache
+    finally:
+        _set(previous)
+
+
+def _set(cache: EvaluationCache | None) -> None:
+    global _cache
+    _cache = cache
+    PokerHand.use_cache(cache)
+
+
+def _after_fork_in_child() -> None:
+    # The child would otherwise inherit the parent's entries and counters.
+    if _cache is not None:
+        _cache.clear()
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_after_fork_in_child)
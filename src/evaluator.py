@@ -0,0 +1,334 @@
+"""
+Table-driven poker hand evaluator.
+
+Every distinct 5-card poker hand falls into one of 7,462 equivalence classes
+(suits only matter for flushes). This module enumerates those classes once at
+import time, orders them from the worst high card to the royal flush and
+assigns each a strength from 1 to 7462. A hand is then evaluated in a few
+integer operations using three lookup tables:
+
+- FLUSH_TABLE: flushes and straight flushes, indexed by the 13-bit rank mask.
+- UNIQUE5_TABLE: straights and high cards (five distinct ranks, not suited),
+  indexed by the 13-bit rank mask.
+- PRODUCT_TABLE: every hand with a repeated rank, keyed by the product of the
+  primes assigned to each card's rank.
+
+Six and seven card hands are scored on the same scale by evaluate7, which
+returns the strength of their best five cards without trying every subset.
+
+Cards are encoded as integers with the following layout:
+
+    xxxbbbbb bbbbbbbb cdhsrrrr xxpppppp
+
+    b = bit set for the card's rank (2 = bit 16, ..., Ace = bit 28)
+    cdhs = bit set for the card's suit
+    r = rank index (2 = 0, ..., Ace = 12)
+    p = prime number assigned to the rank (2 = 2, ..., Ace = 41)
+"""
+
+from itertools import combinations
+
+# Hand categories, from worst to best.
+HIGH_CARD = 1
+ONE_PAIR = 2
+TWO_PAIR = 3
+THREE_OF_A_KIND = 4
+STRAIGHT = 5
+FLUSH = 6
+FULL_HOUSE = 7
+FOUR_OF_A_KIND = 8
+STRAIGHT_FLUSH = 9
+ROYAL_FLUSH = 10
+
+CATEGORY_NAMES = {
+    HIGH_CARD: "High Card",
+    ONE_PAIR: "One Pair",
+    TWO_PAIR: "Two Pair",
+    THREE_OF_A_KIND: "Three of a Kind",
+    STRAIGHT: "Straight",
+    FLUSH: "Flush",
+    FULL_HOUSE: "Full House",
+    FOUR_OF_A_KIND: "Four of a Kind",
+    STRAIGHT_FLUSH: "Straight Flush",
+    ROYAL_FLUSH: "Royal Flush",
+}
+
+# Number of distinct 5-card hand classes, which is also the best strength.
+NUM_HAND_CLASSES = 7462
+
+PRIMES = (2, 3, 5, 7, 11, 13, 17, 19, 23, 29, 31, 37, 41)
+
+SUIT_BITS = {"c": 0x8000, "d": 0x4000, "h": 0x2000, "s": 0x1000}
+
+# Rank values 2-14 (Ace high), highest first.
+_RANKS = tuple(range(14, 1, -1))
+
+# Rank masks of the ten straights keyed by their high card. The wheel
+# (A-2-3-4-5) plays as a 5-high straight.
+_STRAIGHTS = {high: sum(1 << (rank - 2) for rank in range(high - 4, high + 1)) for high in range(6, 15)}
+_STRAIGHTS[5] = 0b1000000001111
+
+
+def card_code(rank: int, suit: str) -> int:
+    """Return the integer encoding of the card with rank value 2-14 and suit c, d, h or s."""
+    index = rank - 2
+    return (1 << (16 + index)) | SUIT_BITS[suit] | (index << 8) | PRIMES[index]
+
+
+def _rank_mask(ranks) -> int:
+    mask = 0
+    for rank in ranks:
+        mask |= 1 << (rank - 2)
+    return mask
+
+
+def _prime_product(ranks) -> int:
+    product = 1
+    for rank in ranks:
+        product *= PRIMES[rank - 2]
+    return product
+
+
+def _padded(category: int, values: tuple) -> tuple[int, int, int, int, int, int]:
+    return (category, *values, *([-1] * (5 - len(values))))  # type: ignore
+
+
+def _build_tables() -> tuple[list[int], list[int], dict[int, int], list[tuple], list[int]]:
+    straight_masks = set(_STRAIGHTS.values())
+    no_straight = sorted(combo for combo in combinations(_RANKS, 5) if _rank_mask(combo) not in straight_masks)
+
+    # Each category is a list of (ranks to compare, ranks in the hand) sorted
+    # from weakest to strongest. The categories are listed weakest first.
+    categories = [
+        (HIGH_CARD, [(combo, combo) for combo in no_straight]),
+        (
+            ONE_PAIR,
+            sorted(
+                ((pair, *kickers), (pair, pair, *kickers))
+                for pair in _RANKS
+                for kickers in combinations([rank for rank in _RANKS if rank != pair], 3)
+            ),
+        ),
+        (
+            TWO_PAIR,
+            sorted(
+                ((high, low, kicker), (high, high, low, low, kicker))
+                for high, low in combinations(_RANKS, 2)
+                for kicker in _RANKS
+                if kicker not in (high, low)
+            ),
+        ),
+        (
+            THREE_OF_A_KIND,
+            sorted(
+                ((trips, *kickers), (trips, trips, trips, *kickers))
+                for trips in _RANKS
+                for kickers in combinations([rank for rank in _RANKS if rank != trips], 2)
+            ),
+        ),
+        (STRAIGHT, [((high,), (high,)) for high in sorted(_STRAIGHTS)]),
+        (FLUSH, [(combo, combo) for combo in no_straight]),
+        (
+            FULL_HOUSE,
+            sorted(
+                ((trips, pair), (trips, trips, trips, pair, pair))
+                for trips in _RANKS
+                for pair in _RANKS
+                if trips != pair
+            ),
+        ),
+        (
+            FOUR_OF_A_KIND,
+            sorted(
+                ((quads, kicker), (quads, quads, quads, quads, kicker))
+                for quads in _RANKS
+                for kicker in _RANKS
+                if quads != kicker
+            ),
+        ),
+        (STRAIGHT_FLUSH, [((high,), (high,)) for high in sorted(_STRAIGHTS) if high != 14]),
+        (ROYAL_FLUSH, [((), (14,))]),
+    ]
+
+    flush_table = [0] * (1 << 13)
+    unique5_table = [0] * (1 << 13)
+    product_table: dict[int, int] = {}
+    # Index 0 is unused so that a strength can index these lists directly.
+    hand_values: list[tuple] = [()]
+    strength_categories = [0]
+
+    strength = 0
+    for category, classes in categories:
+        for values, ranks in classes:
+            strength += 1
+            if category in (STRAIGHT, STRAIGHT_FLUSH, ROYAL_FLUSH):
+                mask = _STRAIGHTS[ranks[0]]
+            else:
+                mask = _rank_mask(ranks)
+
+            if category in (FLUSH, STRAIGHT_FLUSH, ROYAL_FLUSH):
+                flush_table[mask] = strength
+            elif category in (HIGH_CARD, STRAIGHT):
+                unique5_table[mask] = strength
+            else:
+                product_table[_prime_product(ranks)] = strength
+
+            hand_values.append(_padded(category, values))
+            strength_categories.append(category)
+
+    return flush_table, unique5_table, product_table, hand_values, strength_categories
+
+
+FLUSH_TABLE, UNIQUE5_TABLE, PRODUCT_TABLE, HAND_VALUES, CATEGORIES = _build_tables()
+
+
+def evaluate5(c1: int, c2: int, c3: int, c4: int, c5: int) -> int:
+    """Return the strength (1-7462, higher is better) of five encoded cards."""
+    q = (c1 | c2 | c3 | c4 | c5) >> 16
+    if c1 & c2 & c3 & c4 & c5 & 0xF000:
+        return FLUSH_TABLE[q]
+    strength = UNIQUE5_TABLE[q]
+    if strength:
+        return strength
+    return PRODUCT_TABLE[(c1 & 0xFF) * (c2 & 0xFF) * (c3 & 0xFF) * (c4 & 0xFF) * (c5 & 0xFF)]
+
+
+# Best strength for each rank mask of 5-7 suited cards, and for each prime product
+# of 5-7 unsuited ranks. Both are filled in the first time a key is seen.
+_BEST_FLUSH: dict[int, int] = {}
+_BEST_UNSUITED: dict[int, int] = {}
+
+
+def _best_flush(mask: int) -> int:
+    bits = [1 << rank for rank in range(13) if mask >> rank & 1]
+    best = max(FLUSH_TABLE[sum(subset)] for subset in combinations(bits, 5))
+    _BEST_FLUSH[mask] = best
+    return best
+
+
+def _best_unsuited(product: int, codes) -> int:
+    best = 0
+    for subset in set(combinations(sorted(code & 0xFFFF0F00 for code in codes), 5)):
+        mask = 0
+        subset_product = 1
+        for code in subset:
+            mask |= code >> 16
+            subset_product *= PRIMES[(code >> 8) & 0xF]
+        strength = UNIQUE5_TABLE[mask] if mask.bit_count() == 5 else PRODUCT_TABLE[subset_product]
+        if strength > best:
+            best = strength
+    _BEST_UNSUITED[product] = best
+    return best
+
+
+def evaluate7(codes) -> int:
+    """
+    Return the strength of the best 5-card hand within six or seven encoded cards.
+
+    With five or more cards of one suit nothing beats the best flush among them
+    (quads or a full house would need three cards outside the suit), so suited
+    hands are looked up by that suit's rank mask. Otherwise the strength only
+    depends on the multiset of ranks, looked up by its prime product.
+    """
+    clubs = diamonds = hearts = spades = 0
+    product = 1
+    for code in codes:
+        rank_bit = code >> 16
+        suit = code & 0xF000
+        if suit == 0x8000:
+            clubs |= rank_bit
+        elif suit == 0x4000:
+            diamonds |= rank_bit
+        elif suit == 0x2000:
+            hearts |= rank_bit
+        else:
+            spades |= rank_bit
+        product *= code & 0xFF
+
+    for mask in (clubs, diamonds, hearts, spades):
+        if mask.bit_count() >= 5:
+            strength = _BEST_FLUSH.get(mask)
+            return strength if strength is not None else _best_flush(mask)
+
+    strength = _BEST_UNSUITED.get(product)
+    return strength if strength is not None else _best_unsuited(product, codes)
+
+
+class BoardState:
+    """
+    Community cards summarized so each player's hand can be scored from their hole cards alone.
+
+    Adding a board card updates the running rank product and suit masks once for
+    the whole table. strength() then folds in a player's hole cards with a couple
+    of integer operations and one memoized lookup, the same lookups evaluate7 uses.
+
+    Attributes:
+        codes (list[int]): Encoded board cards in the order they were dealt
+        product (int): Product of the board cards' rank primes
+        suit_masks (dict[int, int]): Rank mask of the board cards of each suit, keyed by suit bit
+        flush_suit (int): Suit bit of the only suit that can still make a flush, or 0
+    """
+
+    MAX_CARDS = 5
+
+    def __init__(self, codes=()) -> None:
+        self.codes: list[int] = []
+        self.product = 1
+        self.suit_masks = dict.fromkeys(SUIT_BITS.values(), 0)
+        self.flush_suit = 0
+        for code in codes:
+            self.add(code)
+
+    def add(self, code: int) -> None:
+        if len(self.codes) == self.MAX_CARDS:
+            raise ValueError(f"A board cannot have more than {self.MAX_CARDS} cards")
+        self.codes.append(code)
+        self.product *= code & 0xFF
+        suit = code & 0xF000
+        self.suit_masks[suit] |= code >> 16
+        # With two hole cards a flush needs three board cards of its suit, and a
+        # board of five cards has at most one such suit.
+        if self.suit_masks[suit].bit_count() >= 3:
+            self.flush_suit = suit
+
+    def strength(self, hole) -> int:
+        """Return the strength of the best 5 cards from the board plus encoded hole cards."""
+        product = self.product
+        flush_mask = self.suit_masks[self.flush_suit] if self.flush_suit else 0
+        for code in hole:
+            product *= code & 0xFF
+            if code & self.flush_suit:
+                flush_mask |= code >> 16
+
+        if flush_mask.bit_count() >= 5:
+            strength = _BEST_FLUSH.get(flush_mask)
+            return strength if strength is not None else _best_flush(flush_mask)
+        if len(self.codes) + len(hole) < 5:
+            raise ValueError("A hand needs at least 5 cards")
+        strength = _BEST_UNSUITED.get(product)
+        return strength if strength is not None else _best_unsuited(product, [*self.codes, *hole])
+
+
+def evaluate(codes) -> int:
+    """Return the strength of the best 5-card hand within five to seven encoded cards."""
+    if len(codes) == 5:
+        return evaluate5(*codes)
+    if not 5 < len(codes) <= 7:
+        raise ValueError(f"Cannot evaluate a hand of {len(codes)} cards")
+    return evaluate7(codes)
+
+
+def category(strength: int) -> int:
+    """Return the hand category (HIGH_CARD ... ROYAL_FLUSH) of a strength."""
+    return CATEGORIES[strength]
+
+
+def hand_value(strength: int) -> tuple[int, int, int, int, int, int]:
+    """
+    Return the legacy PokerHand value tuple for a strength.
+
+    The first element is the hand category and the remaining five are the rank
+    values that decide ties within the category, highest priority first,
+    padded with -1.
+    """
+    return HAND_VALUES[strength]
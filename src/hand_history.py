@@ -0,0 +1,244 @@
+"""
+Append-only binary hand-history log with a memory-mapped reader.
+
+Every game is stored as fixed-width records, so a log can be written as fast as
+games are played and read back by offset without any parsing:
+
+- DEALT: the cards a player was dealt (hole cards in Texas Hold'em)
+- DISCARD: the cards a player traded in (5-card draw only, when they traded)
+- BOARD: the community cards in Texas Hold'em (player is NO_PLAYER)
+- SHOWDOWN: a player's final hand with its strength, flagged WINNER or TIED
+
+File layout (little-endian):
+
+    header   12 bytes: magic b"PKHH", version, record size
+    records  RECORD.size bytes each: game number (uint64), player index (uint8),
+             kind (uint8), card count (uint8), up to 7 card ids (uint8, padded
+             with NO_CARD), strength (uint16, 0 unless SHOWDOWN), flags (uint8)
+
+A partly written last record (e.g. after a crash) is ignored by the reader.
+Game numbers stay unique across writing sessions: a writer appending to an
+existing log numbers its games on from the last game already in the file.
+"""
+
+import mmap
+import os
+import struct
+
+MAGIC = b"PKHH"
+VERSION = 1
+HEADER = struct.Struct("<4sII")
+RECORD = struct.Struct("<QBBB7sHB3x")
+MAX_CARDS = 7
+
+# Record kinds
+DEALT = 0
+DISCARD = 1
+BOARD = 2
+SHOWDOWN = 3
+
+KIND_NAMES = {DEALT: "dealt", DISCARD: "discard", BOARD: "board", SHOWDOWN: "showdown"}
+
+# Record flags
+WINNER = 1
+TIED = 2
+
+NO_PLAYER = 0xFF
+NO_CARD = 0xFF
+
+
+def _card_bytes(cards) -> bytes:
+    return bytes(card.id for card in cards).ljust(MAX_CARDS, b"\xff")
+
+
+def pack_game(game: int, result) -> bytes:
+    """Return the records of one finished game (a poker_game.GameResult) as bytes."""
+    pack = RECORD.pack
+    records = []
+    for player, cards in enumerate(result.dealt):
+        records.append(pack(game, player, DEALT, len(cards), _card_bytes(cards), 0, 0))
+    for player, cards in enumerate(result.discards):
+        if cards:
+            records.append(pack(game, player, DISCARD, len(cards), _card_bytes(cards), 0, 0))
+    if result.board:
+        records.append(pack(game, NO_PLAYER, BOARD, len(result.board), _card_bytes(result.board), 0, 0))
+
+    winner_flag = WINNER if len(result.winners) == 1 else WINNER | TIED
+    for player, hand in enumerate(result.hands):
+        flags = winner_flag if player in result.winners else 0
+        records.append(pack(game, player, SHOWDOWN, len(hand._cards), _card_bytes(hand._cards), hand.strength, flags))
+    return b"".join(records)
+
+
+class HandHistoryWriter:
+    """
+    Appends games to a hand-history file, creating it with a header if needed.
+
+    Game numbers given to the writer count from 0 for each writing session and are
+    stored offset by first_game.
+
+    Attributes:
+        _file: The file opened for buffered appending
+        games_written (int): Games written by this writer
+        first_game (int): Number stored for game 0, one after the last game already in the file
+    """
+
+    def __init__(self, path: str, buffer_size: int = 1 << 20) -> None:
+        self.first_game = 0
+        if os.path.exists(path) and os.path.getsize(path) > 0:
+            with open(path, "r+b") as f:
+                _check_header(f.read(HEADER.size), path)
+                # Drop a partly written last record so new records stay aligned.
+                size = os.fstat(f.fileno()).st_size
+                size -= (size - HEADER.size) % RECORD.size
+                f.truncate(size)
+                if size > HEADER.size:
+                    f.seek(size - RECORD.size)
+                    self.first_game = RECORD.unpack(f.read(RECORD.size))[0] + 1
+            self._file = open(path, "ab", buffering=buffer_size)
+        else:
+            self._file = open(path, "wb", buffering=buffer_size)
+            self._file.write(HEADER.pack(MAGIC, VERSION, RECORD.size))
+        self.games_written = 0
+
+    def write_game(self, game: int, result) -> None:
+        self._file.write(pack_game(self.first_game + game, result))
+        self.games_written += 1
+
+    def write_records(self, data: bytes) -> None:
+        """Append records already packed by pack_game, e.g. in a worker process."""
+        if self.first_game:
+            offset = self.first_game
+            data = b"".join(RECORD.pack(game + offset, *fields) for game, *fields in RECORD.iter_unpack(data))
+        self._file.write(data)
+
+    def close(self) -> None:
+        self._file.close()
+
+    def __enter__(self) -> "HandHistoryWriter":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+
+def _check_header(header: bytes, path: str) -> None:
+    if len(header) < HEADER.size:
+        raise ValueError(f"{path} is not a valid hand history")
+    magic, version, record_size = HEADER.unpack_from(header)
+    if magic != MAGIC or version != VERSION or record_size != RECORD.size:
+        raise ValueError(f"{path} is not a valid hand history")
+
+
+class HandRecord:
+    """
+    One record of a hand history.
+
+    Attributes:
+        game (int): Game number
+        player (int): Player index in seating order, or NO_PLAYER for the board
+        kind (int): DEALT, DISCARD, BOARD or SHOWDOWN
+        cards (tuple[int, ...]): Card ids (0-51)
+        strength (int): Final hand strength for SHOWDOWN records, otherwise 0
+        flags (int): WINNER and TIED bits for SHOWDOWN records
+    """
+
+    __slots__ = ("game", "player", "kind", "cards", "strength", "flags")
+
+    def __init__(self, game: int, player: int, kind: int, cards: tuple[int, ...], strength: int, flags: int) -> None:
+        self.game = game
+        self.player = player
+        self.kind = kind
+        self.cards = cards
+        self.strength = strength
+        self.flags = flags
+
+    @classmethod
+    def _unpack(cls, fields: tuple) -> "HandRecord":
+        game, player, kind, count, cards, strength, flags = fields
+        return cls(game, player, kind, tuple(cards[:count]), strength, flags)
+
+    @property
+    def is_winner(self) -> bool:
+        return bool(self.flags & WINNER)
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, HandRecord):
+            return NotImplemented
+        return all(getattr(self, name) == getattr(other, name) for name in self.__slots__)
+
+    def __repr__(self) -> str:
+        return (
+            f"HandRecord(game={self.game}, player={self.player}, kind={KIND_NAMES[self.kind]}, "
+            f"cards={self.cards}, strength={self.strength}, flags={self.flags})"
+        )
+
+
+class HandHistory:
+    """
+    Read-only view of a hand-history file mapped into memory.
+
+    Supports len(), indexing and slicing (returning HandRecords) and iteration.
+
+    Attributes:
+        _mmap (mmap.mmap): The mapped file
+        _records (memoryview): The complete records after the header
+    """
+
+    def __init__(self, path: str) -> None:
+        self._path = path
+        with open(path, "rb") as f:
+            _check_header(f.read(HEADER.size), path)
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        self._count = (len(self._mmap) - HEADER.size) // RECORD.size
+        self._view = memoryview(self._mmap)
+        self._records = self._view[HEADER.size : HEADER.size + self._count * RECORD.size]
+
+    def __len__(self) -> int:
+        return self._count
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            start, stop, step = index.indices(self._count)
+            if step == 1:
+                data = self._records[start * RECORD.size : max(start, stop) * RECORD.size]
+                return [HandRecord._unpack(fields) for fields in RECORD.iter_unpack(data)]
+            return [self[i] for i in range(start, stop, step)]
+        if index < 0:
+            index += self._count
+        if not 0 <= index < self._count:
+            raise IndexError("hand history index out of range")
+        return HandRecord._unpack(RECORD.unpack_from(self._records, index * RECORD.size))
+
+    def __iter__(self):
+        for fields in RECORD.iter_unpack(self._records):
+            yield HandRecord._unpack(fields)
+
+    def arrays(self):
+        """Return the records as a numpy structured memmap for vectorized scans."""
+        import numpy as np
+
+        dtype = np.dtype(
+            [
+                ("game", "<u8"),
+                ("player", "u1"),
+                ("kind", "u1"),
+                ("count", "u1"),
+                ("cards", "u1", (MAX_CARDS,)),
+                ("strength", "<u2"),
+                ("flags", "u1"),
+                ("pad", "V3"),
+            ]
+        )
+        return np.memmap(self._path, dtype=dtype, mode="r", offset=HEADER.size, shape=(self._count,))
+
+    def close(self) -> None:
+        self._records.release()
+        self._view.release()
+        self._mmap.close()
+
+    def __enter__(self) -> "HandHistory":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
@@ -0,0 +1,110 @@
+"""
+Streaming, mergeable statistics over played hands.
+
+HandStatistics consumes finished games one at a time and keeps only fixed-size
+counters: how often each category is the final hand, how often a hand of each
+category wins outright or ties for the win, and for 5-card draw how each
+category changes across the draw. Memory use does not grow with the number of
+hands, and statistics gathered in separate processes combine with merge().
+"""
+
+import evaluator
+
+_NUM_CATEGORIES = evaluator.ROYAL_FLUSH + 1
+
+
+class HandStatistics:
+    """
+    Running counts over a stream of games.
+
+    All lists are indexed by category (HIGH_CARD ... ROYAL_FLUSH); index 0 is unused.
+
+    Attributes:
+        games (int): Games added
+        hands (int): Final hands added
+        categories (list[int]): Final hands of each category
+        wins (list[int]): Hands of each category that won outright
+        ties (list[int]): Hands of each category that tied for the win
+        draws (list[list[int]]): draws[before][after] counts hands by category before
+            and after the draw, for every hand in a 5-card draw game
+        improved (list[int]): Hands of each starting category that finished in a better category
+    """
+
+    def __init__(self) -> None:
+        self.games = 0
+        self.hands = 0
+        self.categories = [0] * _NUM_CATEGORIES
+        self.wins = [0] * _NUM_CATEGORIES
+        self.ties = [0] * _NUM_CATEGORIES
+        self.draws = [[0] * _NUM_CATEGORIES for _ in range(_NUM_CATEGORIES)]
+        self.improved = [0] * _NUM_CATEGORIES
+
+    def add_showdown(self, strengths: list[int], winners: list[int]) -> None:
+        """Add one game's final strengths and the indexes of the hands that won."""
+        categories = evaluator.CATEGORIES
+        self.games += 1
+        self.hands += len(strengths)
+        for strength in strengths:
+            self.categories[categories[strength]] += 1
+        counts = self.wins if len(winners) == 1 else self.ties
+        for i in winners:
+            counts[categories[strengths[i]]] += 1
+
+    def add_draw(self, before: int, after: int) -> None:
+        """Add one hand's strength before and after the draw."""
+        start = evaluator.CATEGORIES[before]
+        end = evaluator.CATEGORIES[after]
+        self.draws[start][end] += 1
+        if end > start:
+            self.improved[start] += 1
+
+    def add_game(self, result, draw: bool = False) -> None:
+        """Add a poker_game.GameResult; pass draw=True for 5-card draw to track the draw."""
+        strengths = result.strengths
+        self.add_showdown(strengths, result.winners)
+        if not draw:
+            return
+        for cards, traded, after in zip(result.dealt, result.discards, strengths):
+            # A hand that stood pat is unchanged, so it needs no evaluation.
+            before = evaluator.evaluate([card.code for card in cards]) if traded else after
+            self.add_draw(before, after)
+
+    def merge(self, other: "HandStatistics") -> None:
+        self.games += other.games
+        self.hands += other.hands
+        for mine, theirs in (
+            (self.categories, other.categories),
+            (self.wins, other.wins),
+            (self.ties, other.ties),
+            (self.improved, other.improved),
+            *zip(self.draws, other.draws),
+        ):
+            for i, count in enumerate(theirs):
+                mine[i] += count
+
+    def frequency(self, category: int) -> float:
+        """Fraction of final hands in the category."""
+        return self.categories[category] / self.hands if self.hands else 0.0
+
+    def win_rate(self, category: int) -> float:
+        """Fraction of final hands in the category that won outright."""
+        return self.wins[category] / self.categories[category] if self.categories[category] else 0.0
+
+    def tie_rate(self, category: int) -> float:
+        """Fraction of final hands in the category that tied for the win."""
+        return self.ties[category] / self.categories[category] if self.categories[category] else 0.0
+
+    def improvement_rate(self, category: int | None = None) -> float:
+        """Fraction of drawing hands (starting in category, if given) that finished in a better category."""
+        if category is None:
+            drawn = sum(sum(row) for row in self.draws)
+            improved = sum(self.improved)
+        else:
+            drawn = sum(self.draws[category])
+            improved = self.improved[category]
+        return improved / drawn if drawn else 0.0
+
+    def category_change_rate(self, before: int, after: int) -> float:
+        """Fraction of drawing hands starting in category before that finished in category after."""
+        drawn = sum(self.draws[before])
+        return self.draws[before][after] / drawn if drawn else 0.0
@@ -0,0 +1,264 @@
+"""
+Opt-in counters, timers and profiling hooks for the game's hot paths.
+
+Instrumentation is off by default and then costs nothing: enable() wraps the
+instrumented methods of PokerHand, Deck and PokerEngine (and so PokerGame) in
+counting and timing wrappers, and disable() puts the original methods back.
+While enabled, every event is attributed to the phase of the game it happened
+in:
+
+- deal: dealing hands, hole cards and board cards
+- draw: trading cards in 5-card draw
+- showdown: deciding the winners
+- other: anything outside those, e.g. hands built directly
+
+Events are evaluate (hand evaluations), compare (hand comparisons), deal (cards
+dealt), redeal (deck resets) and game (complete games played by PokerEngine.play).
+
+    instrumentation.enable()
+    engine.play()
+    print(instrumentation.snapshot().format())
+
+profile() runs cProfile, and optionally tracemalloc, around any block of code
+such as a single game or a batch.
+"""
+
+import cProfile
+import functools
+import io
+import pstats
+import sys
+import threading
+import time
+import tracemalloc
+from collections import defaultdict
+from contextlib import contextmanager
+
+import evaluator
+from poker_game import Deck, PokerEngine, PokerGame, PokerHand
+
+PHASES = ("deal", "draw", "showdown", "other")
+EVENTS = ("evaluate", "compare", "deal", "redeal", "game")
+
+# Methods counted as events, by class.
+_EVENT_METHODS = (
+    (PokerHand, "evaluate", "evaluate"),
+    (evaluator.BoardState, "strength", "evaluate"),
+    (PokerHand, "__eq__", "compare"),
+    (PokerHand, "__lt__", "compare"),
+    (PokerHand, "__le__", "compare"),
+    (PokerHand, "__gt__", "compare"),
+    (PokerHand, "__ge__", "compare"),
+    (Deck, "random_deal_one", "deal"),
+    (Deck, "deal_card", "deal"),
+    (Deck, "reset_deck", "redeal"),
+    (PokerEngine, "play", "game"),
+)
+
+# Methods that mark the phase of everything they call.
+_PHASE_METHODS = (
+    (Deck, "reset_deck", "deal"),
+    (PokerEngine, "deal_cards", "deal"),
+    (PokerEngine, "deal_hole_cards", "deal"),
+    (PokerEngine, "deal_street", "deal"),
+    (PokerEngine, "exchange", "draw"),
+    (PokerGame, "draw_cards", "draw"),
+    (PokerEngine, "winners", "showdown"),
+    (PokerEngine, "ranking", "showdown"),
+    (PokerEngine, "rank_hands", "showdown"),
+)
+
+_phase = "other"
+_counts: defaultdict[tuple[str, str], int] = defaultdict(int)
+_times: defaultdict[tuple[str, str], int] = defaultdict(int)
+_originals: list[tuple[type, str, object]] = []
+_started = 0.0
+
+
+class Snapshot:
+    """
+    Counts and timings at one moment, keyed by (phase, event).
+
+    Attributes:
+        counts (dict[tuple[str, str], int]): Number of events
+        times (dict[tuple[str, str], int]): Total nanoseconds spent in the events
+        elapsed (float): Seconds since the counters were last reset
+    """
+
+    def __init__(self, counts: dict, times: dict, elapsed: float) -> None:
+        self.counts = counts
+        self.times = times
+        self.elapsed = elapsed
+
+    def count(self, event: str, phase: str | None = None) -> int:
+        """Return the number of events, in one phase or all of them."""
+        return sum(n for (p, e), n in self.counts.items() if e == event and phase in (None, p))
+
+    def seconds(self, event: str, phase: str | None = None) -> float:
+        """Return the time spent in events, in one phase or all of them."""
+        return sum(ns for (p, e), ns in self.times.items() if e == event and phase in (None, p)) / 1e9
+
+    def __sub__(self, other: "Snapshot") -> "Snapshot":
+        keys = self.counts.keys() | other.counts.keys()
+        return Snapshot(
+            {key: self.counts.get(key, 0) - other.counts.get(key, 0) for key in keys},
+            {key: self.times.get(key, 0) - other.times.get(key, 0) for key in keys},
+            self.elapsed - other.elapsed,
+        )
+
+    def as_dict(self) -> dict:
+        return {
+            "elapsed": self.elapsed,
+            "events": {
+                f"{phase}.{event}": {"count": count, "seconds": self.times.get((phase, event), 0) / 1e9}
+                for (phase, event), count in sorted(self.counts.items())
+            },
+        }
+
+    def format(self) -> str:
+        lines = [f"{'Phase':<10}{'Event':<10}{'Count':>12}{'Total ms':>12}{'ns/event':>12}"]
+        for phase in PHASES:
+            for event in EVENTS:
+                count = self.counts.get((phase, event), 0)
+                if count:
+                    ns = self.times.get((phase, event), 0)
+                    lines.append(f"{phase:<10}{event:<10}{count:>12,}{ns / 1e6:>12.2f}{ns / count:>12,.0f}")
+        lines.append(f"{self.elapsed:.2f}s since reset")
+        return "\n".join(lines)
+
+
+def _counted(event: str, func):
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        start = time.perf_counter_ns()
+        try:
+            return func(*args, **kwargs)
+        finally:
+            key = (_phase, event)
+            _counts[key] += 1
+            _times[key] += time.perf_counter_ns() - start
+
+    return wrapper
+
+
+def _phased(phase: str, func):
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        global _phase
+        previous = _phase
+        _phase = phase
+        try:
+            return func(*args, **kwargs)
+        finally:
+            _phase = previous
+
+    return wrapper
+
+
+def _patch(cls: type, name: str, wrap) -> None:
+    original = cls.__dict__[name]
+    _originals.append((cls, name, original))
+    if isinstance(original, staticmethod):
+        setattr(cls, name, staticmethod(wrap(original.__func__)))
+    else:
+        setattr(cls, name, wrap(original))
+
+
+def enabled() -> bool:
+    return bool(_originals)
+
+
+def enable() -> None:
+    """Start counting and timing events. Does nothing if already enabled."""
+    if enabled():
+        return
+    for cls, name, event in _EVENT_METHODS:
+        _patch(cls, name, functools.partial(_counted, event))
+    for cls, name, phase in _PHASE_METHODS:
+        _patch(cls, name, functools.partial(_phased, phase))
+    reset()
+
+
+def disable() -> None:
+    """Restore the uninstrumented methods. The counters keep their values."""
+    global _phase
+    while _originals:
+        cls, name, original = _originals.pop()
+        setattr(cls, name, original)
+    _phase = "other"
+
+
+def reset() -> None:
+    global _started
+    _counts.clear()
+    _times.clear()
+    _started = time.perf_counter()
+
+
+def snapshot() -> Snapshot:
+    return Snapshot(dict(_counts), dict(_times), time.perf_counter() - _started)
+
+
+class PeriodicDump:
+    """
+    Writes a snapshot to a stream every interval seconds from a background thread.
+
+    Attributes:
+        interval (float): Seconds between dumps
+        out: Stream the snapshots are written to
+    """
+
+    def __init__(self, interval: float, out=None) -> None:
+        self.interval = interval
+        self.out = out if out is not None else sys.stderr
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="instrumentation-dump", daemon=True)
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            self.dump()
+
+    def dump(self) -> None:
+        print(snapshot().format(), file=self.out, flush=True)
+
+    def start(self) -> "PeriodicDump":
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._stop.set()
+        self._thread.join()
+
+    def __enter__(self) -> "PeriodicDump":
+        return self.start()
+
+    def __exit__(self, *exc) -> None:
+        self.stop()
+
+
+@contextmanager
+def profile(out=None, sort: str = "cumulative", limit: int = 25, memory: bool = False):
+    """
+    Profile the enclosed block with cProfile and print the top functions to out.
+
+    With memory=True tracemalloc also runs and the lines that allocated the most
+    memory still held at the end are printed.
+    """
+    out = out if out is not None else sys.stderr
+    if memory:
+        tracemalloc.start()
+    profiler = cProfile.Profile()
+    profiler.enable()
+    try:
+        yield profiler
+    finally:
+        profiler.disable()
+        report = io.StringIO()
+        pstats.Stats(profiler, stream=report).sort_stats(sort).print_stats(limit)
+        print(report.getvalue(), file=out)
+        if memory:
+            allocations = tracemalloc.take_snapshot().statistics("lineno")
+            tracemalloc.stop()
+            print(f"Top {min(limit, len(allocations))} allocations:", file=out)
+            for stat in allocations[:limit]:
+                print(f"  {stat}", file=out)
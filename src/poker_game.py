@@ -4,23 +4,31 @@ TODO:
 - Add betting, calling, raising, folding
 - Add 7 card stud
 - Add 7 card draw
-- Add Texas Hold 'em
 """
 
+import heapq
+import operator
 import random
-from collections import Counter
-import os
+from itertools import combinations
+
+import evaluator
+from terminal import Screen
 
 
 class Card:
     """
     Represents a standard playing card with a value and suit.
 
+    Cards are immutable flyweights: the 52 cards are created once and Card(rank, suit)
+    returns the shared instance, so cards can be compared by identity.
+
     Attributes:
-        _rank (Rank): The card's value (2-10, Jack, Queen, King, Ace)
-        _suit_value (Suit): The card's suit (Clubs, Diamonds, Hearts, Spades)
+        _code (int): The card's evaluator encoding (rank bit, suit bit, rank index and
+            rank prime packed into one int, see evaluator.card_code)
     """
 
+    __slots__ = ("_code",)
+
     RANK_DICT = {
         "2": 2,
         "3": 3,
@@ -39,6 +47,9 @@ class Card:
 
     SUIT_SET = {"c", "d", "h", "s"}
 
+    # Fixed suit order used for card ids, since set iteration order is not stable.
+    SUIT_ORDER = ("c", "d", "h", "s")
+
     # Unicode symbols for suits
     SUIT_SYMBOLS = {
         "c": "♣",  # ♣
@@ -47,28 +58,65 @@ class Card:
         "s": "♠",  # ♠
     }
 
-    def __init__(self, rank: str, suit: str):
-        self._rank = rank
-        self._suit = suit
+    # Maps (rank, suit) strings to the interned card.
+    _INTERNED: dict[tuple[str, str], "Card"] = {}
+
+    def __new__(cls, rank: str, suit: str) -> "Card":
+        try:
+            return cls._INTERNED[rank, suit]
+        except KeyError:
+            raise ValueError(f"Invalid card: {rank}{suit}") from None
+
+    @classmethod
+    def _create(cls, rank: str, suit: str) -> "Card":
+        card = object.__new__(cls)
+        card._code = evaluator.card_code(cls.RANK_DICT[rank], suit)
+        cls._INTERNED[rank, suit] = card
+        return card
 
     @property
     def rank(self) -> int:
-        return self.RANK_DICT[self._rank]
+        return ((self._code >> 8) & 0xF) + 2
 
     @property
     def suit(self) -> str:
-        return self._suit
+        return _SUIT_FROM_BITS[(self._code >> 12) & 0xF]
+
+    @property
+    def code(self) -> int:
+        return self._code
+
+    @property
+    def id(self) -> int:
+        # Card ids run from 0 (2♣) to 51 (A♠), rank-major in SUIT_ORDER.
+        return ((self._code >> 8) & 0xF) * 4 + _SUIT_INDEX_FROM_BITS[(self._code >> 12) & 0xF]
 
     def __lt__(self, other: "Card") -> bool:
-        return self.RANK_DICT[self._rank] < other.RANK_DICT[other._rank]
+        return (self._code & 0xF00) < (other._code & 0xF00)
+
+    def __reduce__(self):
+        # Unpickling goes through Card() so it returns the interned instance.
+        return (Card, (_RANK_NAMES[(self._code >> 8) & 0xF], self.suit))
 
     def __str__(self) -> str:
         # Use uppercase for face cards and Ace
-        rank_display = self._rank.upper() if self._rank in {"j", "q", "k", "a"} else self._rank
-        suit_symbol = self.SUIT_SYMBOLS[self._suit]
+        rank = _RANK_NAMES[(self._code >> 8) & 0xF]
+        rank_display = rank.upper() if rank in {"j", "q", "k", "a"} else rank
+        suit_symbol = self.SUIT_SYMBOLS[self.suit]
         return f"{rank_display}{suit_symbol}"
 
 
+_RANK_NAMES = tuple(Card.RANK_DICT)
+_SUIT_FROM_BITS = {evaluator.SUIT_BITS[suit] >> 12: suit for suit in Card.SUIT_ORDER}
+_SUIT_INDEX_FROM_BITS = {evaluator.SUIT_BITS[suit] >> 12: i for i, suit in enumerate(Card.SUIT_ORDER)}
+
+# The 52 interned cards, indexed by card id.
+CARDS: tuple[Card, ...] = tuple(Card._create(rank, suit) for rank in Card.RANK_DICT for suit in Card.SUIT_ORDER)
+
+# Cards by (rank value, suit), as taken by PokerHand.remove_card.
+_CARDS_BY_VALUE = {(card.rank, card.suit): card for card in CARDS}
+
+
 class Hand:
     """
     Abstract base class for card hands.
@@ -95,31 +143,54 @@ class Hand:
 
 class PokerHand(Hand):
     """
-    Represents a poker hand of 5 cards.
+    Represents a poker hand of 5 cards, or of 6-7 cards playing its best 5.
 
     Implements poker hand ranking and comparison logic according to standard poker rules.
     Supports all standard poker hands from high card to royal flush.
 
+    Adding and removing cards updates the rank and suit counts the evaluator needs,
+    and only marks the strength as stale. The strength is computed the next time it
+    is read, so a multi-card exchange is evaluated once, and only if it is compared.
+
     Attributes:
-        _cards (list[Card]): List of 5 cards in the poker hand
-        _hand_value: Tuple containing hand type and relevant card values for comparison
+        _cards (list[Card]): List of 5-7 cards in the poker hand
+        _members (set[Card]): The same cards, for O(1) membership tests
+        _rank_counts (list[int]): Number of cards of each rank index (2 = 0, ..., Ace = 12)
+        _suit_counts (dict[int, int]): Number of cards of each suit, keyed by suit bit
+        _rank_bits (int): Bit set for every rank in the hand
+        _product (int): Product of the cards' rank primes
+        _cached_strength (int | None): The strength, or None until it is next computed
     """
 
     # Class constants
-    ROYAL_FLUSH = 10
-    STRAIGHT_FLUSH = 9
-    FOUR_OF_A_KIND = 8
-    FULL_HOUSE = 7
-    FLUSH = 6
-    STRAIGHT = 5
-    THREE_OF_A_KIND = 4
-    TWO_PAIR = 3
-    ONE_PAIR = 2
-    HIGH_CARD = 1
-
-    def __init__(self, cards: list[Card]) -> None:
+    ROYAL_FLUSH = evaluator.ROYAL_FLUSH
+    STRAIGHT_FLUSH = evaluator.STRAIGHT_FLUSH
+    FOUR_OF_A_KIND = evaluator.FOUR_OF_A_KIND
+    FULL_HOUSE = evaluator.FULL_HOUSE
+    FLUSH = evaluator.FLUSH
+    STRAIGHT = evaluator.STRAIGHT
+    THREE_OF_A_KIND = evaluator.THREE_OF_A_KIND
+    TWO_PAIR = evaluator.TWO_PAIR
+    ONE_PAIR = evaluator.ONE_PAIR
+    HIGH_CARD = evaluator.HIGH_CARD
+
+    # Optional rank_table.RankTable shared by all hands, see use_rank_table.
+    _rank_table = None
+
+    # Optional eval_cache.EvaluationCache shared by all hands, see use_cache.
+    _cache = None
+
+    def __init__(self, cards: list[Card], strength: int | None = None) -> None:
         self._cards = cards
-        self._hand_value = self.best_hand()
+        self._members: set[Card] = set()
+        self._rank_counts = [0] * 13
+        self._suit_counts = dict.fromkeys(evaluator.SUIT_BITS.values(), 0)
+        self._rank_bits = 0
+        self._product = 1
+        for card in cards:
+            self._count(card)
+        # A caller that already knows the strength (e.g. from a BoardState) can pass it in.
+        self._cached_strength = strength
 
     # Returns a list where first element is an integer 1-14 representing a hand
     # (e.g. 10 = Royal Flush)
@@ -127,328 +198,239 @@ class PokerHand(Hand):
     @property
     def get_hand(self) -> list:
         cards = []
-        cards.append(self._hand_value[0])
+        cards.append(self.category)
         for card in self._cards:
             cards.append(str(card))
         return cards
 
+    def _count(self, card: Card) -> None:
+        code = card._code
+        rank = (code >> 8) & 0xF
+        self._members.add(card)
+        self._rank_counts[rank] += 1
+        self._suit_counts[code & 0xF000] += 1
+        self._rank_bits |= 1 << rank
+        self._product *= code & 0xFF
+
     def add_card(self, card: Card) -> None:
         self._cards.append(card)
+        self._count(card)
+        self._cached_strength = None
 
     def remove_card(self, rank: int, suit: str) -> bool:
-        for card in self._cards:
-            if card.rank == rank and card.suit == suit:
-                self._cards.remove(card)
-                return True
-        return False
+        card = _CARDS_BY_VALUE.get((rank, suit))
+        if card is None or card not in self._members:
+            return False
+        self._cards.remove(card)
+        code = card._code
+        rank_index = (code >> 8) & 0xF
+        self._members.discard(card)
+        self._rank_counts[rank_index] -= 1
+        if not self._rank_counts[rank_index]:
+            self._rank_bits &= ~(1 << rank_index)
+        self._suit_counts[code & 0xF000] -= 1
+        self._product //= code & 0xFF
+        self._cached_strength = None
+        return True
+
+    def __contains__(self, card: object) -> bool:
+        return card in self._members
+
+    # Single integer key ordering all hands, 1 (worst) to 7462 (royal flush),
+    # computed on first use after the cards change.
+    @property
+    def _strength(self) -> int:
+        strength = self._cached_strength
+        if strength is None:
+            strength = self._cached_strength = self.evaluate()
+        return strength
+
+    @property
+    def strength(self) -> int:
+        return self._strength
 
+    @property
+    def category(self) -> int:
+        return evaluator.CATEGORIES[self._strength]
+
+    # Value tuple decoded from the strength, see best_hand.
+    @property
+    def _hand_value(self) -> tuple[int, int, int, int, int, int]:
+        return evaluator.HAND_VALUES[self._strength]
+
+    # Kept for callers that changed the cards; the strength is now refreshed on its next read.
     def update_best_hand(self):
-        self._hand_value = self.best_hand()
+        self._cached_strength = None
 
+    # Hands compare by their strength alone, so suits never break ties. A cached strength
+    # (never 0) is read directly, skipping the property call.
     def __eq__(self, other: object) -> bool:
-        # Determine if the two hands are equal in order of hands.
         if not isinstance(other, PokerHand):
             return NotImplemented
-        if self._hand_value[0] == other._hand_value[0]:
-            match self._hand_value[0]:
-                # If both hands are Royal Flush, they are equal.
-                case self.ROYAL_FLUSH:
-                    return True
-                # If both hands are Straight Flush, compare the highest card.
-                case self.STRAIGHT_FLUSH:
-                    return self._hand_value[1] == other._hand_value[1]
-                # If both hands are Four of a Kind, compare the four of a kind value.
-                case self.FOUR_OF_A_KIND:
-                    return self._hand_value[1] == other._hand_value[1]
-                # If both hands are Full House, compare the three of a kind value, then pair value.
-                case self.FULL_HOUSE:
-                    return self._hand_value[1] == other._hand_value[1] and self._hand_value[2] == other._hand_value[2]
-                # If both hands are Flush, compare the highest card values.
-                case self.FLUSH:
-                    for i in range(1, 6):
-                        if self._hand_value[i] != other._hand_value[i]:  # type: ignore
-                            return False
-                    # If all the card values are equal:
-                    return True
-                # If both hands are Straight, compare the highest card value.
-                case self.STRAIGHT:
-                    return self._hand_value[1] == other._hand_value[1]
-                # If both hands are Three of a Kind, compare the three of a kind value
-                # and the remaining card values.
-                case self.THREE_OF_A_KIND:
-                    for i in range(1, 4):
-                        if self._hand_value[i] != other._hand_value[i]:  # type: ignore
-                            return False
-                    return True
-                # If both hands are Two Pair, compare the higher value pair,
-                # the lower value pair, and the remaining card.
-                case self.TWO_PAIR:
-                    return (
-                        self._hand_value[1] == other._hand_value[1]
-                        and self._hand_value[2] == other._hand_value[2]
-                        and self._hand_value[3] == other._hand_value[3]
-                    )
-                # If both hands are One Pair, compare the pair value and remaining cards.
-                case self.ONE_PAIR:
-                    for i in range(1, 5):
-                        if self._hand_value[i] != other._hand_value[i]:  # type: ignore
-                            return False
-                    return True
-                # If both hands are High Card, compare all card values.
-                case self.HIGH_CARD:
-                    for i in range(1, 6):
-                        if self._hand_value[i] != other._hand_value[i]:
-                            return False
-                    return True
-                # If hand type is not recognized, raise an error.
-                case _:
-                    raise ValueError("Invalid hand value comparison - unexpected hand type")
-        else:
-            return False
+        return (self._cached_strength or self._strength) == (other._cached_strength or other._strength)
 
-    # Compare tuple returned by this Pokerhand's _hand_value to another Pokerhand.
     def __lt__(self, other: "PokerHand") -> bool:
-        # Determine if the two hands are equal in order of hands.
         if not isinstance(other, PokerHand):
             return NotImplemented
-        if self._hand_value[0] == other._hand_value[0]:
-            match self._hand_value[0]:
-                # If both hands are Royal Flush, they are equal.
-                case self.ROYAL_FLUSH:
-                    return False
-                # If both hands are Straight Flush, compare the highest card.
-                case self.STRAIGHT_FLUSH:
-                    return self._hand_value[1] < other._hand_value[1]
-                # If both hands are Four of a Kind, compare the four of a kind value.
-                case self.FOUR_OF_A_KIND:
-                    return self._hand_value[1] < other._hand_value[1]
-                # If both hands are Full House, compare the three of a kind value first,
-                # then the pair value.
-                case self.FULL_HOUSE:
-                    for i in range(1, 3):
-                        if self._hand_value[i] < other._hand_value[i]:  # type: ignore
-                            return True
-                        if self._hand_value[i] > other._hand_value[i]:  # type: ignore
-                            return False
-                    # If both hands are equal
-                    return False
-                # If both hands are Flush, compare the highest card values in descending order.
-                case self.FLUSH:
-                    for i in range(1, 6):
-                        if self._hand_value[i] < other._hand_value[i]:  # type: ignore
-                            return True
-                        if self._hand_value[i] > other._hand_value[i]:  # type: ignore
-                            return False
-                    # If both hands are equal
-                    return False
-                # If both hands are Straight, compare the highest card value.
-                case self.STRAIGHT:
-                    return self._hand_value[1] < other._hand_value[1]
-                # If both hands are Three of a Kind, compare the three of a kind value first,
-                # then the remaining card values in descending order.
-                case self.THREE_OF_A_KIND:
-                    for i in range(1, 4):
-                        if self._hand_value[i] < other._hand_value[i]:  # type: ignore
-                            return True
-                        elif self._hand_value[i] > other._hand_value[i]:  # type: ignore
-                            return False
-                    # If both hands are equal
-                    return False
-                # If both hands are Two Pair, compare the higher value pair first,
-                # then the lower value pair, and finally the remaining card.
-                case self.TWO_PAIR:
-                    for i in range(1, 4):
-                        if self._hand_value[i] < other._hand_value[i]:  # type: ignore
-                            return True
-                        elif self._hand_value[i] > other._hand_value[i]:  # type: ignore
-                            return False
-                    # If both hands are equal
-                    return False
-                # If both hands are One Pair, compare the pair value first,
-                # then the remaining card values in descending order.
-                case self.ONE_PAIR:
-                    for i in range(1, 5):
-                        if self._hand_value[i] < other._hand_value[i]:  # type: ignore
-                            return True
-                        elif self._hand_value[i] > other._hand_value[i]:  # type: ignore
-                            return False
-                    # If both hands are equal
-                    return False
-                # If both hands are High Card, compare all cards values in decending order.
-                case self.HIGH_CARD:
-                    for i in range(1, 6):
-                        if self._hand_value[i] < other._hand_value[i]:  # type: ignore
-                            return True
-                        elif self._hand_value[i] > other._hand_value[i]:  # type: ignore
-                            return False
-                    # If both hands are equal
-                    return False
-                # If hand type is not recognized, raise an error.
-                case _:
-                    raise ValueError("Invalid hand value comparison - unexpected hand type")
-        else:
-            return self._hand_value[0] < other._hand_value[0]
-
-    def best_hand(self) -> tuple[int, int, int, int, int, int]:  # type:ignore
-        def check_high_card():
-            return max(value_list)
-
-        def check_one_pair() -> bool:
-            pair_count = 0
-            for val in values_to_counts.values():
-                if val == 2:
-                    pair_count += 1
-            return pair_count == 1
-
-        def check_two_pair() -> bool:
-            pair_count = 0
-            for val in values_to_counts.values():
-                if val == 2:
-                    pair_count += 1
-            return pair_count == 2
-
-        def check_three_kind() -> bool:
-            for val in values_to_counts.values():
-                if val == 3:
-                    return True
-            return False
-
-        def check_straight() -> bool:
-            for i in range(len(value_list) - 1):
-                if value_list[i] - value_list[i + 1] != 1:
-                    return False
-            return True
+        return (self._cached_strength or self._strength) < (other._cached_strength or other._strength)
 
-        def check_flush() -> bool:
-            return len(suit_set) == 1
+    def __le__(self, other: "PokerHand") -> bool:
+        if not isinstance(other, PokerHand):
+            return NotImplemented
+        return (self._cached_strength or self._strength) <= (other._cached_strength or other._strength)
 
-        def check_full_house() -> bool:
-            return one_pair and three_kind
+    def __gt__(self, other: "PokerHand") -> bool:
+        if not isinstance(other, PokerHand):
+            return NotImplemented
+        return (self._cached_strength or self._strength) > (other._cached_strength or other._strength)
 
-        def check_four_kind() -> bool:
-            for val in values_to_counts.values():
-                if val == 4:
-                    return True
-            return False
+    def __ge__(self, other: "PokerHand") -> bool:
+        if not isinstance(other, PokerHand):
+            return NotImplemented
+        return (self._cached_strength or self._strength) >= (other._cached_strength or other._strength)
+
+    # The hash follows the strength, so don't change a hand's cards while it is a dict key.
+    def __hash__(self) -> int:
+        return hash((self._cached_strength or self._strength))
+
+    @classmethod
+    def use_rank_table(cls, table) -> None:
+        """
+        Evaluate hands with a memory-mapped rank_table.RankTable, or pass None to go back
+        to the evaluator's lookup tables.
+        """
+        cls._rank_table = table
+
+    @classmethod
+    def use_cache(cls, cache) -> None:
+        """
+        Look up evaluations in an eval_cache.EvaluationCache before computing them, or
+        pass None to stop caching.
+        """
+        cls._cache = cache
+
+    def evaluate(self) -> int:
+        """Return the hand's strength (1-7462, higher is better), from the cache if one is in use."""
+        if self._cache is not None:
+            return self._cache.strength(self)
+        return self._evaluate()
+
+    def _evaluate(self) -> int:
+        # Computes the strength from the lookup tables.
+        if len(self._cards) != 5:
+            return evaluator.evaluate([card._code for card in self._cards])
+        if self._rank_table is not None:
+            return self._rank_table.strength([card.id for card in self._cards])
+        # Five cards are scored straight from the running rank and suit counts.
+        if 5 in self._suit_counts.values():
+            return evaluator.FLUSH_TABLE[self._rank_bits]
+        return evaluator.UNIQUE5_TABLE[self._rank_bits] or evaluator.PRODUCT_TABLE[self._product]
+
+    def best_five(self) -> list[Card]:
+        """Return the 5 cards that make the hand's strength."""
+        if len(self._cards) == 5:
+            return list(self._cards)
+        for cards in combinations(self._cards, 5):
+            if evaluator.evaluate5(*(card._code for card in cards)) == self._strength:
+                return list(cards)
+        raise ValueError("The hand's strength is out of date, call update_best_hand()")
+
+    # Returns the hand's value tuple: the hand type at index 0 followed by the card
+    # values used to break ties, highest priority first. A -1 indicates value not used.
+    # Royal Flush does not need any index 1-5.
+    # Four of a Kind places its value at index 1, and the fifth card at index 2.
+    # Straight Flush and Straight place the high card at index 1 (5 for A-2-3-4-5).
+    # Full House places its Three of a Kind value at index 1, and the pair value at index 2.
+    # Flush and High Card place all five card values in descending order in indexes 1-5.
+    # Three of a Kind places its value at index 1, and the remaining card values in
+    # descending order at indexes 2 and 3.
+    # Two Pair places its higher value at index 1, its lower value at index 2, and the
+    # remaining card at index 3.
+    # Pair places its value at index 1, and the other three values in descending order at
+    # indexes 2-4.
+    def best_hand(self) -> tuple[int, int, int, int, int, int]:
+        return evaluator.hand_value(self.evaluate())
+
+
+def format_hand(hand: PokerHand) -> str:
+    """
+    Return the hand's category and its best five cards, e.g. "Full House: A♠ A♥ A♣ K♦ K♠".
 
-        def check_straight_flush() -> bool:
-            return flush and straight
-
-        def check_royal_flush() -> bool:
-            return straight_flush and high_card == Card.RANK_DICT["a"]
-
-        # A -1 in indexes 1-5 of the return tuple indicates value not used.
-        # Royal Flush does not need any index 1-5.
-        # Four of a Kind places its value at index 1, and the fifth card at index 2.
-        # Straigt Flush, Straight, and High Card place High Card at index 1.
-        # Full House places its Three of a Kind value at index 1, and the pair value at index 2.
-        # Flush places all five card values in descending order in indexes 1-5.
-        # Three of a Kind places its value at index 1, and the remaining card values in descending
-        # at index 2 and 3.
-        # Two Pair places its higher value at index 1, and second value at index 2.
-        # Pair places its value at index 1, and the other three value in descending order at
-        # indexes 2-4.
-        # and the remaining card in the third int value.
-        def result_tuple(
-            hand: int,
-        ) -> tuple[int, int, int, int, int, int]:  # type:ignore
-            match hand:
-                case self.ROYAL_FLUSH:
-                    return (self.ROYAL_FLUSH, -1, -1, -1, -1, -1)
-                case self.STRAIGHT_FLUSH:
-                    return (self.STRAIGHT_FLUSH, high_card, -1, -1, -1, -1)
-                case self.FOUR_OF_A_KIND:
-                    for val, cnt in values_to_counts.items():
-                        if cnt == 4:
-                            fok = val
-                    return (self.FOUR_OF_A_KIND, fok, -1, -1, -1, -1)  # type: ignore
-                case self.FULL_HOUSE:
-                    pair = 0
-                    tok = 0
-                    for val, cnt in values_to_counts.items():
-                        if cnt == 2:
-                            pair = val
-                        if cnt == 3:
-                            tok = val
-                    return (self.FULL_HOUSE, tok, pair, -1, -1, -1)
-                case self.FLUSH:
-                    a = value_list[0]
-                    b = value_list[1]
-                    c = value_list[2]
-                    d = value_list[3]
-                    e = value_list[4]
-                    return (self.FLUSH, a, b, c, d, e)
-                case self.STRAIGHT:
-                    return (self.STRAIGHT, high_card, -1, -1, -1, -1)
-                case self.THREE_OF_A_KIND:
-                    other_cards = []
-                    for val, cnt in values_to_counts.items():
-                        if cnt == 3:
-                            tok = val
-                        if cnt == 1:
-                            other_cards.append(val)
-                    higher = max(other_cards)
-                    lower = min(other_cards)
-                    return (self.THREE_OF_A_KIND, tok, higher, lower, -1, -1)  # type: ignore
-                case self.TWO_PAIR:
-                    pairs = []
-                    for val, cnt in values_to_counts.items():
-                        if cnt == 2:
-                            pairs.append(val)
-                        if cnt == 1:
-                            remaining = val
-                    higher = max(pairs)
-                    lower = min(pairs)
-                    return (self.TWO_PAIR, higher, lower, remaining, -1, -1)  # type: ignore
-                case self.ONE_PAIR:
-                    for val, cnt in values_to_counts.items():
-                        if cnt == 2:
-                            pair = val
-                    b = value_list[2]
-                    c = value_list[3]
-                    d = value_list[4]
-                    return (self.ONE_PAIR, pair, b, c, d, -1)  # type: ignore
-                case self.HIGH_CARD:
-                    a = value_list[0]
-                    b = value_list[1]
-                    c = value_list[2]
-                    d = value_list[3]
-                    e = value_list[4]
-                    return (self.HIGH_CARD, a, b, c, d, e)
-
-        suit_set = {card.suit for card in self._cards}
-        value_list = [card.rank for card in self._cards]
-        value_list.sort(reverse=True)
-        values_to_counts = Counter(value_list)
-
-        high_card = check_high_card()  # High card holds actual card value.
-        one_pair = check_one_pair()
-        two_pair = check_two_pair()
-        three_kind = check_three_kind()
-        flush = check_flush()
-        straight = check_straight()
-        full_house = check_full_house()
-        four_kind = check_four_kind()
-        straight_flush = check_straight_flush()
-        royal_flush = check_royal_flush()
-
-        hands = [
-            (royal_flush, self.ROYAL_FLUSH),
-            (straight_flush, self.STRAIGHT_FLUSH),
-            (four_kind, self.FOUR_OF_A_KIND),
-            (full_house, self.FULL_HOUSE),
-            (flush, self.FLUSH),
-            (straight, self.STRAIGHT),
-            (three_kind, self.THREE_OF_A_KIND),
-            (two_pair, self.TWO_PAIR),
-            (one_pair, self.ONE_PAIR),
-            (True, self.HIGH_CARD),  # Always true as fallback
-        ]
-
-        # The first is_hand that is True is the highest hand.
-        for is_hand, hand in hands:
-            if is_hand:
-                return result_tuple(hand)
+    The cards that decide the category come first (the quads, trips or pairs), then
+    the rest, highest first.
+    """
+    cards = hand.best_five()
+    match hand.category:
+        case PokerHand.ROYAL_FLUSH:
+            name = "Royal Flush"
+            ordered = sorted(cards, key=lambda x: x.rank)
+
+        case PokerHand.STRAIGHT_FLUSH:
+            name = "Straight Flush"
+            ordered = sorted(cards, key=lambda x: x.rank)
+
+        case PokerHand.FOUR_OF_A_KIND:
+            # Group four matching cards first, then the remaining card
+            name = "Four of a Kind"
+            four_value = hand._hand_value[1]
+            four_cards = [card for card in cards if card.rank == four_value]
+            other_card = [card for card in cards if card.rank != four_value]
+            ordered = four_cards + other_card
+
+        case PokerHand.FULL_HOUSE:
+            # Group three matching cards first, then the pair
+            name = "Full House"
+            three_value = hand._hand_value[1]
+            pair_value = hand._hand_value[2]
+            three_cards = [card for card in cards if card.rank == three_value]
+            pair_cards = [card for card in cards if card.rank == pair_value]
+            ordered = three_cards + pair_cards
+
+        case PokerHand.FLUSH:
+            # Sort by value since they're all the same suit
+            name = "Flush"
+            ordered = sorted(cards, key=lambda x: x.rank, reverse=True)
+
+        case PokerHand.STRAIGHT:
+            name = "Straight"
+            ordered = sorted(cards, key=lambda x: x.rank)
+
+        case PokerHand.THREE_OF_A_KIND:
+            name = "Three of a Kind"
+            three_value = hand._hand_value[1]
+            three_cards = [card for card in cards if card.rank == three_value]
+            other_cards = sorted(
+                [card for card in cards if card.rank != three_value],
+                key=lambda x: x.rank,
+                reverse=True,
+            )
+            ordered = three_cards + other_cards
+
+        case PokerHand.TWO_PAIR:
+            name = "Two Pair"
+            high_pair = hand._hand_value[1]
+            low_pair = hand._hand_value[2]
+            high_pair_cards = [card for card in cards if card.rank == high_pair]
+            low_pair_cards = [card for card in cards if card.rank == low_pair]
+            other_card = [card for card in cards if card.rank not in (high_pair, low_pair)]
+            ordered = high_pair_cards + low_pair_cards + other_card
+
+        case PokerHand.ONE_PAIR:
+            name = "One Pair"
+            pair_value = hand._hand_value[1]
+            pair_cards = [card for card in cards if card.rank == pair_value]
+            other_cards = sorted(
+                [card for card in cards if card.rank != pair_value],
+                key=lambda x: x.rank,
+                reverse=True,
+            )
+            ordered = pair_cards + other_cards
+
+        case _:
+            name = "High Card"
+            ordered = sorted(cards, key=lambda x: x.rank, reverse=True)
+
+    return f"{name}: {' '.join(str(card) for card in ordered)}"
 
 
 class Deck:
@@ -456,50 +438,82 @@ class Deck:
     Represents a standard 52-card playing deck.
 
     Manages deck state including dealt cards and provides methods for dealing
-    cards randomly.
+    cards randomly. Dealing is a partial Fisher-Yates shuffle: the dealt cards
+    are kept at the front of _order and each deal swaps a random remaining card
+    to the front, so dealing, "is dealt" checks and resetting are all O(1).
 
     Attributes:
         _deck (dict[int, Card]): Maps card IDs to Card objects
-        _dealt (list[int]): List of IDs of cards that have been dealt
+        _order (list[Card]): All 52 cards; the first _num_dealt have been dealt
+        _position (list[int]): Index in _order of each card, by card ID
+        _num_dealt (int): Number of cards dealt since the last reset
+        _dealt_mask (int): Bit i is set when the card with ID i has been dealt
+        _rng: Source of randomness with a random() method, e.g. random.Random or a
+            numpy Generator; the global random module by default
     """
 
-    def __init__(self) -> None:
+    def __init__(self, rng=None) -> None:
+        self._rng = rng if rng is not None else random
         self._deck: dict[int, Card] = {}
-        self._dealt: list[int] = []
         self._build_deck()
+        self._order: list[Card] = list(CARDS)
+        self._position: list[int] = list(range(len(CARDS)))
+        self._num_dealt = 0
+        self._dealt_mask = 0
 
     def _build_deck(self) -> None:
-        count = 1
-        for suit in Card.SUIT_SET:
-            for rank in Card.RANK_DICT:
-                new_card = Card(rank, suit)
-                self._deck[count] = new_card
-                count += 1
+        # Decks share the interned cards rather than creating their own.
+        for card in CARDS:
+            self._deck[card.id] = card
 
-    def random_deal(self, hand_size: int) -> list[Card]:
-        hand = []
-        # Convert range to set and remove dealt cards via set subtraction.
-        available_cards = set(range(1, len(self._deck) + 1)) - set(self._dealt)
-        # Convert back to list for random.sample.
-        sample = random.sample(list(available_cards), hand_size)
+    # IDs of the cards dealt since the last reset, in the order they were dealt.
+    @property
+    def _dealt(self) -> list[int]:
+        return [card.id for card in self._order[: self._num_dealt]]
 
-        for card_num in sample:
-            hand.append(self._deck[card_num])
-            self._dealt.append(card_num)
+    @property
+    def cards_left(self) -> int:
+        return len(self._order) - self._num_dealt
+
+    def is_dealt(self, card: Card) -> bool:
+        return bool(self._dealt_mask >> card.id & 1)
+
+    def _swap_to_dealt(self, index: int) -> Card:
+        # Move the card at index to the end of the dealt section.
+        order = self._order
+        pos = self._num_dealt
+        card = order[index]
+        other = order[pos]
+        order[pos] = card
+        order[index] = other
+        self._position[card.id] = pos
+        self._position[other.id] = index
+        self._num_dealt = pos + 1
+        self._dealt_mask |= 1 << card.id
+        return card
 
-        return hand
+    def random_deal(self, hand_size: int) -> list[Card]:
+        if not 0 <= hand_size <= self.cards_left:
+            raise ValueError(f"Cannot deal {hand_size} cards from a deck with {self.cards_left} left")
+        return [self.random_deal_one() for _ in range(hand_size)]
 
     def random_deal_one(self) -> Card:
-        # Convert range to set and remove dealt cards via set subtraction.
-        available_cards = set(range(1, len(self._deck) + 1)) - set(self._dealt)
-        # Convert back to list for random.sample.
-        sample = random.sample(list(available_cards), 1)
-        # random.sample return list. We access first/only element.
-        self._dealt.append(sample[0])
-        return self._deck[sample[0]]
+        remaining = len(self._order) - self._num_dealt
+        if remaining == 0:
+            raise ValueError("Cannot deal from an empty deck")
+        return self._swap_to_dealt(self._num_dealt + int(self._rng.random() * remaining))
+
+    def deal_card(self, card: Card) -> Card:
+        """Deal a specific card, e.g. one already known to be out of the deck."""
+        if self.is_dealt(card):
+            raise ValueError(f"{card} has already been dealt")
+        return self._swap_to_dealt(self._position[card.id])
 
     def reset_deck(self) -> None:
-        self._dealt.clear()
+        # The dealt cards stay where they are in _order; any order of the 52 cards
+        # is a valid starting point for the next partial shuffle.
+        self._num_dealt = 0
+        self._dealt_mask = 0
 
     def print_deck(self) -> None:
         for i, card in self._deck.items():
@@ -518,196 +532,409 @@ class Player:
         self._name = name
 
 
-class PokerGame:
+class GameResult:
     """
-    Manages a poker game session.
+    The outcome of one hand played by a PokerEngine.
 
-    Handles game setup, player management, dealing cards, and determining winners.
-    Supports both 5-card draw and 5-card stud variants.
+    Attributes:
+        players (list[Player]): The players in seating order
+        dealt (list[list[Card]]): The cards dealt to each player
+        discards (list[list[Card]]): The cards each player traded in (empty in stud)
+        hands (list[PokerHand]): Each player's final hand
+        winners (list[int]): Indexes of the players sharing the best hand
+        board (list[Card]): The community cards in Texas Hold'em (empty otherwise)
+    """
+
+    def __init__(
+        self,
+        players: list[Player],
+        dealt: list[list[Card]],
+        discards: list[list[Card]],
+        hands: list[PokerHand],
+        winners: list[int],
+        board: list[Card] | None = None,
+    ) -> None:
+        self.players = players
+        self.dealt = dealt
+        self.discards = discards
+        self.hands = hands
+        self.winners = winners
+        self.board = board if board is not None else []
+
+    @property
+    def strengths(self) -> list[int]:
+        return [hand.strength for hand in self.hands]
+
+
+class PokerEngine:
+    """
+    Runs poker hands without any input or output.
+
+    Players, the variant and discard decisions are all passed in as data, so hands
+    can be played programmatically as fast as they can be dealt and evaluated.
+    Supports 5-card draw, 5-card stud and Texas Hold'em.
+
+    In Texas Hold'em each player's hand is their two hole cards plus the board.
+    The board is summarized in an evaluator.BoardState as each street is dealt,
+    so every player's strength is updated from their hole cards alone.
 
     Attributes:
         _draw (bool): True if playing 5-card draw, False for 5-card stud
-        _num_players (int): Number of players in the game
-        _deck (Deck): The game's deck of cards
+        _holdem (bool): True if playing Texas Hold'em
+        _deck (Deck): The game's deck of cards, dealing from rng if one is given
         _players (dict[Player, PokerHand]): Maps players to their poker hands
+        _hole_cards (dict[Player, list[Card]]): Each player's hole cards in Texas Hold'em
+        _board (list[Card]): The community cards dealt so far in Texas Hold'em
+        _board_state (evaluator.BoardState): Running summary of _board
+        _history (hand_history.HandHistoryWriter | None): Log that play() records every game to
+        _games_played (int): Games played by play(), used as the game number in the log
     """
 
-    def __init__(self) -> None:
-        self._draw = False
+    HAND_SIZE = 5
+    MAX_TRADE = 3
+    HOLE_CARDS = 2
+    # Board cards dealt on the flop, turn and river.
+    STREETS = (("Flop", 3), ("Turn", 1), ("River", 1))
+
+    def __init__(
+        self,
+        draw: bool = False,
+        player_names: list[str] | None = None,
+        rng=None,
+        holdem: bool = False,
+        history=None,
+    ) -> None:
+        if draw and holdem:
+            raise ValueError("A game cannot be both 5 card draw and Texas Hold'em.")
+        self._draw = draw
+        self._holdem = holdem
+        self._deck: Deck = Deck(rng)
+        self._players: dict[Player, PokerHand | None] = {}
+        self._hole_cards: dict[Player, list[Card]] = {}
+        self._board: list[Card] = []
+        self._board_state = evaluator.BoardState()
+        self._history = history
+        self._games_played = 0
+        if player_names is not None:
+            self.check_num_players(draw, len(player_names), holdem)
+            for name in player_names:
+                self.add_player(name)
+
+    @staticmethod
+    def check_num_players(draw: bool, num_players: int, holdem: bool = False) -> None:
+        """Raise ValueError if num_players cannot play the variant."""
+        if num_players < 2:
+            raise ValueError("There must be at least 2 players in a game.")
+        if draw and num_players > 6:
+            raise ValueError("There must be 2 to 6 players in a game of 5 card draw.")
+        if holdem and num_players > 10:
+            raise ValueError("There must be 2 to 10 players in a game of Texas Hold'em.")
+        if num_players > 10:
+            raise ValueError("There must be 2 to 10 players in a game of 5 card stud.")
+
+    def add_player(self, name: str) -> Player:
+        player = Player(name)
+        self._players[player] = None
+        return player
+
+    def deal_cards(self, hand_size: int) -> None:
+        for player in self._players:
+            hand = self._deck.random_deal(hand_size)
+            self._players[player] = PokerHand(hand)
+
+    def deal_hole_cards(self) -> None:
+        """Start a Texas Hold'em hand: clear the board and deal each player their hole cards."""
+        self._board = []
+        self._board_state = evaluator.BoardState()
+        for player in self._players:
+            self._hole_cards[player] = self._deck.random_deal(self.HOLE_CARDS)
+            # Nobody has a 5-card hand until the flop.
+            self._players[player] = None
+
+    def deal_street(self) -> list[Card]:
+        """Deal the next street (flop, turn or river), update every hand and return the new board cards."""
+        if not self._holdem:
+            raise ValueError("Only Texas Hold'em has a board.")
+        if not self._hole_cards:
+            raise ValueError("Hole cards must be dealt before the board.")
+        streets_dealt = {0: 0, 3: 1, 4: 2}.get(len(self._board))
+        if streets_dealt is None:
+            raise ValueError("The board has already been dealt.")
+        _, count = self.STREETS[streets_dealt]
+
+        cards = self._deck.random_deal(count)
+        for card in cards:
+            self._board.append(card)
+            self._board_state.add(card._code)
+        # The board was folded into _board_state once; each hand only adds its hole cards.
+        for player, hole in self._hole_cards.items():
+            strength = self._board_state.strength([card._code for card in hole])
+            self._players[player] = PokerHand(hole + self._board, strength)
+        return cards
+
+    def exchange(self, player: Player, cards: list[Card]) -> list[Card]:
+        """Trade cards from the player's hand for new ones from the deck and return the new cards."""
+        if not self._draw:
+            raise ValueError("Cards can only be traded in 5 card draw.")
+        hand = self._players[player]
+        if hand is None:
+            raise ValueError(f"{player._name} has not been dealt a hand.")
+        if len(cards) > self.MAX_TRADE:
+            raise ValueError(f"A player cannot trade more than {self.MAX_TRADE} cards.")
+        if len(set(cards)) != len(cards) or any(card not in hand for card in cards):
+            raise ValueError(f"{player._name} can only trade cards from their own hand.")
+
+        new_cards = []
+        for card in cards:
+            hand.remove_card(card.rank, card.suit)
+            new_card = self._deck.random_deal_one()
+            hand.add_card(new_card)
+            new_cards.append(new_card)
+        hand.update_best_hand()
+        return new_cards
+
+    @staticmethod
+    def rank_hands(hands, top: int | None = None) -> list[list[int]]:
+        """
+        Return the finishing order of hands as groups of indexes, best first.
+
+        Hands that tie share a group, in their original order. None entries (players
+        without a hand) are left out. If top is given only the best top groups are
+        returned, so a large field never sorts the places that cannot finish in them.
+        Hands can be PokerHands or plain integer strengths, including NumPy integers
+        such as the entries of a batch_evaluator.evaluate_batch result.
+        """
+        # One pass buckets the hands by strength; only distinct strengths get ordered.
+        groups: dict[int, list[int]] = {}
+        for i, hand in enumerate(hands):
+            if hand is None:
+                continue
+            if isinstance(hand, PokerHand):
+                strength = hand._cached_strength or hand._strength
+            else:
+                strength = operator.index(hand)
+            group = groups.get(strength)
+            if group is None:
+                groups[strength] = [i]
+            else:
+                group.append(i)
+
+        if top is None:
+            order = sorted(groups, reverse=True)
+        else:
+            order = heapq.nlargest(top, groups)
+        return [groups[strength] for strength in order]
+
+    def ranking(self, top: int | None = None) -> list[list[Player]]:
+        """Return the players' finishing order as tie groups, best first (see rank_hands)."""
+        players = list(self._players)
+        return [[players[i] for i in group] for group in self.rank_hands(self._players.values(), top)]
+
+    def winners(self) -> set:
+        ranking = self.ranking(1)
+        return set(ranking[0]) if ranking else set()
+
+    def play(self, discards=None) -> GameResult:
+        """
+        Play one complete hand from a fresh deck and return the result.
+
+        Args:
+            discards: For 5-card draw, the cards each player trades in. Either a list
+                with one list of cards per player in seating order, or a function
+                called with each player and their PokerHand that returns the cards
+                to trade. None means nobody trades.
+
+        If the engine has a history writer, the game is also appended to its log.
+        """
+        self.check_num_players(self._draw, len(self._players), self._holdem)
+        players = list(self._players)
+        if discards is not None and not self._draw:
+            raise ValueError("Cards can only be traded in 5 card draw.")
+        if isinstance(discards, list) and len(discards) != len(players):
+            raise ValueError("discards must have one entry per player.")
+
+        self._deck.reset_deck()
+        if self._holdem:
+            self.deal_hole_cards()
+            for _ in self.STREETS:
+                self.deal_street()
+            hands = [self._players[player] for player in players]
+            result = GameResult(
+                players,
+                [list(self._hole_cards[player]) for player in players],
+                [[] for _ in players],
+                hands,  # type: ignore
+                self.rank_hands(hands, 1)[0],
+                list(self._board),
+            )
+            return self._record(result)
+
+        self.deal_cards(self.HAND_SIZE)
+        dealt = [list(self._players[player]._cards) for player in players]  # type: ignore
+
+        traded: list[list[Card]] = []
+        for i, player in enumerate(players):
+            if discards is None:
+                cards = []
+            elif callable(discards):
+                cards = list(discards(player, self._players[player]))
+            else:
+                cards = list(discards[i])
+            if cards:
+                self.exchange(player, cards)
+            traded.append(cards)
+
+        hands = [self._players[player] for player in players]
+        return self._record(GameResult(players, dealt, traded, hands, self.rank_hands(hands, 1)[0]))  # type: ignore
+
+    def _record(self, result: GameResult) -> GameResult:
+        if self._history is not None:
+            self._history.write_game(self._games_played, result)
+        self._games_played += 1
+        return result
+
+
+class PokerGame(PokerEngine):
+    """
+    Manages an interactive poker game session in the terminal.
+
+    Prompts for the variant, players and card trades, and shows each player's hand.
+    All dealing, trading and winner logic comes from PokerEngine.
+
+    Attributes:
+        _num_players (int): Number of players in the game
+        _advisor (DiscardAdvisor | None): Suggests trades in 5-card draw; loaded by the first hint
+        _screen (Screen): Buffers output and writes it once per screen
+    """
+
+    def __init__(self, rng=None, screen: Screen | None = None) -> None:
+        self._screen = screen if screen is not None else Screen()
+        draw = False
+        holdem = False
         self._num_players = 0
         while True:
-            ans = input("\nWill this be a game of 5 card draw? y/n: ")
-            if ans in {"y", "Y", "n", "N"}:
+            ans = self._screen.input("\nWill this be a game of 5 card draw? y/n (or h for Texas Hold'em): ")
+            if ans in {"y", "Y", "n", "N", "h", "H"}:
                 if ans.lower() == "y":
-                    self._draw = True
+                    draw = True
+                elif ans.lower() == "h":
+                    holdem = True
                 break
             else:
-                print("You must enter y or n.")
-                input("Press Enter to continue...")
+                self._screen.print("You must enter y, n or h.")
+                self._screen.input("Press Enter to continue...")
 
         while True:
-            ans = input("\nEnter the number of players: ")
+            ans = self._screen.input("\nEnter the number of players: ")
             try:
                 self._num_players = int(ans)
             except ValueError:
-                print("Invalid input. Please enter a number.")
-                input("Press Enter to continue...")
+                self._screen.print("Invalid input. Please enter a number.")
+                self._screen.input("Press Enter to continue...")
                 continue
 
-            if self._num_players < 2:
-                print("There must be at leat 2 players in a game.\n")
-                continue
-            if self._draw and self._num_players > 6:
-                print("There must be 2 to 6 players in a game of 5 card draw.\n")
-                continue
-            elif self._num_players > 10:
-                print("There must be 2 to 10 players in a game of 5 card stud.\n")
+            try:
+                self.check_num_players(draw, self._num_players, holdem)
+            except ValueError as e:
+                self._screen.print(f"{e}\n")
                 continue
 
             break
 
-        self._deck: Deck = Deck()
-        self._players: dict[Player, PokerHand | None] = {}
+        super().__init__(draw, rng=rng, holdem=holdem)
+        self._advisor = None
         self.add_players(self._num_players)
 
     def add_players(self, num_players: int) -> None:
         for _ in range(num_players):
-            name = input("Enter a player's name: ")
-            self._players[Player(name)] = None
-
-    def deal_cards(self, hand_size: int) -> None:
-        for player in self._players:
-            hand = self._deck.random_deal(hand_size)
-            self._players[player] = PokerHand(hand)
+            name = self._screen.input("Enter a player's name: ")
+            self.add_player(name)
 
     def show_hand(self, player: Player) -> None:
         hand = self._players[player]
         if hand:
-            print(f"{player._name} with ", end="")
-            match hand._hand_value[0]:
-                case PokerHand.ROYAL_FLUSH:
-                    sorted_cards = sorted(hand._cards, key=lambda x: x.rank)
-                    print("Royal Flush:", " ".join(str(card) for card in sorted_cards))
-
-                case PokerHand.STRAIGHT_FLUSH:
-                    sorted_cards = sorted(hand._cards, key=lambda x: x.rank)
-                    print("Straight Flush:", " ".join(str(card) for card in sorted_cards))
-
-                case PokerHand.FOUR_OF_A_KIND:
-                    # Group four matching cards first, then the remaining card
-                    four_value = hand._hand_value[1]
-                    four_cards = [card for card in hand._cards if card.rank == four_value]
-                    other_card = [card for card in hand._cards if card.rank != four_value]
-                    print(
-                        "Four of a Kind:",
-                        " ".join(str(card) for card in four_cards + other_card),
-                    )
-
-                case PokerHand.FULL_HOUSE:
-                    # Group three matching cards first, then the pair
-                    three_value = hand._hand_value[1]
-                    pair_value = hand._hand_value[2]
-                    three_cards = [card for card in hand._cards if card.rank == three_value]
-                    pair_cards = [card for card in hand._cards if card.rank == pair_value]
-                    print(
-                        "Full House:",
-                        " ".join(str(card) for card in three_cards + pair_cards),
-                    )
-
-                case PokerHand.FLUSH:
-                    # Sort by value since they're all the same suit
-                    sorted_cards = sorted(hand._cards, key=lambda x: x.rank, reverse=True)
-                    print("Flush:", " ".join(str(card) for card in sorted_cards))
-
-                case PokerHand.STRAIGHT:
-                    sorted_cards = sorted(hand._cards, key=lambda x: x.rank)
-                    print("Straight:", " ".join(str(card) for card in sorted_cards))
-
-                case PokerHand.THREE_OF_A_KIND:
-                    three_value = hand._hand_value[1]
-                    three_cards = [card for card in hand._cards if card.rank == three_value]
-                    other_cards = sorted(
-                        [card for card in hand._cards if card.rank != three_value],
-                        key=lambda x: x.rank,
-                        reverse=True,
-                    )
-                    print(
-                        "Three of a Kind:",
-                        " ".join(str(card) for card in three_cards + other_cards),
-                    )
-
-                case PokerHand.TWO_PAIR:
-                    high_pair = hand._hand_value[1]
-                    low_pair = hand._hand_value[2]
-                    high_pair_cards = [card for card in hand._cards if card.rank == high_pair]
-                    low_pair_cards = [card for card in hand._cards if card.rank == low_pair]
-                    other_card = [card for card in hand._cards if card.rank not in (high_pair, low_pair)]
-                    print(
-                        "Two Pair:",
-                        " ".join(str(card) for card in high_pair_cards + low_pair_cards + other_card),
-                    )
-
-                case PokerHand.ONE_PAIR:
-                    pair_value = hand._hand_value[1]
-                    pair_cards = [card for card in hand._cards if card.rank == pair_value]
-                    other_cards = sorted(
-                        [card for card in hand._cards if card.rank != pair_value],
-                        key=lambda x: x.rank,
-                        reverse=True,
-                    )
-                    print(
-                        "One Pair:",
-                        " ".join(str(card) for card in pair_cards + other_cards),
-                    )
-
-                case PokerHand.HIGH_CARD:
-                    sorted_cards = sorted(hand._cards, key=lambda x: x.rank, reverse=True)
-                    print("High Card:", " ".join(str(card) for card in sorted_cards))
+            self._screen.print(f"{player._name} with {format_hand(hand)}")
 
     def show_players_hand(self, player):
         self.show_hand(player)
 
     def show_all_hands(self) -> None:
         for player in self._players.keys():
-            print(f"\n{player._name}, please have a seat and be sure nobody is looking.")
-            input("Press Enter when you are ready to see your cards ...")
+            self._screen.print(f"\n{player._name}, please have a seat and be sure nobody is looking.")
+            self._screen.input("Press Enter when you are ready to see your cards ...")
             self.show_hand(player)
-            input("Press Enter when you are done seeing your cards ...")
-            # Clear terminal screen
-            os.system("cls" if os.name == "nt" else "clear")
+            self._screen.input("Press Enter when you are done seeing your cards ...")
+            self._screen.clear()
+
+    def show_hole_cards(self) -> None:
+        for player, hole in self._hole_cards.items():
+            self._screen.print(f"\n{player._name}, please have a seat and be sure nobody is looking.")
+            self._screen.input("Press Enter when you are ready to see your hole cards ...")
+            self._screen.print(f"{player._name} holds:", " ".join(str(card) for card in hole))
+            self._screen.input("Press Enter when you are done seeing your cards ...")
+            self._screen.clear()
+
+    def deal_board(self) -> None:
+        for street, _ in self.STREETS:
+            self.deal_street()
+            self._screen.print(f"\n{street}:", " ".join(str(card) for card in self._board))
+            self._screen.input("Press Enter to continue ...")
+
+    def show_discard_hint(self, player: Player) -> None:
+        # Only 5-card draw gives hints, so stud and hold'em never load the advisor.
+        from discard_advisor import draw_counts, load_advisor
+
+        hand = self._players[player]
+        if hand:
+            if self._advisor is None:
+                self._advisor = load_advisor()
+            best = self._advisor.best(hand._cards)
+            if best.cards:
+                counts, total = draw_counts(hand._cards, best.cards)
+                improves = sum(counts[hand.category + 1 :]) / total
+                self._screen.print(
+                    "Hint: trading",
+                    " ".join(str(card) for card in best.cards),
+                    f"gives the best expected hand, and improves it {improves:.1%} of the time.",
+                )
+            else:
+                self._screen.print("Hint: keeping all your cards gives the best expected hand.")
 
     def draw_cards(self) -> None:
         for player in self._players:
             num_cards_trading = 0
-            print(f"\n{player._name}, please have a seat and be sure nobody is looking.")
-            input("Press Enter when you are ready to see your cards ...")
+            self._screen.print(f"\n{player._name}, please have a seat and be sure nobody is looking.")
+            self._screen.input("Press Enter when you are ready to see your cards ...")
             self.show_hand(player)
+            self.show_discard_hint(player)
             while True:
-                ans = input(f"\n{player._name}, how many cards are you trading in (0-3)? ")
+                ans = self._screen.input(f"\n{player._name}, how many cards are you trading in (0-3)? ")
                 try:
                     num_cards_trading = int(ans)
                 except ValueError:
-                    print("Invalid input. Please enter a number.")
-                    input("Press Enter to continue ...")
+                    self._screen.print("Invalid input. Please enter a number.")
+                    self._screen.input("Press Enter to continue ...")
                     continue
 
                 if not 0 <= num_cards_trading <= 3:
-                    print("You must enter a number from 0 to 3.")
-                    input("Press Enter to continue ...")
+                    self._screen.print("You must enter a number from 0 to 3.")
+                    self._screen.input("Press Enter to continue ...")
                     continue
                 else:
                     break
 
             curr_num_cards = 0
             while curr_num_cards < num_cards_trading:
-                trade = input("\nEnter the card you are trading (e.g. qh for Q♥ or 10c for 10♣): ")
+                trade = self._screen.input("\nEnter the card you are trading (e.g. qh for Q♥ or 10c for 10♣): ")
                 if len(trade) == 2:
                     rank, suit = trade[0], trade[1]
                 elif len(trade) == 3 and trade.startswith("10"):
                     rank, suit = "10", trade[2]
                 else:
-                    print("\nInvalid card format. Please enter two characters\n" "(e.g. qh for Q♥ or 10c for 10♣): ")
-                    input("Press Enter to continue ...")
+                    self._screen.print(
+                        "\nInvalid card format. Please enter two characters\n" "(e.g. qh for Q♥ or 10c for 10♣): "
+                    )
+                    self._screen.input("Press Enter to continue ...")
                     continue
 
                 # Get the player's hand.
@@ -715,70 +942,52 @@ class PokerGame:
 
                 # Is trade is a valid card?
                 if rank in Card.RANK_DICT and suit in Card.SUIT_SET:
-                    # If the player is holding this card, remove the card from the players hand.
-                    if player_hand.remove_card(Card.RANK_DICT[rank], suit):
-                        new_card = self._deck.random_deal_one()
-                        player_hand.add_card(new_card)
-                        player_hand.update_best_hand()
+                    # If the player is holding this card, trade it for a new one.
+                    if Card(rank, suit) in player_hand:
+                        self.exchange(player, [Card(rank, suit)])
                         curr_num_cards += 1
                     else:
                         # Use uppercase for face cards and Ace, and get the Unicode suit symbol
                         rank_display = rank.upper() if rank in {"j", "q", "k", "a"} else rank
                         suit_symbol = Card.SUIT_SYMBOLS[suit]
-                        print(f"{player._name} does not have a {rank_display}{suit_symbol}")
-                        input("Press Enter to continue ...")
+                        self._screen.print(f"{player._name} does not have a {rank_display}{suit_symbol}")
+                        self._screen.input("Press Enter to continue ...")
                 else:
-                    print("\nInvalid card. Please enter a valid card value and suit.")
-                    input("Press Enter to continue ...")
+                    self._screen.print("\nInvalid card. Please enter a valid card value and suit.")
+                    self._screen.input("Press Enter to continue ...")
 
-            print("\nYour final hand:")
+            self._screen.print("\nYour final hand:")
             self.show_hand(player)
-            input("\nPress Enter when you are done seeing your cards ...")
-            # Clear terminal screen
-            os.system("cls" if os.name == "nt" else "clear")
-
-    def winners(self) -> set:
-        curr_winners = set()
-        curr_winning_hand = None
-
-        for player, hand in self._players.items():
-            # Skip if current hand is None
-            if hand is None:
-                continue
-
-            # The first player with a valid hand is the initial winner.
-            if len(curr_winners) == 0 or curr_winning_hand is None:
-                curr_winners.add(player)
-                curr_winning_hand = hand
-            elif hand > curr_winning_hand:
-                curr_winners = {player}
-                curr_winning_hand = hand
-            elif hand == curr_winning_hand:
-                curr_winners.add(player)
-
-        return curr_winners
+            self._screen.input("\nPress Enter when you are done seeing your cards ...")
+            self._screen.clear()
 
 
 if __name__ == "__main__":
     game = PokerGame()
-    game.deal_cards(5)
 
-    if game._draw:
-        game.draw_cards()
+    if game._holdem:
+        game.deal_hole_cards()
+        game.show_hole_cards()
+        game.deal_board()
     else:
-        game.show_all_hands()
+        game.deal_cards(5)
+        if game._draw:
+            game.draw_cards()
+        else:
+            game.show_all_hands()
 
     winners = game.winners()
-    input("Press enter to reveal the WINNER!")
-    print("\nAnd the winner is ... ")
+    game._screen.input("Press enter to reveal the WINNER!")
+    game._screen.print("\nAnd the winner is ... ")
     if len(winners) > 1:
-        print("There is a tie between:")
+        game._screen.print("There is a tie between:")
         for player in winners:
             game.show_hand(player)
     else:
         game.show_hand(next(iter(winners)))
 
-    print("\nThe loser(s) are:")
+    game._screen.print("\nThe loser(s) are:")
     for player in game._players:
         if player not in winners:
             game.show_hand(player)
+    game._screen.flush()
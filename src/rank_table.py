@@ -0,0 +1,164 @@
+#!/usr/bin/env python3.11
+"""
+Exhaustive 5-card rank table stored in a memory-mapped binary file.
+
+The build step evaluates all 2,598,960 five-card hands once and writes each
+hand's strength and category to a file indexed by the combinatorial number
+system (colex) rank of its sorted card ids. Loading maps the file with mmap, so
+opening is instant and every process reading the same file shares one copy in
+the OS page cache.
+
+File layout (little-endian):
+
+    header      16 bytes: magic b"PKRT", version, hand count, reserved
+    strengths   uint16 per hand, 1 (worst) to 7462 (royal flush)
+    categories  uint8 per hand, HIGH_CARD ... ROYAL_FLUSH
+
+Build the default table with:
+
+    python3 ./src/rank_table.py [path]
+"""
+
+import mmap
+import os
+import struct
+import sys
+import tempfile
+from array import array
+from math import comb
+
+import evaluator
+from poker_game import CARDS
+
+MAGIC = b"PKRT"
+VERSION = 1
+HEADER = struct.Struct("<4sIII")
+NUM_HANDS = comb(52, 5)
+
+DEFAULT_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "rank_table.bin")
+
+# BINOMIALS[k][n] is C(n, k) for the colex index of a sorted 5-card hand.
+BINOMIALS = tuple(tuple(comb(n, k) for n in range(52)) for k in range(6))
+
+
+def hand_index(ids) -> int:
+    """Return the colex index (0 to 2,598,959) of five distinct card ids."""
+    c0, c1, c2, c3, c4 = sorted(ids)
+    return BINOMIALS[1][c0] + BINOMIALS[2][c1] + BINOMIALS[3][c2] + BINOMIALS[4][c3] + BINOMIALS[5][c4]
+
+
+def build_rank_table(path: str = DEFAULT_PATH) -> None:
+    """Evaluate every 5-card hand and write the rank table to path."""
+    codes = [card.code for card in CARDS]
+    evaluate5 = evaluator.evaluate5
+    categories_by_strength = evaluator.CATEGORIES
+    strengths = array("H")
+    categories = array("B")
+
+    # Nesting the loops from the highest card down visits hands in colex order,
+    # so each hand's position in the arrays is its hand_index.
+    for c4 in range(4, 52):
+        k4 = codes[c4]
+        for c3 in range(3, c4):
+            k3 = codes[c3]
+            for c2 in range(2, c3):
+                k2 = codes[c2]
+                for c1 in range(1, c2):
+                    k1 = codes[c1]
+                    for c0 in range(c1):
+                        strength = evaluate5(codes[c0], k1, k2, k3, k4)
+                        strengths.append(strength)
+                        categories.append(categories_by_strength[strength])
+
+    if sys.byteorder != "little":
+        strengths.byteswap()
+
+    # Write to a temporary file of our own first, so readers never see a partial table
+    # and builders running at the same time never write to the same file.
+    directory, name = os.path.split(os.path.abspath(path))
+    fd, tmp_path = tempfile.mkstemp(prefix=f"{name}.", suffix=".tmp", dir=directory)
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(HEADER.pack(MAGIC, VERSION, NUM_HANDS, 0))
+            strengths.tofile(f)
+            categories.tofile(f)
+        # mkstemp creates the file readable by its owner only.
+        os.chmod(tmp_path, 0o644)
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+
+
+class RankTable:
+    """
+    Read-only view of a rank table file mapped into memory.
+
+    Attributes:
+        _mmap (mmap.mmap): The mapped file
+        _arrays: Cached numpy.memmap views, see arrays()
+        strengths (memoryview): uint16 strength of each hand, indexed by hand_index
+        categories (memoryview): uint8 category of each hand, indexed by hand_index
+    """
+
+    def __init__(self, path: str = DEFAULT_PATH) -> None:
+        self._path = path
+        with open(path, "rb") as f:
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+        magic, version, count, _ = HEADER.unpack_from(self._mmap)
+        expected_size = HEADER.size + count * 3
+        if magic != MAGIC or version != VERSION or count != NUM_HANDS or len(self._mmap) != expected_size:
+            self._mmap.close()
+            raise ValueError(f"{path} is not a valid rank table")
+        if sys.byteorder != "little":
+            self._mmap.close()
+            raise ValueError("Rank tables can only be mapped on little-endian machines")
+
+        self._view = memoryview(self._mmap)
+        self._arrays = None
+        start = HEADER.size
+        self.strengths = self._view[start : start + 2 * count].cast("H")
+        self.categories = self._view[start + 2 * count : expected_size]
+
+    def strength(self, ids) -> int:
+        return self.strengths[hand_index(ids)]
+
+    def category(self, ids) -> int:
+        return self.categories[hand_index(ids)]
+
+    def arrays(self):
+        """Return (strengths, categories) as numpy.memmap arrays over the same file."""
+        if self._arrays is None:
+            import numpy as np
+
+            strengths = np.memmap(self._path, dtype="<u2", mode="r", offset=HEADER.size, shape=(NUM_HANDS,))
+            categories = np.memmap(
+                self._path, dtype=np.uint8, mode="r", offset=HEADER.size + 2 * NUM_HANDS, shape=(NUM_HANDS,)
+            )
+            self._arrays = (strengths, categories)
+        return self._arrays
+
+    def close(self) -> None:
+        self.strengths.release()
+        self.categories.release()
+        self._view.release()
+        self._mmap.close()
+        self._arrays = None
+
+    def __enter__(self) -> "RankTable":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+
+def load_rank_table(path: str = DEFAULT_PATH) -> RankTable:
+    """Map the rank table at path, building it first if it does not exist."""
+    if not os.path.exists(path):
+        build_rank_table(path)
+    return RankTable(path)
+
+
+if __name__ == "__main__":
+    build_rank_table(sys.argv[1] if len(sys.argv) > 1 else DEFAULT_PATH)
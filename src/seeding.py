@@ -0,0 +1,62 @@
+"""
+Reproducible, independently seeded random number streams.
+
+SeedSequence follows the design of numpy.random.SeedSequence: a root sequence
+holds some entropy (a user seed or fresh OS randomness) and spawns children
+identified by their path from the root (the spawn key). Each sequence hashes
+its entropy and spawn key into a 256-bit seed, so children are statistically
+independent of each other and of their parent, and the same root seed always
+produces the same streams no matter which process builds them.
+
+Typical use hands one child to each unit of work, e.g. one per block of
+simulated games:
+
+    root = SeedSequence(1234)
+    decks = [Deck(rng=child.generator()) for child in root.spawn(4)]
+"""
+
+import hashlib
+import random
+import secrets
+
+
+class SeedSequence:
+    """
+    A node in a tree of independent random streams.
+
+    Attributes:
+        entropy (int): The root seed shared by the whole tree
+        spawn_key (tuple[int, ...]): Child indexes leading from the root to this node
+        n_children_spawned (int): Number of children handed out by spawn()
+    """
+
+    def __init__(self, entropy: int | None = None, spawn_key: tuple[int, ...] = ()) -> None:
+        if entropy is None:
+            entropy = secrets.randbits(128)
+        if entropy < 0:
+            raise ValueError("entropy must be a non-negative integer")
+        self.entropy = entropy
+        self.spawn_key = tuple(spawn_key)
+        self.n_children_spawned = 0
+
+    def child(self, index: int) -> "SeedSequence":
+        """Return the child with the given index without advancing spawn()."""
+        return SeedSequence(self.entropy, self.spawn_key + (index,))
+
+    def spawn(self, n: int) -> list["SeedSequence"]:
+        """Return the next n children of this sequence."""
+        start = self.n_children_spawned
+        self.n_children_spawned += n
+        return [self.child(index) for index in range(start, start + n)]
+
+    def generate_state(self) -> int:
+        """Return the 256-bit seed derived from the entropy and spawn key."""
+        key = ",".join(str(part) for part in (self.entropy, *self.spawn_key)).encode()
+        return int.from_bytes(hashlib.blake2b(key, digest_size=32, person=b"poker_game_cli").digest(), "little")
+
+    def generator(self) -> random.Random:
+        """Return a new random.Random seeded from this sequence."""
+        return random.Random(self.generate_state())
+
+    def __repr__(self) -> str:
+        return f"SeedSequence(entropy={self.entropy}, spawn_key={self.spawn_key})"
@@ -0,0 +1,355 @@
+#!/usr/bin/env python3.11
+"""
+Asyncio server hosting many poker tables in one process.
+
+Every player is one connection speaking a line-based text protocol (UTF-8, one
+command or message per line). Tables are coroutines, not threads: a table
+waiting for players or for a decision costs no more than the Futures it awaits,
+so thousands of idle tables and hundreds of active ones share one event loop.
+
+Client commands:
+
+    JOIN <table> <stud|draw|holdem> <seats> <name>
+        Sit at a table, creating it if needed. The game starts when every seat is taken.
+    TRADE [card ...]
+        In 5-card draw, answer a TRADE? prompt with 0-3 cards, e.g. "TRADE qh 10c".
+    QUIT
+        Close the connection. Quitting or disconnecting before a table fills gives back the seat.
+
+Server messages:
+
+    WELCOME, SEATED <table> <seat> <seats>, ERROR <reason>
+    HAND <hand>            the player's own hand, rendered like show_hand
+    HOLE <cards>           hole cards in Texas Hold'em
+    FLOP|TURN|RIVER <board>
+    TRADE? <max cards>     5-card draw only, answered with TRADE
+    SHOWDOWN <name> with <hand>
+    WINNER <name>[, <name> ...]
+    END                    the game is over; the player may JOIN another table
+
+Run a server with:
+
+    python3 ./src/server.py --port 7777
+    python3 ./src/server.py --unix /tmp/poker.sock
+"""
+
+import argparse
+import asyncio
+import random
+
+from poker_game import Card, Player, PokerEngine, format_hand
+from seeding import SeedSequence
+
+VARIANTS = ("stud", "draw", "holdem")
+
+
+def _parse_card(text: str) -> Card:
+    # Cards are typed as in the terminal game, e.g. qh or 10c.
+    return Card(text[:-1].lower(), text[-1:].lower())
+
+
+class Seat:
+    """
+    A connected player sitting at a table.
+
+    Attributes:
+        name (str): The player's name
+        reader (asyncio.StreamReader): Lines from the player
+        writer (asyncio.StreamWriter): Lines to the player
+        player (Player | None): The player in the table's engine, once the game starts
+        done (asyncio.Event): Set when the table has finished with this seat
+        pending (asyncio.Future | None): A read begun while waiting for the table to fill,
+            which the next readline finishes
+    """
+
+    def __init__(self, name: str, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        self.name = name
+        self.reader = reader
+        self.writer = writer
+        self.player: Player | None = None
+        self.done = asyncio.Event()
+        self.pending: asyncio.Future | None = None
+
+    def send(self, line: str) -> None:
+        if not self.writer.is_closing():
+            self.writer.write(f"{line}\n".encode())
+
+    async def readline(self) -> bytes:
+        """Read the player's next line, finishing the pending read first if there is one."""
+        pending, self.pending = self.pending, None
+        if pending is not None:
+            return await pending
+        return await self.reader.readline()
+
+
+class Table:
+    """
+    One table playing a single game once all of its seats are taken.
+
+    Attributes:
+        name (str): Table name used in JOIN
+        variant (str): stud, draw or holdem
+        num_seats (int): Players needed to start
+        seats (list[Seat]): Players seated so far, in seating order
+        full (asyncio.Event): Set when the last seat is taken
+        decision_timeout (float | None): Seconds a player has to answer TRADE? before standing pat
+    """
+
+    def __init__(
+        self, name: str, variant: str, num_seats: int, rng=None, decision_timeout: float | None = None
+    ) -> None:
+        if variant not in VARIANTS:
+            raise ValueError(f"Unknown variant: {variant}")
+        PokerEngine.check_num_players(variant == "draw", num_seats, variant == "holdem")
+        self.name = name
+        self.variant = variant
+        self.num_seats = num_seats
+        self.seats: list[Seat] = []
+        self.full = asyncio.Event()
+        self.decision_timeout = decision_timeout
+        self._engine = PokerEngine(variant == "draw", rng=rng, holdem=variant == "holdem")
+
+    def sit(self, seat: Seat) -> int:
+        if self.full.is_set():
+            raise ValueError(f"Table {self.name} is full")
+        self.seats.append(seat)
+        if len(self.seats) == self.num_seats:
+            self.full.set()
+        return len(self.seats) - 1
+
+    def leave(self, seat: Seat) -> None:
+        """Give back a seat before the game starts."""
+        if self.full.is_set():
+            raise ValueError(f"Table {self.name} has started")
+        self.seats.remove(seat)
+
+    def broadcast(self, line: str) -> None:
+        for seat in self.seats:
+            seat.send(line)
+
+    async def _flush(self) -> None:
+        for seat in self.seats:
+            if not seat.writer.is_closing():
+                try:
+                    await seat.writer.drain()
+                except ConnectionError:
+                    pass
+
+    async def play(self) -> None:
+        """Wait for every seat to be taken, then play one game and release the seats."""
+        await self.full.wait()
+        engine = self._engine
+        try:
+            for seat in self.seats:
+                seat.player = engine.add_player(seat.name)
+
+            if self.variant == "holdem":
+                engine.deal_hole_cards()
+                for seat in self.seats:
+                    seat.send(f"HOLE {' '.join(str(card) for card in engine._hole_cards[seat.player])}")  # type: ignore
+                for street, _ in engine.STREETS:
+                    engine.deal_street()
+                    self.broadcast(f"{street.upper()} {' '.join(str(card) for card in engine._board)}")
+            else:
+                engine.deal_cards(engine.HAND_SIZE)
+                for seat in self.seats:
+                    seat.send(f"HAND {format_hand(engine._players[seat.player])}")  # type: ignore
+            await self._flush()
+
+            if self.variant == "draw":
+                # Everyone decides at once; trades are then made in seating order.
+                trades = await asyncio.gather(*(self._ask_trade(seat) for seat in self.seats))
+                for seat, cards in zip(self.seats, trades):
+                    if cards:
+                        engine.exchange(seat.player, cards)  # type: ignore
+                        seat.send(f"HAND {format_hand(engine._players[seat.player])}")  # type: ignore
+
+            for seat in self.seats:
+                self.broadcast(f"SHOWDOWN {seat.name} with {format_hand(engine._players[seat.player])}")  # type: ignore
+            winners = engine.winners()
+            self.broadcast(f"WINNER {', '.join(seat.name for seat in self.seats if seat.player in winners)}")
+            self.broadcast("END")
+            await self._flush()
+        finally:
+            for seat in self.seats:
+                seat.done.set()
+
+    async def _ask_trade(self, seat: Seat) -> list[Card]:
+        hand = self._engine._players[seat.player]  # type: ignore
+        while True:
+            seat.send(f"TRADE? {self._engine.MAX_TRADE}")
+            try:
+                await seat.writer.drain()
+                line = await asyncio.wait_for(seat.readline(), self.decision_timeout)
+            except (asyncio.TimeoutError, ConnectionError):
+                return []
+            if not line:
+                # The player disconnected, so they stand pat.
+                return []
+            words = line.decode(errors="replace").split()
+            if not words or words[0].upper() != "TRADE":
+                seat.send("ERROR Answer with TRADE followed by 0-3 cards, e.g. TRADE qh 10c")
+                continue
+            try:
+                cards = [_parse_card(word) for word in words[1:]]
+            except ValueError:
+                seat.send("ERROR Invalid card. Enter cards like qh or 10c")
+                continue
+            if len(cards) > self._engine.MAX_TRADE:
+                seat.send(f"ERROR You cannot trade more than {self._engine.MAX_TRADE} cards")
+            elif len(set(cards)) != len(cards) or any(card not in hand for card in cards):
+                seat.send("ERROR You can only trade cards from your own hand")
+            else:
+                return cards
+
+
+class PokerServer:
+    """
+    Accepts connections and seats them at tables.
+
+    Attributes:
+        tables (dict[str, Table]): Tables waiting for players or playing
+        decision_timeout (float | None): Passed to each new table
+        _seeds (SeedSequence): Source of an independent deck stream for each table
+        _tasks (dict[Table, asyncio.Task]): The task playing each open table
+    """
+
+    def __init__(self, seed: int | None = None, decision_timeout: float | None = None) -> None:
+        self.tables: dict[str, Table] = {}
+        self.decision_timeout = decision_timeout
+        self._seeds = SeedSequence(seed)
+        self._tasks: dict[Table, asyncio.Task] = {}
+
+    async def start(self, host: str = "127.0.0.1", port: int = 0, path: str | None = None) -> asyncio.AbstractServer:
+        """Listen on a Unix socket at path if given, otherwise on TCP host:port."""
+        if path is not None:
+            return await asyncio.start_unix_server(self.handle, path=path)
+        return await asyncio.start_server(self.handle, host, port)
+
+    def _open_table(self, name: str, variant: str, num_seats: int) -> Table:
+        rng = random.Random(self._seeds.spawn(1)[0].generate_state())
+        table = Table(name, variant, num_seats, rng, self.decision_timeout)
+        self.tables[name] = table
+        task = asyncio.create_task(self._run_table(table))
+        self._tasks[table] = task
+        task.add_done_callback(lambda _: self._tasks.pop(table, None))
+        return table
+
+    def _close_table(self, table: Table) -> None:
+        if self.tables.get(table.name) is table:
+            del self.tables[table.name]
+        task = self._tasks.get(table)
+        if task is not None:
+            task.cancel()
+
+    async def _run_table(self, table: Table) -> None:
+        try:
+            await table.play()
+        finally:
+            if self.tables.get(table.name) is table:
+                del self.tables[table.name]
+
+    async def _wait_to_play(self, table: Table, seat: Seat) -> bool:
+        """
+        Wait for the table to fill while watching the player's connection.
+
+        Returns False if the player quit or disconnected first, after giving back their
+        seat and closing the table if nobody else is seated.
+        """
+        full = asyncio.ensure_future(table.full.wait())
+        line: asyncio.Future | None = None
+        try:
+            while True:
+                # The read is left pending on the seat, so that once the table fills it
+                # reads the connection from here on, starting with this read.
+                line = seat.pending = asyncio.ensure_future(seat.reader.readline())
+                await asyncio.wait((full, line), return_when=asyncio.FIRST_COMPLETED)
+                if table.full.is_set():
+                    return True
+                seat.pending = None
+                try:
+                    data = line.result()
+                except ConnectionError:
+                    break
+                words = data.decode(errors="replace").split()
+                if not data or (words and words[0].upper() == "QUIT"):
+                    break
+                if words:
+                    missing = table.num_seats - len(table.seats)
+                    seat.send(f"ERROR Waiting for {missing} more player{'s' if missing > 1 else ''}")
+        finally:
+            full.cancel()
+            if not table.full.is_set():
+                if line is not None:
+                    line.cancel()
+                seat.pending = None
+                table.leave(seat)
+                if not table.seats:
+                    self._close_table(table)
+        return False
+
+    async def handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        writer.write(b"WELCOME\n")
+        seat: Seat | None = None
+        try:
+            while line := await (seat.readline() if seat is not None else reader.readline()):
+                words = line.decode(errors="replace").split()
+                if not words:
+                    continue
+                command = words[0].upper()
+                if command == "QUIT":
+                    break
+                if command != "JOIN" or len(words) != 5:
+                    writer.write(b"ERROR Expected JOIN <table> <stud|draw|holdem> <seats> <name>\n")
+                    continue
+                _, name, variant, seats, player_name = words
+                try:
+                    table = self.tables.get(name)
+                    if table is None:
+                        table = self._open_table(name, variant.lower(), int(seats))
+                    elif table.variant != variant.lower() or table.num_seats != int(seats):
+                        raise ValueError(f"Table {name} plays {table.variant} with {table.num_seats} seats")
+                    seat = Seat(player_name, reader, writer)
+                    number = table.sit(seat)
+                except ValueError as e:
+                    writer.write(f"ERROR {e}\n".encode())
+                    continue
+                writer.write(f"SEATED {name} {number} {table.num_seats}\n".encode())
+                if not await self._wait_to_play(table, seat):
+                    break
+                # The table reads this connection until the game is over.
+                await seat.done.wait()
+                await writer.drain()
+        except (ConnectionError, asyncio.CancelledError):
+            # Cancelled when the server shuts down.
+            pass
+        finally:
+            if seat is not None and seat.pending is not None:
+                seat.pending.cancel()
+            writer.close()
+            try:
+                await writer.wait_closed()
+            except (ConnectionError, asyncio.CancelledError):
+                pass
+
+
+async def _serve(args: argparse.Namespace) -> None:
+    server = PokerServer(args.seed, args.timeout)
+    listener = await server.start(args.host, args.port, args.unix)
+    where = args.unix or ", ".join(str(sock.getsockname()) for sock in listener.sockets)
+    print(f"Serving poker tables on {where}")
+    async with listener:
+        await listener.serve_forever()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Host many poker tables over TCP or a Unix socket.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=7777)
+    parser.add_argument("--unix", metavar="PATH", help="listen on a Unix socket instead of TCP")
+    parser.add_argument("--seed", type=int, default=None, help="root seed for reproducible deals")
+    parser.add_argument("--timeout", type=float, default=None, help="seconds to answer TRADE? before standing pat")
+    try:
+        asyncio.run(_serve(parser.parse_args()))
+    except KeyboardInterrupt:
+        pass
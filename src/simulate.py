@@ -0,0 +1,357 @@
+#!/usr/bin/env python3.11
+"""
+Batch simulator that plays many complete poker games without any prompts.
+
+Games are played by PokerEngine, so dealing, trading and winners follow exactly
+the same rules as the interactive game. Work is split into blocks of
+STREAM_BLOCK games, each dealt from its own child of one SeedSequence, and the
+blocks are spread across a process pool. A seeded run therefore produces the
+same games however many processes are used.
+
+Example:
+
+    python3 ./src/simulate.py --games 100000 --players 4 --variant draw --policy keep-pairs --seed 1
+"""
+
+import argparse
+import contextlib
+import json
+import os
+import random
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import eval_cache
+import evaluator
+import instrumentation
+from discard_advisor import DiscardAdvisor, load_advisor
+from hand_history import HandHistoryWriter, pack_game
+from hand_stats import HandStatistics
+from poker_game import Card, Player, PokerEngine, PokerHand
+from seeding import SeedSequence
+
+STREAM_BLOCK = 256
+
+# Random source for random_trade, reseeded from each block's stream.
+_policy_rng = random.Random()
+
+# Loaded on first use by best_trade; uses the precomputed discard table when it has been built.
+_advisor: DiscardAdvisor | None = None
+
+
+def stand_pat(player: Player, hand: PokerHand) -> list[Card]:
+    """Never trade any cards."""
+    return []
+
+
+def keep_pairs(player: Player, hand: PokerHand) -> list[Card]:
+    """Keep straights and better and any paired cards, and trade up to 3 of the lowest other cards."""
+    if hand.category >= PokerHand.STRAIGHT:
+        return []
+    ranks = [card.rank for card in hand._cards]
+    singles = sorted(card for card in hand._cards if ranks.count(card.rank) == 1)
+    # With nothing paired, keep the two highest cards.
+    return singles[: PokerEngine.MAX_TRADE]
+
+
+def random_trade(player: Player, hand: PokerHand) -> list[Card]:
+    """Trade 0-3 random cards."""
+    return _policy_rng.sample(hand._cards, _policy_rng.randint(0, PokerEngine.MAX_TRADE))
+
+
+def best_trade(player: Player, hand: PokerHand) -> list[Card]:
+    """Make the trade with the highest expected final strength."""
+    global _advisor
+    if _advisor is None:
+        _advisor = load_advisor()
+    return _advisor.best(hand._cards).cards
+
+
+POLICIES = {
+    "stand": stand_pat,
+    "keep-pairs": keep_pairs,
+    "random": random_trade,
+    "advisor": best_trade,
+}
+
+
+class SimulationSummary:
+    """
+    Aggregate results of a batch of games.
+
+    categories and winning_categories read the counts kept by stats. A split pot is
+    not a win: winning_categories counts only hands that won outright, so the
+    "Wins %" column of format_summary leaves split pots out. They are counted in
+    tied_games, seat_ties and the tie rate of stats instead.
+
+    Attributes:
+        games (int): Number of games played
+        seat_wins (list[int]): Games won outright by each seat
+        seat_ties (list[int]): Games each seat shared the best hand
+        tied_games (int): Games with more than one winner
+        stats (HandStatistics): Per-category hand counts, win and tie rates and draw improvement
+    """
+
+    def __init__(self, num_players: int) -> None:
+        self.games = 0
+        self.seat_wins = [0] * num_players
+        self.seat_ties = [0] * num_players
+        self.tied_games = 0
+        self.stats = HandStatistics()
+
+    @property
+    def categories(self) -> list[int]:
+        """Final hands of each category, indexed by category."""
+        return self.stats.categories
+
+    @property
+    def winning_categories(self) -> list[int]:
+        """Hands of each category that won outright; split pots are not counted."""
+        return self.stats.wins
+
+    def add(self, result, draw: bool = False) -> None:
+        """Add one game's GameResult; draw adds the draw improvement of 5-card draw too."""
+        self.games += 1
+        self.stats.add_game(result, draw)
+        winners = result.winners
+        if len(winners) == 1:
+            self.seat_wins[winners[0]] += 1
+        else:
+            self.tied_games += 1
+            for seat in winners:
+                self.seat_ties[seat] += 1
+
+    def merge(self, other: "SimulationSummary") -> None:
+        self.games += other.games
+        self.tied_games += other.tied_games
+        self.stats.merge(other.stats)
+        for mine, theirs in (
+            (self.seat_wins, other.seat_wins),
+            (self.seat_ties, other.seat_ties),
+        ):
+            for i, count in enumerate(theirs):
+                mine[i] += count
+
+
+def _game_record(game: int, result) -> dict:
+    return {
+        "game": game,
+        "dealt": [[str(card) for card in cards] for cards in result.dealt],
+        "discards": [[str(card) for card in cards] for cards in result.discards],
+        "hands": [[str(card) for card in hand._cards] for hand in result.hands],
+        "strengths": result.strengths,
+        "winners": result.winners,
+    }
+
+
+def play_blocks(
+    draw: bool,
+    num_players: int,
+    policy: str,
+    blocks: list[tuple[int, int, int]],
+    record: bool,
+    history: bool = False,
+) -> tuple[SimulationSummary, list[dict], bytes]:
+    """
+    Play blocks of (first game number, number of games, seed).
+
+    Returns the summary, the game records if record is set, and the games packed
+    as hand-history records if history is set.
+    """
+    summary = SimulationSummary(num_players)
+    records = []
+    packed = []
+    names = [f"Player{seat + 1}" for seat in range(num_players)]
+    discards = POLICIES[policy] if draw else None
+
+    for first_game, count, seed in blocks:
+        rng = random.Random(seed)
+        # The random policy draws from the block's stream too, so it is reproducible.
+        _policy_rng.seed(rng.random())
+        engine = PokerEngine(draw, names, rng=rng)
+        for game in range(first_game, first_game + count):
+            result = engine.play(discards)
+            summary.add(result, draw)
+            if record:
+                records.append(_game_record(game, result))
+            if history:
+                packed.append(pack_game(game, result))
+
+    return summary, records, b"".join(packed)
+
+
+def simulate(
+    games: int,
+    num_players: int,
+    draw: bool = False,
+    policy: str = "stand",
+    processes: int | None = None,
+    chunk_size: int = 4096,
+    seed: int | None = None,
+    on_game=None,
+    history: HandHistoryWriter | None = None,
+    cache: int = 0,
+) -> SimulationSummary:
+    """
+    Play games across a process pool and return the combined summary.
+
+    If on_game is given it is called with a dict describing every game, in game order.
+    If history is given every game is appended to it, in game order.
+    If cache is set every process caches up to that many hand evaluations.
+    """
+    PokerEngine.check_num_players(draw, num_players)
+    if policy not in POLICIES:
+        raise ValueError(f"Unknown discard policy: {policy}")
+
+    root = SeedSequence(seed)
+    starts = range(0, games, STREAM_BLOCK)
+    blocks = [
+        (start, min(STREAM_BLOCK, games - start), stream.generate_state())
+        for start, stream in zip(starts, root.spawn(len(starts)))
+    ]
+    blocks_per_chunk = max(1, chunk_size // STREAM_BLOCK)
+    chunks = [blocks[i : i + blocks_per_chunk] for i in range(0, len(blocks), blocks_per_chunk)]
+    record = on_game is not None
+    write_history = history is not None
+
+    summary = SimulationSummary(num_players)
+
+    def collect(results) -> None:
+        for chunk_summary, records, packed in results:
+            summary.merge(chunk_summary)
+            for game in records:
+                on_game(game)  # type: ignore
+            if packed:
+                history.write_records(packed)  # type: ignore
+
+    if processes == 1 or len(chunks) <= 1:
+        with eval_cache.caching(cache) if cache else contextlib.nullcontext():
+            collect(play_blocks(draw, num_players, policy, chunk, record, write_history) for chunk in chunks)
+        return summary
+
+    n = len(chunks)
+    workers = processes or os.cpu_count()
+    initializer, initargs = (eval_cache.enable, (cache,)) if cache else (None, ())
+    with ProcessPoolExecutor(max_workers=workers, initializer=initializer, initargs=initargs) as pool:
+        # map returns chunks in order, so streamed and logged games stay in game order.
+        collect(
+            pool.map(
+                play_blocks, [draw] * n, [num_players] * n, [policy] * n, chunks, [record] * n, [write_history] * n
+            )
+        )
+    return summary
+
+
+def format_summary(summary: SimulationSummary, elapsed: float, draw: bool) -> str:
+    variant = "draw" if draw else "stud"
+    hands = sum(summary.categories)
+    lines = [
+        f"Played {summary.games} games of 5 card {variant} with {len(summary.seat_wins)} players "
+        f"in {elapsed:.2f}s ({summary.games / elapsed:,.0f} games/s)",
+        "",
+        f"{'Hand':<16}{'Hands %':>10}{'Wins %':>10}{'Win rate %':>12}{'Tie rate %':>12}"
+        + (f"{'Improved %':>12}" if draw else ""),
+    ]
+    stats = summary.stats
+    for category in range(evaluator.ROYAL_FLUSH, 0, -1):
+        lines.append(
+            f"{evaluator.CATEGORY_NAMES[category]:<16}"
+            f"{100 * summary.categories[category] / hands:>10.4f}"
+            f"{100 * summary.winning_categories[category] / summary.games:>10.4f}"
+            f"{100 * stats.win_rate(category):>12.4f}"
+            f"{100 * stats.tie_rate(category):>12.4f}"
+            + (f"{100 * stats.improvement_rate(category):>12.4f}" if draw else "")
+        )
+    lines.append("")
+    lines.append(f"{'Seat':<16}{'Win %':>10}{'Tie %':>10}")
+    for seat, (wins, ties) in enumerate(zip(summary.seat_wins, summary.seat_ties)):
+        lines.append(f"{f'Player{seat + 1}':<16}{100 * wins / summary.games:>10.4f}{100 * ties / summary.games:>10.4f}")
+    lines.append(f"{'Tied games':<16}{100 * summary.tied_games / summary.games:>10.4f}")
+    return "\n".join(lines)
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description="Play many poker games without prompts and report statistics.")
+    parser.add_argument("--games", type=int, default=100_000, help="number of games to play")
+    parser.add_argument("--players", type=int, default=4, help="number of players per game")
+    parser.add_argument("--variant", choices=["stud", "draw"], default="stud")
+    parser.add_argument("--policy", choices=sorted(POLICIES), default="keep-pairs", help="discard policy for draw")
+    parser.add_argument("--processes", type=int, default=None, help="worker processes (default: all cores)")
+    parser.add_argument("--chunk-size", type=int, default=4096, help="games per worker task")
+    parser.add_argument("--seed", type=int, default=None, help="root seed for reproducible runs")
+    parser.add_argument("--stream", metavar="PATH", help="write one JSON line per game to PATH ('-' for stdout)")
+    parser.add_argument("--history", metavar="PATH", help="append every game to a binary hand-history log at PATH")
+    parser.add_argument("--cache", type=int, default=0, help="cache up to this many hand evaluations per process")
+    parser.add_argument(
+        "--instrument",
+        type=float,
+        metavar="SECONDS",
+        help="count and time hot-path events, printing them every SECONDS (0 for only at the end)",
+    )
+    parser.add_argument("--profile", action="store_true", help="print a cProfile report of the run")
+    parser.add_argument("--profile-memory", action="store_true", help="also trace allocations with tracemalloc")
+    args = parser.parse_args(argv)
+
+    if args.games < 1:
+        parser.error("--games must be at least 1")
+    if args.cache < 0:
+        parser.error("--cache must not be negative")
+    draw = args.variant == "draw"
+    try:
+        PokerEngine.check_num_players(draw, args.players)
+    except ValueError as e:
+        parser.error(str(e))
+
+    out = None
+    on_game = None
+    if args.stream:
+        out = sys.stdout if args.stream == "-" else open(args.stream, "w", encoding="utf-8")
+
+        def on_game(game: dict) -> None:
+            out.write(json.dumps(game, ensure_ascii=False) + "\n")
+
+    history = HandHistoryWriter(args.history) if args.history else None
+    report = sys.stderr if args.stream == "-" else sys.stdout
+
+    # Counters and profilers only see this process, so instrumented runs play every game here.
+    processes = args.processes
+    diagnostics = contextlib.ExitStack()
+    if args.instrument is not None:
+        processes = 1
+        instrumentation.enable()
+        diagnostics.callback(instrumentation.disable)
+        diagnostics.callback(lambda: print(instrumentation.snapshot().format(), file=report))
+        if args.instrument > 0:
+            diagnostics.enter_context(instrumentation.PeriodicDump(args.instrument, report))
+    if args.profile or args.profile_memory:
+        processes = 1
+        diagnostics.enter_context(instrumentation.profile(report, memory=args.profile_memory))
+
+    start = time.perf_counter()
+    try:
+        with diagnostics:
+            summary = simulate(
+                args.games,
+                args.players,
+                draw,
+                args.policy,
+                processes,
+                args.chunk_size,
+                args.seed,
+                on_game,
+                history,
+                args.cache,
+            )
+    finally:
+        if out is not None and out is not sys.stdout:
+            out.close()
+        if history is not None:
+            history.close()
+    elapsed = time.perf_counter() - start
+
+    print(format_summary(summary, elapsed, draw), file=report)
+
+
+if __name__ == "__main__":
+    main()
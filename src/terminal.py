@@ -0,0 +1,56 @@
+"""
+Buffered terminal output for the interactive game.
+
+A Screen collects everything printed for one screen and writes it to the
+terminal in a single call, just before the game waits for input. Clearing the
+screen is an ANSI escape sequence added to that same write, rather than a
+"clear" or "cls" subprocess per screen, so redrawing costs nothing over a slow
+SSH link.
+
+When output is not a terminal (piped, redirected or TERM=dumb), or when created
+with tty=False, the screen is never cleared, which keeps scripted runs and logs
+readable.
+"""
+
+import os
+import sys
+
+# Move the cursor home, clear the screen and its scrollback.
+CLEAR = "\x1b[H\x1b[2J\x1b[3J"
+
+
+class Screen:
+    """
+    Collects output and writes it to the terminal once per screen.
+
+    Attributes:
+        out: Stream written to
+        tty (bool): True if the screen may be cleared with ANSI escape sequences
+        _buffer (list[str]): Text waiting to be written
+    """
+
+    def __init__(self, out=None, tty: bool | None = None) -> None:
+        self.out = out if out is not None else sys.stdout
+        if tty is None:
+            tty = self.out.isatty() and os.environ.get("TERM") != "dumb"
+        self.tty = tty
+        self._buffer: list[str] = []
+
+    def print(self, *values, sep: str = " ", end: str = "\n") -> None:
+        self._buffer.append(sep.join(str(value) for value in values) + end)
+
+    def clear(self) -> None:
+        """Start a new screen. Anything still buffered would be cleared anyway, so it is dropped."""
+        if self.tty:
+            self._buffer = [CLEAR]
+
+    def flush(self) -> None:
+        if self._buffer:
+            self.out.write("".join(self._buffer))
+            self._buffer.clear()
+        self.out.flush()
+
+    def input(self, prompt: str = "") -> str:
+        """Write the screen, then read a line from the player."""
+        self.flush()
+        return input(prompt)
@@ -0,0 +1,65 @@
+import pytest
+
+np = pytest.importorskip("numpy")
+
+import batch_evaluator  # noqa: E402
+import evaluator  # noqa: E402
+from poker_game import CARDS, Card, PokerEngine, PokerHand  # noqa: E402
+
+
+def random_hands(n, seed=0):
+    rng = np.random.default_rng(seed)
+    return np.argsort(rng.random((n, 52)), axis=1)[:, :5]
+
+
+def test_batch_matches_poker_hand():
+    ids = random_hands(5000)
+    strengths = batch_evaluator.evaluate_batch(ids)
+    assert strengths.shape == (5000,)
+    for row, strength in zip(ids, strengths):
+        hand = PokerHand([CARDS[i] for i in row])
+        assert hand.strength == strength
+        assert hand.best_hand()[0] == batch_evaluator.categories_batch(strength)
+
+
+def test_batch_strengths_rank_like_hands():
+    ids = random_hands(50)
+    strengths = batch_evaluator.evaluate_batch(ids)[10:30]
+    hands = [PokerHand([CARDS[i] for i in row]) for row in ids[10:30]]
+    assert PokerEngine.rank_hands(strengths) == PokerEngine.rank_hands(hands)
+    assert PokerEngine.rank_hands(strengths, 2) == PokerEngine.rank_hands(hands, 2)
+
+
+def test_batch_every_category():
+    hands = [
+        [Card("a", "h"), Card("k", "h"), Card("q", "h"), Card("j", "h"), Card("10", "h")],
+        [Card("9", "c"), Card("8", "c"), Card("7", "c"), Card("6", "c"), Card("5", "c")],
+        [Card("a", "h"), Card("a", "d"), Card("a", "c"), Card("a", "s"), Card("k", "h")],
+        [Card("a", "h"), Card("a", "d"), Card("a", "c"), Card("k", "h"), Card("k", "d")],
+        [Card("a", "h"), Card("j", "h"), Card("9", "h"), Card("7", "h"), Card("4", "h")],
+        [Card("a", "h"), Card("2", "c"), Card("3", "d"), Card("4", "s"), Card("5", "h")],
+        [Card("a", "h"), Card("a", "d"), Card("a", "c"), Card("k", "h"), Card("q", "d")],
+        [Card("a", "h"), Card("a", "d"), Card("k", "c"), Card("k", "h"), Card("q", "d")],
+        [Card("a", "h"), Card("a", "d"), Card("k", "c"), Card("q", "h"), Card("j", "d")],
+        [Card("a", "h"), Card("k", "d"), Card("q", "c"), Card("j", "h"), Card("9", "d")],
+    ]
+    strengths = batch_evaluator.evaluate_batch(batch_evaluator.card_ids(hands))
+    assert list(batch_evaluator.categories_batch(strengths)) == list(range(evaluator.ROYAL_FLUSH, 0, -1))
+    assert list(strengths) == [PokerHand(hand).strength for hand in hands]
+
+
+def test_batch_empty():
+    assert batch_evaluator.evaluate_batch(np.empty((0, 5), dtype=np.uint8)).shape == (0,)
+
+
+def test_batch_rejects_bad_input():
+    with pytest.raises(ValueError):
+        batch_evaluator.evaluate_batch(np.zeros((3, 4), dtype=np.uint8))
+    with pytest.raises(ValueError):
+        batch_evaluator.evaluate_batch(np.full((1, 5), 52))
+    with pytest.raises(ValueError, match="row 1"):
+        batch_evaluator.evaluate_batch(np.array([[0, 1, 2, 3, 4], [0, 0, 0, 0, 0]]))
+    with pytest.raises(ValueError, match=f"row {batch_evaluator.BLOCK_SIZE}"):
+        ids = random_hands(batch_evaluator.BLOCK_SIZE + 1)
+        ids[-1, 4] = ids[-1, 1]
+        batch_evaluator.evaluate_batch(ids)
@@ -0,0 +1,36 @@
+import importlib.util
+import io
+import json
+import os
+
+import pytest
+
+BENCH_PATH = os.path.join(os.path.dirname(__file__), "..", "benchmarks", "bench.py")
+
+
+@pytest.fixture(scope="module")
+def bench():
+    spec = importlib.util.spec_from_file_location("bench", BENCH_PATH)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)  # type: ignore
+    return module
+
+
+def test_compare_flags_slowdowns(bench):
+    baseline = {"a": 1.0, "b": 1.0, "c": 1.0}
+    results = {"a": 1.1, "b": 1.5, "c": 0.5, "new": 9.0}
+    assert bench.compare(results, baseline, 0.2) == [("b", pytest.approx(0.5))]
+
+
+def test_quick_run_and_baseline(bench, tmp_path, capsys):
+    results = bench.run_benchmarks(quick=True, pattern="[1]", repeats=1, out=io.StringIO())
+    assert set(results) == {"best_hand[1]", "compare[1]", "random_deal[1]", "random_deal_one[1]"}
+    assert all(seconds > 0 for seconds in results.values())
+
+    path = tmp_path / "baseline.json"
+    assert bench.main(["--quick", "-k", "winners[2", "--repeats", "1", "--save", "--baseline", str(path)]) == 0
+    assert list(json.loads(path.read_text(encoding="utf-8"))) == ["winners[2 players]"]
+    # Any real run is far slower than a 1 picosecond baseline.
+    path.write_text(json.dumps({"winners[2 players]": 1e-12}), encoding="utf-8")
+    assert bench.main(["--quick", "-k", "winners[2", "--repeats", "1", "--baseline", str(path)]) == 1
+    assert "regression" in capsys.readouterr().out
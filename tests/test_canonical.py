@@ -0,0 +1,100 @@
+import random
+from itertools import combinations, permutations
+
+import pytest
+
+from canonical import CanonicalHand, canonical_hands, canonicalize
+from poker_game import Card
+
+SUIT_PERMUTATIONS = list(permutations(range(4)))
+
+
+def relabel(ids, perm):
+    return [(card & ~3) | perm[card & 3] for card in ids]
+
+
+def brute_force(ids, dead):
+    # The smallest (dead, hand) over every relabelling of the suits.
+    return min(
+        (tuple(sorted(relabel(dead, perm))), tuple(sorted(relabel(ids, perm)))) for perm in SUIT_PERMUTATIONS
+    )
+
+
+def test_canonical_form_is_smallest_relabelling():
+    rng = random.Random(0)
+    for _ in range(2000):
+        cards = rng.sample(range(52), rng.randint(1, 7) + rng.randint(0, 4))
+        size = rng.randint(1, len(cards))
+        ids, dead = cards[:size], cards[size:]
+        canonical = canonicalize(ids, dead)
+        assert (canonical.dead, canonical.ids) == brute_force(ids, dead)
+        assert canonical.map([ids[pos] for pos in canonical.order]) == list(canonical.ids)
+        assert tuple(sorted(canonical.map(dead))) == canonical.dead
+
+
+def test_suit_permutations_share_canonical_form():
+    rng = random.Random(1)
+    for _ in range(200):
+        ids = rng.sample(range(52), 5)
+        dead = rng.sample([card for card in range(52) if card not in ids], 3)
+        canonical = canonicalize(ids, dead)
+        for perm in SUIT_PERMUTATIONS:
+            other = canonicalize(relabel(ids, perm)[::-1], relabel(dead, perm))
+            assert other == canonical
+            assert other.key == canonical.key
+            assert other.multiplicity == canonical.multiplicity
+
+
+def test_accepts_cards():
+    hand = [Card("a", "h"), Card("k", "h")]
+    canonical = canonicalize(hand)
+    assert canonical.ids == canonicalize([Card("k", "c"), Card("a", "c")]).ids
+    assert canonical.multiplicity == 4
+    assert canonicalize([Card("a", "h"), Card("k", "s")]).multiplicity == 12
+    assert canonicalize([Card("a", "h"), Card("a", "s")]).multiplicity == 6
+
+
+def test_multiplicity_with_dead_cards():
+    # With the ace of spades dead, hearts, diamonds and clubs are still interchangeable.
+    dead = [Card("a", "s")]
+    assert canonicalize([Card("k", "h")], dead).multiplicity == 3
+    assert canonicalize([Card("k", "s")], dead).multiplicity == 1
+
+
+@pytest.mark.parametrize("size, classes", [(1, 13), (2, 169), (3, 1755)])
+def test_canonical_hands_cover_every_hand(size, classes):
+    hands = list(canonical_hands(size))
+    assert len(hands) == classes
+    assert sum(hand.multiplicity for hand in hands) == len(list(combinations(range(52), size)))
+
+
+def test_canonical_hands_with_dead_cards():
+    hands = list(canonical_hands(2, [51, 3]))
+    assert all(isinstance(hand, CanonicalHand) and hand.dead == (0, 48) for hand in hands)
+    assert sum(hand.multiplicity for hand in hands) == 50 * 49 // 2
+
+
+def test_rejects_repeated_cards():
+    with pytest.raises(ValueError):
+        canonicalize([1, 1])
+    with pytest.raises(ValueError):
+        canonicalize([1, 2], [2])
+
+
+def test_known_groups_stay_apart():
+    rng = random.Random(2)
+    for _ in range(1000):
+        cards = rng.sample(range(52), 10)
+        dead, first, second, ids = cards[:2], cards[2:4], cards[4:6], cards[6:]
+        canonical = canonicalize(ids, dead, [first, second])
+        assert (canonical.dead, *canonical.known, canonical.ids) == min(
+            tuple(tuple(sorted(relabel(group, perm))) for group in (dead, first, second, ids))
+            for perm in SUIT_PERMUTATIONS
+        )
+
+    # Swapping hearts and spades would move the ace of hearts to the other player.
+    known = [[Card("a", "h")], [Card("a", "s")]]
+    assert canonicalize([Card("k", "h")], known=known).multiplicity == 1
+    assert canonicalize([Card("k", "h")], [Card("a", "h"), Card("a", "s")]).multiplicity == 2
+    hands = list(canonical_hands(1, known=known))
+    assert sum(hand.multiplicity for hand in hands) == 50
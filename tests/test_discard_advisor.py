@@ -0,0 +1,130 @@
+from fractions import Fraction
+from itertools import combinations
+
+import pytest
+
+import discard_advisor
+from canonical import canonicalize
+import evaluator
+from poker_game import CARDS, Card, PokerHand
+
+
+@pytest.fixture
+def four_flush():
+    return [Card("a", "h"), Card("j", "h"), Card("7", "h"), Card("4", "h"), Card("2", "c")]
+
+
+@pytest.fixture
+def pair_of_queens():
+    return [Card("q", "h"), Card("q", "d"), Card("9", "c"), Card("4", "h"), Card("2", "d")]
+
+
+def brute_force(cards):
+    codes = [card.code for card in cards]
+    rest = [card.code for card in CARDS if card not in cards]
+    results = []
+    for discard in discard_advisor.DISCARDS:
+        held = [code for pos, code in enumerate(codes) if pos not in discard]
+        strengths = [evaluator.evaluate5(*held, *draw) for draw in combinations(rest, len(discard))]
+        results.append(sum(strengths) / len(strengths))
+    return results
+
+
+def test_discards_are_legal():
+    assert len(discard_advisor.DISCARDS) == 26
+    assert len(set(discard_advisor.DISCARDS)) == 26
+    assert all(len(discard) <= 3 for discard in discard_advisor.DISCARDS)
+
+
+def test_expected_strengths_are_exact(four_flush):
+    expected = discard_advisor.expected_strengths([card.id for card in four_flush])
+    assert expected == pytest.approx(brute_force(four_flush), rel=1e-12)
+
+
+def test_suit_permutations_share_canonical_hand(pair_of_queens):
+    swapped = [Card("q", "s"), Card("q", "c"), Card("9", "d"), Card("4", "s"), Card("2", "c")]
+    key = canonicalize(pair_of_queens).key
+    assert canonicalize(reversed(swapped)).key == key
+    assert discard_advisor.DiscardAdvisor().options(swapped)[1].expected_strength == pytest.approx(
+        discard_advisor.DiscardAdvisor().options(pair_of_queens)[1].expected_strength
+    )
+
+
+def test_options_return_callers_cards(pair_of_queens):
+    options = discard_advisor.DiscardAdvisor().options(pair_of_queens)
+    assert len(options) == 26
+    assert options[0].cards == []
+    assert options[0].expected_strength == PokerHand(pair_of_queens).strength
+    assert all(card in pair_of_queens for option in options for card in option.cards)
+    best = discard_advisor.DiscardAdvisor().best(pair_of_queens)
+    assert sorted(best.cards) == [Card("2", "d"), Card("4", "h"), Card("9", "c")]
+
+
+def test_best_keeps_made_hands():
+    royal_flush = [Card("a", "h"), Card("k", "h"), Card("q", "h"), Card("j", "h"), Card("10", "h")]
+    assert discard_advisor.DiscardAdvisor().best(royal_flush).cards == []
+
+
+def test_best_draws_to_flush(four_flush):
+    assert discard_advisor.DiscardAdvisor().best(four_flush).cards == [Card("2", "c")]
+
+
+def test_table_lookup(tmp_path, pair_of_queens):
+    ids = [card.id for card in pair_of_queens]
+    key = canonicalize(ids).key
+    path = tmp_path / "discard_table.bin"
+    discard_advisor.write_discard_table(str(path), [(key, tuple(range(26)))])
+    table = discard_advisor.DiscardTable(str(path))
+    try:
+        assert table.get(key) == tuple(float(value) for value in range(26))
+        assert table.get(key + 1) is None
+        options = discard_advisor.DiscardAdvisor(table).options(pair_of_queens)
+        assert [option.expected_strength for option in options] == list(range(26))
+    finally:
+        table.close()
+    assert [p.name for p in tmp_path.iterdir()] == ["discard_table.bin"]
+
+
+def test_table_rows_are_canonical():
+    rows = discard_advisor._table_rows(6)
+    keys = [key for key, _ in rows]
+    assert len(keys) == len(set(keys))
+    for key, strengths in rows:
+        ids = discard_advisor._key_ids(key)
+        assert canonicalize(ids).key == key
+        assert strengths == discard_advisor.expected_strengths(ids)
+
+
+def brute_force_categories(cards, discard, dead=()):
+    held = [card.code for card in cards if card not in discard]
+    rest = [card.code for card in CARDS if card not in cards and card not in dead]
+    counts = [0] * (evaluator.ROYAL_FLUSH + 1)
+    for draw in combinations(rest, len(discard)):
+        counts[evaluator.category(evaluator.evaluate5(*held, *draw))] += 1
+    return counts
+
+
+def test_draw_counts_are_exact(four_flush, pair_of_queens):
+    dead = [Card("k", "h"), Card("3", "h"), Card("q", "c")]
+    for cards, discard in ((four_flush, four_flush[4:]), (pair_of_queens, pair_of_queens[2:])):
+        for known in ((), dead):
+            counts, total = discard_advisor.draw_counts(cards, discard, known)
+            assert counts == brute_force_categories(cards, discard, known)
+            assert total == sum(counts)
+
+
+def test_draw_distribution(four_flush):
+    distribution = discard_advisor.draw_distribution(four_flush, [Card("2", "c")])
+    assert sum(distribution) == 1
+    assert distribution[evaluator.FLUSH] == Fraction(9, 47)
+    kept = discard_advisor.draw_distribution(four_flush, [])
+    assert kept[evaluator.HIGH_CARD] == 1
+
+
+def test_draw_counts_rejects_bad_discards(four_flush):
+    with pytest.raises(ValueError):
+        discard_advisor.draw_counts(four_flush, four_flush[:4])
+    with pytest.raises(ValueError):
+        discard_advisor.draw_counts(four_flush, [Card("k", "s")])
+    with pytest.raises(ValueError):
+        discard_advisor.draw_counts(four_flush, four_flush[:1], [four_flush[2]])
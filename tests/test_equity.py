@@ -0,0 +1,184 @@
+import time
+from fractions import Fraction
+from itertools import combinations
+from math import comb
+
+import pytest
+
+import equity
+import evaluator
+from poker_game import CARDS, Card
+
+
+@pytest.fixture
+def aces_full():
+    return [Card("a", "h"), Card("a", "d"), Card("a", "c"), Card("k", "h"), Card("k", "d")]
+
+
+@pytest.fixture
+def seven_high():
+    return [Card("7", "s"), Card("5", "h"), Card("4", "s"), Card("3", "d"), Card("2", "s")]
+
+
+def test_equity_complete_hands(aces_full, seven_high):
+    result = equity.equity([aces_full, seven_high], trials=100, processes=1)
+    assert result.trials == 100
+    assert result.wins == [100, 0]
+    assert result.losses == [0, 100]
+    assert result.ties == [0, 0]
+
+
+def test_equity_counts_add_up():
+    hands = [[Card("a", "h"), Card("a", "d")], [Card("k", "c"), Card("k", "s")], []]
+    result = equity.equity(hands, trials=2000, chunk_size=500, processes=1, seed=1)
+    for player in range(3):
+        assert result.wins[player] + result.ties[player] + result.losses[player] == 2000
+    assert result.win_rate(0) > result.win_rate(1)
+
+
+def test_equity_reproducible_across_processes():
+    hands = [[Card("q", "h"), Card("q", "d")], [Card("j", "c")]]
+    serial = equity.equity(hands, trials=3000, chunk_size=1000, processes=1, seed=7)
+    parallel = equity.equity(hands, trials=3000, chunk_size=1000, processes=2, seed=7)
+    assert (serial.wins, serial.ties, serial.losses) == (parallel.wins, parallel.ties, parallel.losses)
+
+
+def test_equity_draw_discards(aces_full, seven_high):
+    # Without the aces the kings can be outdrawn.
+    result = equity.equity(
+        [aces_full, seven_high],
+        variant=equity.DRAW,
+        discards=[aces_full[:3], seven_high[:3]],
+        trials=2000,
+        processes=1,
+        seed=3,
+    )
+    assert result.trials == 2000
+    assert 0 < result.losses[0] < result.wins[0]
+
+
+def test_equity_invalid_input(aces_full, seven_high):
+    with pytest.raises(ValueError):
+        equity.equity([aces_full])
+    with pytest.raises(ValueError):
+        equity.equity([aces_full, aces_full])
+    with pytest.raises(ValueError):
+        equity.equity([aces_full, seven_high], discards=[[], []])
+    with pytest.raises(ValueError):
+        equity.equity([aces_full, seven_high], variant=equity.DRAW, discards=[aces_full[:4], []])
+    with pytest.raises(ValueError):
+        equity.equity([[]] * 7, variant=equity.DRAW)
+
+
+def test_equity_reproducible_across_chunk_sizes():
+    hands = [[Card("q", "h"), Card("q", "d")], [Card("j", "c")], []]
+    small = equity.equity(hands, trials=5000, chunk_size=1, processes=1, seed=11)
+    large = equity.equity(hands, trials=5000, chunk_size=5000, processes=1, seed=11)
+    assert (small.wins, small.ties, small.losses) == (large.wins, large.ties, large.losses)
+    assert small.trials == large.trials == 5000
+
+
+def enumerate_all(hands, dead=()):
+    # Every deal of the missing cards, one player after another.
+    stub = [card.code for card in CARDS if card not in dead and all(card not in hand for hand in hands)]
+    counts = [[0, 0, 0] for _ in hands]
+    deals = 0
+
+    def deal(player, left, strengths):
+        nonlocal deals
+        if player == len(hands):
+            deals += 1
+            best = max(strengths)
+            for i, strength in enumerate(strengths):
+                counts[i][0 if strength == best and strengths.count(best) == 1 else 1 if strength == best else 2] += 1
+            return
+        codes = [card.code for card in hands[player]]
+        for draw in combinations(left, 5 - len(codes)):
+            rest = [code for code in left if code not in draw]
+            deal(player + 1, rest, strengths + [evaluator.evaluate5(*codes, *draw)])
+
+    deal(0, stub, [])
+    return [[c[i] for c in counts] for i in range(3)], deals
+
+
+@pytest.mark.parametrize(
+    "hands, dead",
+    [
+        ([["a", "h", "a", "d", "k", "s"], ["q", "h", "q", "c", "j", "c", "10", "c"]], []),
+        ([["a", "h", "a", "d", "k", "s", "4", "c"], ["q", "h", "q", "c", "j", "c"]], ["2", "s"]),
+        ([["2", "h", "3", "h", "4", "h", "5", "h"], ["2", "s", "3", "s", "4", "s", "5", "s"]], []),
+        ([["a", "h", "a", "d", "k", "s", "4", "c", "4", "d"], ["q", "h", "q", "c", "j", "c", "9", "s"]], []),
+        (
+            [
+                ["a", "h", "a", "d", "k", "s", "4", "c"],
+                ["q", "h", "q", "c", "j", "c", "10", "c"],
+                ["9", "h", "8", "h", "7", "h", "5", "c"],
+            ],
+            ["6", "h"],
+        ),
+    ],
+)
+@pytest.mark.parametrize("by_rank", [False, True])
+def test_exact_equity_matches_full_enumeration(hands, dead, by_rank, monkeypatch):
+    # Count the last player's completions from the table, then by rank.
+    cost = equity._enumeration_cost
+    monkeypatch.setattr(equity, "_enumeration_cost", lambda *args: (cost(*args)[0], by_rank))
+    hands = [[Card(hand[i], hand[i + 1]) for i in range(0, len(hand), 2)] for hand in hands]
+    dead = [Card(dead[i], dead[i + 1]) for i in range(0, len(dead), 2)]
+    result = equity.exact_equity(hands, dead=dead, chunk_size=5, processes=1)
+    (wins, ties, losses), deals = enumerate_all(hands, dead)
+    assert (result.wins, result.ties, result.losses, result.trials) == (wins, ties, losses, deals)
+
+
+def test_exact_equity_unknown_hand_heads_up():
+    # Against a hand with no known cards every completion of the other is counted by
+    # rank, so even this 30-billion-deal spot takes seconds.
+    aces = [Card("a", "s"), Card("a", "h")]
+    start = time.perf_counter()
+    result = equity.exact_equity([[], aces], processes=1)
+    elapsed = time.perf_counter() - start
+    assert result.trials == comb(50, 5) * comb(45, 3)
+    assert result.wins == [1938035180, 28126779556]
+    assert result.ties == [389664, 389664]
+    assert elapsed < 20
+
+
+def test_exact_equity_heads_up():
+    hands = [[Card("a", "h"), Card("k", "h")], [Card("q", "s"), Card("q", "d")]]
+    result = equity.exact_equity(hands, chunk_size=2000)
+    assert result.trials == comb(48, 3) * comb(45, 3)
+    for player in range(2):
+        total = result.win_fraction(player) + result.tie_fraction(player) + result.loss_fraction(player)
+        assert total == 1
+    assert result.wins[0] == result.losses[1]
+    assert result.ties[0] == result.ties[1]
+    # The pair is ahead of the suited overcards.
+    assert Fraction(1, 4) < result.win_fraction(0) < Fraction(1, 3)
+
+
+def test_exact_equity_independent_of_chunks_and_processes():
+    hands = [[Card("a", "h"), Card("7", "c"), Card("7", "d")], [Card("k", "s"), Card("k", "h"), Card("2", "c")]]
+    serial = equity.exact_equity(hands, chunk_size=10_000, processes=1)
+    parallel = equity.exact_equity(hands, chunk_size=50, processes=2)
+    assert (serial.wins, serial.ties, serial.losses, serial.trials) == (
+        parallel.wins,
+        parallel.ties,
+        parallel.losses,
+        parallel.trials,
+    )
+
+
+def test_exact_equity_draw_discards(aces_full, seven_high):
+    result = equity.exact_equity(
+        [aces_full, seven_high], variant=equity.DRAW, discards=[aces_full[:1], seven_high[1:2]], processes=1
+    )
+    kept = [aces_full[1:], [seven_high[0], *seven_high[2:]]]
+    (wins, ties, losses), deals = enumerate_all(kept, [aces_full[0], seven_high[1]])
+    assert (result.wins, result.ties, result.losses, result.trials) == (wins, ties, losses, deals)
+
+
+def test_exact_equity_invalid_input(aces_full):
+    with pytest.raises(ValueError):
+        equity.exact_equity([aces_full])
+    with pytest.raises(ValueError):
+        equity.exact_equity([aces_full, []], chunk_size=0)
@@ -0,0 +1,80 @@
+import os
+import random
+
+import pytest
+
+import eval_cache
+import evaluator
+from poker_game import CARDS, PokerHand
+
+
+@pytest.fixture(autouse=True)
+def no_cache():
+    yield
+    eval_cache.disable()
+
+
+def test_hand_key_ignores_order():
+    cards = random.Random(0).sample(CARDS, 7)
+    assert eval_cache.hand_key(cards) == eval_cache.hand_key(reversed(cards))
+    assert eval_cache.hand_key(cards[:5]) != eval_cache.hand_key(cards[1:6])
+    assert eval_cache.hand_key(CARDS) == (1 << 52) - 1
+
+
+def test_cached_strengths_match_evaluator():
+    cache = eval_cache.enable(1000)
+    rng = random.Random(1)
+    deals = [rng.sample(CARDS, rng.choice((5, 7))) for _ in range(200)]
+    for cards in deals + [list(reversed(cards)) for cards in deals]:
+        assert PokerHand(list(cards)).best_hand() == evaluator.hand_value(evaluator.evaluate([c.code for c in cards]))
+    assert cache.misses == len(deals)
+    assert cache.hits == len(deals)
+    assert cache.hit_rate == 0.5
+
+
+def test_capacity_evicts_least_recently_used():
+    cache = eval_cache.EvaluationCache(2)
+    a, b, c = (PokerHand(CARDS[i : i + 5]) for i in (0, 5, 10))
+    cache.strength(a)
+    cache.strength(b)
+    cache.strength(a)
+    cache.strength(c)
+    assert len(cache) == 2
+    assert (cache.hits, cache.misses) == (1, 3)
+    cache.strength(a)
+    cache.strength(b)
+    assert (cache.hits, cache.misses) == (2, 4)
+
+    cache.resize(1)
+    assert len(cache) == 1
+    with pytest.raises(ValueError):
+        cache.resize(0)
+    cache.clear()
+    assert (len(cache), cache.hits, cache.misses) == (0, 0, 0)
+
+
+def test_enable_disable_and_caching():
+    assert eval_cache.current() is None
+    cache = eval_cache.enable(10)
+    assert eval_cache.enable(20) is cache
+    assert cache.capacity == 20
+    with eval_cache.caching(5) as inner:
+        assert eval_cache.current() is inner
+        assert PokerHand._cache is inner
+    assert eval_cache.current() is cache
+    eval_cache.disable()
+    assert PokerHand._cache is None
+
+
+@pytest.mark.skipif(not hasattr(os, "fork"), reason="needs fork")
+def test_forked_child_starts_empty():
+    cache = eval_cache.enable(10)
+    PokerHand(CARDS[:5]).strength
+    read, write = os.pipe()
+    pid = os.fork()
+    if pid == 0:
+        os.write(write, bytes([len(cache), cache.misses]))
+        os._exit(0)
+    os.waitpid(pid, 0)
+    assert os.read(read, 2) == bytes([0, 0])
+    assert (len(cache), cache.misses) == (1, 1)
@@ -0,0 +1,124 @@
+import random
+from collections import Counter
+from itertools import combinations
+
+import pytest
+
+import evaluator
+from poker_game import CARDS, Card, PokerHand
+
+
+def codes_for(cards):
+    return [card.code for card in cards]
+
+
+def test_number_of_hand_classes():
+    assert len(evaluator.HAND_VALUES) - 1 == evaluator.NUM_HAND_CLASSES
+    assert Counter(evaluator.CATEGORIES[1:]) == {
+        evaluator.HIGH_CARD: 1277,
+        evaluator.ONE_PAIR: 2860,
+        evaluator.TWO_PAIR: 858,
+        evaluator.THREE_OF_A_KIND: 858,
+        evaluator.STRAIGHT: 10,
+        evaluator.FLUSH: 1277,
+        evaluator.FULL_HOUSE: 156,
+        evaluator.FOUR_OF_A_KIND: 156,
+        evaluator.STRAIGHT_FLUSH: 9,
+        evaluator.ROYAL_FLUSH: 1,
+    }
+
+
+def test_categories_are_ordered_by_strength():
+    assert evaluator.CATEGORIES[1:] == sorted(evaluator.CATEGORIES[1:])
+
+
+def test_all_five_card_hands():
+    codes = [card.code for card in CARDS]
+    counts = Counter(evaluator.CATEGORIES[evaluator.evaluate5(*hand)] for hand in combinations(codes, 5))
+    assert counts == {
+        evaluator.HIGH_CARD: 1302540,
+        evaluator.ONE_PAIR: 1098240,
+        evaluator.TWO_PAIR: 123552,
+        evaluator.THREE_OF_A_KIND: 54912,
+        evaluator.STRAIGHT: 10200,
+        evaluator.FLUSH: 5108,
+        evaluator.FULL_HOUSE: 3744,
+        evaluator.FOUR_OF_A_KIND: 624,
+        evaluator.STRAIGHT_FLUSH: 36,
+        evaluator.ROYAL_FLUSH: 4,
+    }
+
+
+def test_card_code_matches_card():
+    for card in CARDS:
+        assert card.code == evaluator.card_code(card.rank, card.suit)
+
+
+def test_royal_flush_is_strongest():
+    cards = [Card("a", "s"), Card("k", "s"), Card("q", "s"), Card("j", "s"), Card("10", "s")]
+    assert evaluator.evaluate(codes_for(cards)) == evaluator.NUM_HAND_CLASSES
+
+
+def test_worst_hand_is_weakest():
+    cards = [Card("7", "s"), Card("5", "h"), Card("4", "s"), Card("3", "d"), Card("2", "s")]
+    assert evaluator.evaluate(codes_for(cards)) == 1
+
+
+def test_wheel_is_lowest_straight():
+    wheel = [Card("a", "h"), Card("2", "c"), Card("3", "d"), Card("4", "s"), Card("5", "h")]
+    six_high = [Card("6", "h"), Card("2", "c"), Card("3", "d"), Card("4", "s"), Card("5", "h")]
+    ace_high = [Card("a", "h"), Card("k", "c"), Card("q", "d"), Card("j", "s"), Card("9", "h")]
+    wheel_strength = evaluator.evaluate(codes_for(wheel))
+    assert evaluator.hand_value(wheel_strength) == (evaluator.STRAIGHT, 5, -1, -1, -1, -1)
+    assert evaluator.evaluate(codes_for(ace_high)) < wheel_strength < evaluator.evaluate(codes_for(six_high))
+
+
+def test_four_of_a_kind_kicker():
+    king_kicker = [Card("a", "h"), Card("a", "d"), Card("a", "c"), Card("a", "s"), Card("k", "h")]
+    queen_kicker = [Card("a", "h"), Card("a", "d"), Card("a", "c"), Card("a", "s"), Card("q", "h")]
+    assert PokerHand(queen_kicker) < PokerHand(king_kicker)
+    assert PokerHand(king_kicker).best_hand() == (evaluator.FOUR_OF_A_KIND, 14, 13, -1, -1, -1)
+
+
+def test_one_pair_value_tuple():
+    cards = [Card("7", "h"), Card("7", "d"), Card("a", "c"), Card("k", "h"), Card("q", "d")]
+    assert PokerHand(cards).best_hand() == (evaluator.ONE_PAIR, 7, 14, 13, 12, -1)
+
+
+def test_seven_cards_match_best_subset():
+    rng = random.Random(7)
+    for size in (6, 7):
+        for _ in range(3000):
+            codes = codes_for(rng.sample(CARDS, size))
+            assert evaluator.evaluate(codes) == max(evaluator.evaluate5(*hand) for hand in combinations(codes, 5))
+
+
+def test_seven_card_flush_beats_pairs():
+    cards = [
+        Card("a", "h"), Card("9", "h"), Card("7", "h"), Card("4", "h"), Card("2", "h"), Card("a", "d"), Card("9", "c"),
+    ]
+    assert evaluator.category(evaluator.evaluate(codes_for(cards))) == evaluator.FLUSH
+
+
+def test_seven_card_full_house_from_two_trips():
+    cards = [
+        Card("k", "h"), Card("k", "d"), Card("k", "c"), Card("q", "s"), Card("q", "h"), Card("q", "d"), Card("2", "h"),
+    ]
+    assert evaluator.hand_value(evaluator.evaluate(codes_for(cards))) == (evaluator.FULL_HOUSE, 13, 12, -1, -1, -1)
+
+
+def test_evaluate_rejects_bad_sizes():
+    with pytest.raises(ValueError):
+        evaluator.evaluate(codes_for(CARDS[:4]))
+    with pytest.raises(ValueError):
+        evaluator.evaluate(codes_for(CARDS[:8]))
+
+
+def test_seven_card_poker_hand():
+    cards = [
+        Card("a", "s"), Card("k", "s"), Card("q", "s"), Card("j", "s"), Card("10", "s"), Card("2", "h"), Card("3", "d"),
+    ]
+    seven = PokerHand(cards)
+    assert seven.category == PokerHand.ROYAL_FLUSH
+    assert sorted(seven.best_five()) == sorted(cards[:5])
+    assert seven == PokerHand(cards[:5])
@@ -0,0 +1,85 @@
+import random
+
+import pytest
+
+import hand_history
+from hand_history import BOARD, DEALT, DISCARD, SHOWDOWN, WINNER, HandHistory, HandHistoryWriter
+from poker_game import PokerEngine
+
+
+def play_games(path, games, **engine_args):
+    results = []
+    with HandHistoryWriter(str(path)) as writer:
+        engine = PokerEngine(player_names=["Ann", "Bob", "Cy"], rng=random.Random(1), history=writer, **engine_args)
+        for _ in range(games):
+            results.append(engine.play())
+    return results
+
+
+def test_engine_writes_draw_games(tmp_path):
+    path = tmp_path / "games.phh"
+    with HandHistoryWriter(str(path)) as writer:
+        engine = PokerEngine(True, ["Ann", "Bob"], rng=random.Random(2), history=writer)
+        result = engine.play(lambda player, hand: sorted(hand._cards)[:2])
+
+    with HandHistory(str(path)) as history:
+        records = list(history)
+        assert [record.kind for record in records] == [DEALT, DEALT, DISCARD, DISCARD, SHOWDOWN, SHOWDOWN]
+        assert all(record.game == 0 for record in records)
+        assert records[0].cards == tuple(card.id for card in result.dealt[0])
+        assert records[3].cards == tuple(card.id for card in result.discards[1])
+        showdown = records[4:]
+        assert [record.strength for record in showdown] == result.strengths
+        assert [i for i, record in enumerate(showdown) if record.is_winner] == result.winners
+
+
+def test_holdem_board_and_slicing(tmp_path):
+    path = tmp_path / "games.phh"
+    results = play_games(path, 20, holdem=True)
+    with HandHistory(str(path)) as history:
+        # Three dealt, one board and three showdown records per game.
+        assert len(history) == 20 * 7
+        board = history[3]
+        assert board.kind == BOARD and board.player == hand_history.NO_PLAYER
+        assert board.cards == tuple(card.id for card in results[0].board)
+        assert history[-1].game == 19
+        assert history[7:14] == list(history)[7:14]
+        assert history[::7] == [history[i] for i in range(0, 140, 7)]
+        with pytest.raises(IndexError):
+            history[140]
+
+
+def test_append_and_partial_record(tmp_path):
+    path = tmp_path / "games.phh"
+    play_games(path, 5)
+    with open(path, "ab") as f:
+        f.write(b"\x01\x02\x03")
+    with HandHistory(str(path)) as history:
+        assert len(history) == 30
+    play_games(path, 5)
+    with HandHistory(str(path)) as history:
+        assert len(history) == 60
+        # Appended games are numbered on from the last game in the file.
+        assert [record.game for record in history[30:36]] == [5, 5, 5, 5, 5, 5]
+        assert history[-1].game == 9
+
+
+def test_rejects_other_files(tmp_path):
+    path = tmp_path / "other.bin"
+    path.write_bytes(b"not a hand history")
+    with pytest.raises(ValueError):
+        HandHistory(str(path))
+    with pytest.raises(ValueError):
+        HandHistoryWriter(str(path))
+
+
+def test_numpy_arrays(tmp_path):
+    np = pytest.importorskip("numpy")
+    path = tmp_path / "games.phh"
+    results = play_games(path, 30)
+    with HandHistory(str(path)) as history:
+        records = history.arrays()
+        showdown = records[records["kind"] == SHOWDOWN]
+        assert showdown["strength"].tolist() == [strength for result in results for strength in result.strengths]
+        assert int(np.count_nonzero(showdown["flags"] & WINNER)) == sum(len(result.winners) for result in results)
+        del records, showdown
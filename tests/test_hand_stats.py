@@ -0,0 +1,57 @@
+import random
+
+import evaluator
+import simulate
+from hand_stats import HandStatistics
+from poker_game import Card, PokerEngine, PokerHand
+
+
+def test_showdown_counts():
+    stats = HandStatistics()
+    pair = PokerHand([Card("q", "h"), Card("q", "d"), Card("9", "c"), Card("4", "h"), Card("2", "d")]).strength
+    high = PokerHand([Card("k", "h"), Card("j", "d"), Card("9", "s"), Card("4", "c"), Card("2", "h")]).strength
+    stats.add_showdown([pair, high], [0])
+    stats.add_showdown([pair, pair], [0, 1])
+    assert stats.games == 2 and stats.hands == 4
+    assert stats.categories[evaluator.ONE_PAIR] == 3
+    assert stats.frequency(evaluator.HIGH_CARD) == 0.25
+    assert stats.win_rate(evaluator.ONE_PAIR) == 1 / 3
+    assert stats.tie_rate(evaluator.ONE_PAIR) == 2 / 3
+    assert stats.win_rate(evaluator.FLUSH) == 0.0
+
+
+def test_draw_tracking():
+    engine = PokerEngine(True, ["Ann", "Bob", "Cy"], rng=random.Random(8))
+    stats = HandStatistics()
+    changes = 0
+    for _ in range(300):
+        result = engine.play(simulate.keep_pairs)
+        stats.add_game(result, draw=True)
+        for cards, hand in zip(result.dealt, result.hands):
+            changes += PokerHand(list(cards)).category < hand.category
+    assert sum(map(sum, stats.draws)) == 900
+    assert sum(stats.improved) == changes
+    assert 0 < stats.improvement_rate() < 1
+    drawn_pairs = sum(stats.draws[evaluator.ONE_PAIR])
+    assert stats.category_change_rate(evaluator.ONE_PAIR, evaluator.ONE_PAIR) * drawn_pairs == (
+        stats.draws[evaluator.ONE_PAIR][evaluator.ONE_PAIR]
+    )
+
+
+def test_merge_matches_single_stream():
+    engine = PokerEngine(True, ["Ann", "Bob"], rng=random.Random(9))
+    results = [engine.play(simulate.keep_pairs) for _ in range(200)]
+    whole = HandStatistics()
+    first = HandStatistics()
+    second = HandStatistics()
+    for i, result in enumerate(results):
+        whole.add_game(result, draw=True)
+        (first if i < 120 else second).add_game(result, draw=True)
+    first.merge(second)
+    assert vars(first) == vars(whole)
+
+
+def test_simulation_summary_stats():
+    summary = simulate.simulate(600, 3, draw=True, policy="keep-pairs", seed=2, processes=2, chunk_size=256)
+    assert summary.stats.games == 600
+    assert sum(summary.stats.wins) == sum(summary.seat_wins)
@@ -0,0 +1,96 @@
+import io
+import random
+
+import pytest
+
+import instrumentation
+from poker_game import Deck, PokerEngine, PokerHand
+
+
+@pytest.fixture
+def instrumented():
+    instrumentation.enable()
+    yield
+    instrumentation.disable()
+
+
+def test_disabled_by_default():
+    assert not instrumentation.enabled()
+    assert "wrapper" not in PokerHand.evaluate.__code__.co_name
+
+
+def test_counts_by_phase(instrumented):
+    engine = PokerEngine(True, ["Ann", "Bob", "Cy"], rng=random.Random(1))
+    results = [engine.play(lambda player, hand: hand._cards[: len(player._name) - 1]) for _ in range(20)]
+    snap = instrumentation.snapshot()
+    assert snap.count("game") == 20
+    assert snap.count("redeal") == 20
+    assert snap.count("deal", "deal") == 20 * 15
+    assert snap.count("deal", "draw") == 20 * (2 + 2 + 1)
+    # Hands are only evaluated when the showdown first reads their strength.
+    assert snap.count("evaluate") == snap.count("evaluate", "showdown") == 60
+    assert snap.seconds("game") > snap.seconds("evaluate") > 0
+    assert "draw" in snap.format()
+
+
+def test_stud_game_has_no_other_phase(instrumented):
+    engine = PokerEngine(False, ["Ann", "Bob", "Cy"], rng=random.Random(3))
+    for _ in range(20):
+        engine.play()
+    snap = instrumentation.snapshot()
+    assert snap.count("redeal", "deal") == 20
+    # Only the game itself runs outside the deal and showdown phases.
+    assert [event for phase, event in snap.counts if phase == "other"] == ["game"]
+    assert snap.seconds("game", "other") > 0
+
+
+def test_snapshot_difference_and_reset(instrumented):
+    hands = [PokerHand(Deck(random.Random(seed)).random_deal(5)) for seed in range(4)]
+    sorted(hands)
+    assert instrumentation.snapshot().count("evaluate") == 4
+    before = instrumentation.snapshot()
+    sorted(hands)
+    delta = instrumentation.snapshot() - before
+    assert delta.count("compare", "other") >= 3
+    assert delta.count("evaluate") == 0
+    assert delta.as_dict()["events"]["other.compare"]["count"] == delta.count("compare")
+    instrumentation.reset()
+    assert instrumentation.snapshot().count("compare") == 0
+
+
+def test_holdem_board_evaluations(instrumented):
+    engine = PokerEngine(player_names=["Ann", "Bob"], rng=random.Random(2), holdem=True)
+    engine.play()
+    snap = instrumentation.snapshot()
+    assert snap.count("evaluate", "deal") == 2 * 3
+    assert snap.count("deal", "deal") == 9
+
+
+def test_disable_restores_methods():
+    evaluate = PokerHand.evaluate
+    rank_hands = PokerEngine.__dict__["rank_hands"]
+    instrumentation.enable()
+    instrumentation.enable()
+    assert PokerHand.evaluate is not evaluate
+    assert PokerEngine.rank_hands([3, 5]) == [[1], [0]]
+    instrumentation.disable()
+    assert PokerHand.evaluate is evaluate
+    assert PokerEngine.__dict__["rank_hands"] is rank_hands
+
+
+def test_periodic_dump(instrumented):
+    out = io.StringIO()
+    with instrumentation.PeriodicDump(0.01, out):
+        engine = PokerEngine(False, ["Ann", "Bob"], rng=random.Random(3))
+        while "game" not in out.getvalue():
+            engine.play()
+    assert "since reset" in out.getvalue()
+
+
+def test_profile_hook():
+    out = io.StringIO()
+    with instrumentation.profile(out, limit=5, memory=True):
+        PokerEngine(False, ["Ann", "Bob"], rng=random.Random(4)).play()
+    report = out.getvalue()
+    assert "function calls" in report
+    assert "allocations" in report
@@ -1,5 +1,10 @@
+import heapq
+import pickle
+import random
+
 import pytest
-from poker_game import Card, PokerHand, Deck, Player, PokerGame
+import evaluator
+from poker_game import CARDS, Card, PokerHand, Deck, Player, PokerEngine, PokerGame, format_hand
 
 
 @pytest.fixture
@@ -434,6 +439,33 @@ def test_card_comparison():
     assert not (card1.rank < card2.rank)
 
 
+def test_card_interned():
+    assert Card("a", "h") is Card("a", "h")
+    assert Card("10", "c") in CARDS
+    assert pickle.loads(pickle.dumps(Card("q", "d"))) is Card("q", "d")
+
+
+def test_card_slots():
+    card = Card("a", "h")
+    with pytest.raises(AttributeError):
+        card.extra = 1  # type: ignore
+
+
+def test_card_invalid():
+    with pytest.raises(ValueError):
+        Card("1", "h")
+    with pytest.raises(ValueError):
+        Card("a", "x")
+
+
+def test_card_ids():
+    assert len(CARDS) == 52
+    assert [card.id for card in CARDS] == list(range(52))
+    assert str(CARDS[0]) == "2♣"
+    assert str(CARDS[51]) == "A♠"
+    assert all(CARDS[card.id] is card for card in CARDS)
+
+
 def test_poker_hand_royal_flush(sample_cards_royal_flush):
     hand = PokerHand(sample_cards_royal_flush)
     assert hand._hand_value[0] == 10  # ROYAL_FLUSH
@@ -524,6 +556,46 @@ def test_deck_reset():
     assert len(deck._dealt) == 0
 
 
+def test_deck_deal_all_cards():
+    deck = Deck()
+    for _ in range(2):
+        cards = deck.random_deal(52)
+        assert len(set(cards)) == 52
+        assert deck.cards_left == 0
+        with pytest.raises(ValueError):
+            deck.random_deal_one()
+        deck.reset_deck()
+        assert deck.cards_left == 52
+
+
+def test_deck_is_dealt():
+    deck = Deck()
+    hand = deck.random_deal(5)
+    assert all(deck.is_dealt(card) for card in hand)
+    assert sum(deck.is_dealt(card) for card in CARDS) == 5
+    assert deck._dealt == [card.id for card in hand]
+    deck.reset_deck()
+    assert not any(deck.is_dealt(card) for card in CARDS)
+
+
+def test_deck_deal_card():
+    deck = Deck()
+    card = Card("a", "s")
+    assert deck.deal_card(card) is card
+    assert deck.is_dealt(card)
+    with pytest.raises(ValueError):
+        deck.deal_card(card)
+    assert card not in deck.random_deal(51)
+
+
+def test_deck_over_deal():
+    deck = Deck()
+    deck.random_deal(50)
+    with pytest.raises(ValueError):
+        deck.random_deal(3)
+    assert deck.cards_left == 2
+
+
 def test_player_creation():
     player = Player("Test Player")
     assert player._name == "Test Player"
@@ -579,6 +651,20 @@ def test_poker_game_draw_mode(mock_draw_input):
     assert len(game._players) == 2
 
 
+def test_poker_game_advisor_loaded_by_first_hint(mock_draw_input):
+    game = PokerGame()
+    assert game._advisor is None
+    game.deal_cards(5)
+    game.show_discard_hint(next(iter(game._players)))
+    assert game._advisor is not None
+
+
+def test_poker_game_stud_has_no_advisor(mock_input):
+    game = PokerGame()
+    game.deal_cards(5)
+    assert game._advisor is None
+
+
 def test_poker_game_winner(mock_input):
     game = PokerGame()
     game.deal_cards(5)
@@ -809,3 +895,200 @@ def test_poker_hand_not_equal(sample_cards_royal_flush, sample_cards_four_kind):
     four_kind = PokerHand(sample_cards_four_kind)
     # Different hand types are not equal
     assert royal_flush != four_kind
+
+
+def test_poker_hand_sorting(
+    sample_cards_royal_flush, sample_cards_flush, sample_cards_one_pair, sample_cards_high_card
+):
+    royal_flush = PokerHand(sample_cards_royal_flush)
+    flush = PokerHand(sample_cards_flush)
+    one_pair = PokerHand(sample_cards_one_pair)
+    high_card = PokerHand(sample_cards_high_card)
+    assert sorted([flush, high_card, royal_flush, one_pair]) == [high_card, one_pair, flush, royal_flush]
+    assert heapq.nlargest(2, [flush, high_card, royal_flush, one_pair]) == [royal_flush, flush]
+
+
+def test_poker_hand_hashable(tied_royal_flush_hearts, tied_royal_flush_spades, sample_cards_flush):
+    hands = {PokerHand(tied_royal_flush_hearts), PokerHand(tied_royal_flush_spades), PokerHand(sample_cards_flush)}
+    assert len(hands) == 2
+
+
+def test_poker_hand_strength_decodes(sample_cards_full_house):
+    hand = PokerHand(sample_cards_full_house)
+    assert hand.category == PokerHand.FULL_HOUSE
+    assert hand._hand_value == (PokerHand.FULL_HOUSE, 14, 13, -1, -1, -1)
+    assert hand.get_hand[0] == PokerHand.FULL_HOUSE
+
+
+def test_poker_game_seeded_deal(monkeypatch):
+    dealt = []
+    for _ in range(2):
+        inputs = iter(["n", "3", "Player1", "Player2", "Player3"])
+        monkeypatch.setattr("builtins.input", lambda _: next(inputs))
+        game = PokerGame(rng=random.Random(123))
+        game.deal_cards(5)
+        dealt.append([hand.get_hand for hand in game._players.values()])
+    assert dealt[0] == dealt[1]
+
+
+def test_engine_stud_game():
+    engine = PokerEngine(False, ["Ann", "Bob", "Cy"], rng=random.Random(1))
+    result = engine.play()
+    assert [player._name for player in result.players] == ["Ann", "Bob", "Cy"]
+    assert all(len(cards) == 5 for cards in result.dealt)
+    assert result.discards == [[], [], []]
+    assert len({card for cards in result.dealt for card in cards}) == 15
+    best = max(result.strengths)
+    assert result.winners == [i for i, strength in enumerate(result.strengths) if strength == best]
+
+
+def test_engine_draw_game_with_discard_lists():
+    engine = PokerEngine(True, ["Ann", "Bob"], rng=random.Random(2))
+    first = engine.play()
+    # Replaying with a fresh engine and the same seed deals the same cards.
+    engine = PokerEngine(True, ["Ann", "Bob"], rng=random.Random(2))
+    result = engine.play([first.dealt[0][:3], []])
+    assert result.dealt == first.dealt
+    assert result.discards == [first.dealt[0][:3], []]
+    assert not set(result.discards[0]) & set(result.hands[0]._cards)
+    assert result.hands[1]._cards == result.dealt[1]
+
+
+def test_engine_draw_game_with_policy():
+    def trade_lowest(player, hand):
+        return sorted(hand._cards)[:2]
+
+    engine = PokerEngine(True, ["Ann", "Bob", "Cy"], rng=random.Random(3))
+    for _ in range(50):
+        result = engine.play(trade_lowest)
+        assert all(len(cards) == 2 for cards in result.discards)
+        assert all(len(hand._cards) == 5 for hand in result.hands)
+        used = [card for cards in result.dealt for card in cards]
+        used += [card for hand in result.hands for card in hand._cards if card not in used]
+        assert len(used) == len(set(used)) == 21
+
+
+def test_engine_invalid_games():
+    with pytest.raises(ValueError):
+        PokerEngine(False, ["Ann"])
+    with pytest.raises(ValueError):
+        PokerEngine(True, [str(i) for i in range(7)])
+    with pytest.raises(ValueError):
+        PokerEngine(False, ["Ann", "Bob"]).play([[], []])
+    engine = PokerEngine(True, ["Ann", "Bob"])
+    with pytest.raises(ValueError):
+        engine.play(lambda player, hand: hand._cards[:4])
+    with pytest.raises(ValueError):
+        engine.play(lambda player, hand: [next(card for card in CARDS if card not in hand._cards)])
+
+
+def test_engine_holdem_game():
+    names = [f"Player{i}" for i in range(10)]
+    engine = PokerEngine(player_names=names, rng=random.Random(4), holdem=True)
+    for _ in range(50):
+        result = engine.play()
+        assert len(result.board) == 5
+        assert all(len(cards) == 2 for cards in result.dealt)
+        used = result.board + [card for cards in result.dealt for card in cards]
+        assert len(set(used)) == 25
+        for hole, hand in zip(result.dealt, result.hands):
+            assert hand._cards == hole + result.board
+            assert hand == PokerHand(hole + result.board)
+        best = max(result.strengths)
+        assert result.winners == [i for i, strength in enumerate(result.strengths) if strength == best]
+
+
+def test_engine_holdem_streets():
+    engine = PokerEngine(player_names=["Ann", "Bob"], rng=random.Random(5), holdem=True)
+    engine.deal_hole_cards()
+    assert all(hand is None for hand in engine._players.values())
+    for board_size in (3, 4, 5):
+        engine.deal_street()
+        assert len(engine._board) == board_size
+        for player, hand in engine._players.items():
+            assert hand.strength == PokerHand(engine._hole_cards[player] + engine._board).strength
+    with pytest.raises(ValueError):
+        engine.deal_street()
+    with pytest.raises(ValueError):
+        PokerEngine(True, ["Ann", "Bob"], holdem=True)
+    with pytest.raises(ValueError):
+        PokerEngine(player_names=[str(i) for i in range(11)], holdem=True)
+
+
+def test_poker_game_holdem_mode(monkeypatch):
+    inputs = iter(["h", "2", "Player1", "Player2"])
+    monkeypatch.setattr("builtins.input", lambda _: next(inputs))
+    game = PokerGame()
+    assert game._holdem and not game._draw
+
+
+def test_engine_rank_hands():
+    rng = random.Random(6)
+    deck = Deck(rng)
+    hands = []
+    for _ in range(500):
+        deck.reset_deck()
+        hands.append(PokerHand(deck.random_deal(5)))
+    hands.append(None)
+    ranking = PokerEngine.rank_hands(hands)
+    assert sorted(i for group in ranking for i in group) == list(range(500))
+    strengths = [hands[group[0]].strength for group in ranking]
+    assert strengths == sorted(set(strengths), reverse=True)
+    assert all(hands[i] == hands[group[0]] for group in ranking for i in group)
+    assert PokerEngine.rank_hands(hands, 3) == ranking[:3]
+    assert PokerEngine.rank_hands([5, 9, 5, 1], 2) == [[1], [0, 2]]
+    assert PokerEngine.rank_hands([None, None]) == []
+
+
+def test_engine_ranking(tied_royal_flush_hearts, tied_royal_flush_spades, sample_cards_flush):
+    engine = PokerEngine(False, ["Ann", "Bob", "Cy"])
+    ann, bob, cy = engine._players
+    engine._players[ann] = PokerHand(sample_cards_flush)
+    engine._players[bob] = PokerHand(tied_royal_flush_hearts)
+    engine._players[cy] = PokerHand(tied_royal_flush_spades)
+    assert engine.ranking() == [[bob, cy], [ann]]
+    assert engine.winners() == {bob, cy}
+
+
+def test_format_hand(sample_cards_full_house, sample_cards_two_pair):
+    assert format_hand(PokerHand(sample_cards_full_house)) == "Full House: A♥ A♦ A♣ K♥ K♦"
+    assert format_hand(PokerHand(sample_cards_two_pair[::-1])) == "Two Pair: A♦ A♥ K♥ K♣ Q♦"
+    holdem = sample_cards_two_pair + [Card("2", "s"), Card("3", "s")]
+    assert format_hand(PokerHand(holdem)) == "Two Pair: A♥ A♦ K♣ K♥ Q♦"
+
+
+def test_poker_hand_incremental_exchange():
+    rng = random.Random(7)
+    deck = Deck(rng)
+    hand = PokerHand(deck.random_deal(5))
+    for _ in range(2000):
+        card = rng.choice(hand._cards)
+        assert card in hand
+        assert hand.remove_card(card.rank, card.suit) is True
+        assert card not in hand
+        assert hand.remove_card(card.rank, card.suit) is False
+        hand.add_card(deck.random_deal_one())
+        if deck.cards_left < 5:
+            deck = Deck(rng)
+            for kept in hand._cards:
+                deck.deal_card(kept)
+        assert hand.strength == PokerHand(list(hand._cards)).strength == evaluator.evaluate(
+            [kept.code for kept in hand._cards]
+        )
+
+
+def test_poker_hand_lazy_evaluation(monkeypatch, sample_add_remove_cards):
+    calls = []
+    evaluate = PokerHand.evaluate
+    monkeypatch.setattr(PokerHand, "evaluate", lambda self: calls.append(1) or evaluate(self))
+    hand = PokerHand(sample_add_remove_cards)
+    assert calls == []
+    assert hand.category == PokerHand.THREE_OF_A_KIND
+    hand.remove_card(13, "h")
+    hand.remove_card(3, "d")
+    hand.add_card(Card("a", "s"))
+    hand.add_card(Card("2", "c"))
+    assert len(calls) == 1
+    assert hand.category == PokerHand.FOUR_OF_A_KIND
+    assert hand > PokerHand([Card("k", "s"), Card("k", "d"), Card("k", "c"), Card("k", "h"), Card("2", "d")])
+    assert len(calls) == 3
@@ -0,0 +1,80 @@
+import random
+from itertools import combinations
+
+import pytest
+
+import evaluator
+import rank_table
+from poker_game import CARDS, PokerHand
+
+
+@pytest.fixture(scope="module")
+def table(tmp_path_factory):
+    path = tmp_path_factory.mktemp("rank_table") / "rank_table.bin"
+    rank_table.build_rank_table(str(path))
+    with rank_table.RankTable(str(path)) as table:
+        yield table
+
+
+def test_hand_index_is_colex_rank():
+    for index, ids in enumerate(sorted(combinations(range(7), 5), key=lambda c: c[::-1])):
+        assert rank_table.hand_index(ids) == index
+    assert rank_table.hand_index(range(47, 52)) == rank_table.NUM_HANDS - 1
+    assert rank_table.hand_index([4, 0, 3, 1, 2]) == 0
+
+
+def test_table_matches_evaluator(table):
+    assert len(table.strengths) == rank_table.NUM_HANDS
+    rng = random.Random(0)
+    for _ in range(5000):
+        hand = rng.sample(CARDS, 5)
+        ids = [card.id for card in hand]
+        strength = evaluator.evaluate([card.code for card in hand])
+        assert table.strength(ids) == strength
+        assert table.category(ids) == evaluator.category(strength)
+
+
+def test_poker_hand_uses_table(table):
+    cards = [CARDS[51], CARDS[47], CARDS[43], CARDS[39], CARDS[35]]
+    PokerHand.use_rank_table(table)
+    try:
+        hand = PokerHand(cards)
+        assert hand.category == PokerHand.ROYAL_FLUSH
+    finally:
+        PokerHand.use_rank_table(None)
+
+
+def test_batch_uses_table(table):
+    np = pytest.importorskip("numpy")
+    import batch_evaluator
+
+    ids = np.argsort(np.random.default_rng(0).random((10000, 52)), axis=1)[:, :5]
+    assert (batch_evaluator.evaluate_batch(ids, table) == batch_evaluator.evaluate_batch(ids)).all()
+
+
+def test_invalid_table(tmp_path):
+    path = tmp_path / "bad.bin"
+    path.write_bytes(b"not a rank table")
+    with pytest.raises(ValueError):
+        rank_table.RankTable(str(path))
+
+
+def test_concurrent_builds_use_their_own_temporary_files(tmp_path, monkeypatch):
+    path = tmp_path / "rank_table.bin"
+    opened = []
+    mkstemp = rank_table.tempfile.mkstemp
+
+    def recording_mkstemp(*args, **kwargs):
+        fd, name = mkstemp(*args, **kwargs)
+        opened.append(name)
+        # Another builder finishing in the middle of this build must not touch our file.
+        if len(opened) == 1:
+            rank_table.build_rank_table(str(path))
+        return fd, name
+
+    monkeypatch.setattr(rank_table.tempfile, "mkstemp", recording_mkstemp)
+    rank_table.build_rank_table(str(path))
+    assert len(set(opened)) == 2
+    assert [p.name for p in tmp_path.iterdir()] == ["rank_table.bin"]
+    with rank_table.RankTable(str(path)) as table:
+        assert len(table.strengths) == rank_table.NUM_HANDS
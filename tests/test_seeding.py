@@ -0,0 +1,41 @@
+import random
+
+from poker_game import Deck
+from seeding import SeedSequence
+
+
+def test_same_seed_same_streams():
+    first = [child.generator().random() for child in SeedSequence(42).spawn(3)]
+    second = [child.generator().random() for child in SeedSequence(42).spawn(3)]
+    assert first == second
+    assert len(set(first)) == 3
+
+
+def test_spawn_continues_numbering():
+    root = SeedSequence(1)
+    children = root.spawn(2) + root.spawn(2)
+    assert [child.spawn_key for child in children] == [(0,), (1,), (2,), (3,)]
+    assert root.n_children_spawned == 4
+    assert children[3].generate_state() == SeedSequence(1).child(3).generate_state()
+
+
+def test_children_differ_from_parent_and_grandchildren():
+    root = SeedSequence(5)
+    child = root.child(0)
+    states = {
+        root.generate_state(),
+        child.generate_state(),
+        child.child(0).generate_state(),
+        root.child(1).generate_state(),
+    }
+    assert len(states) == 4
+
+
+def test_random_entropy():
+    assert SeedSequence().entropy != SeedSequence().entropy
+
+
+def test_deck_with_injected_rng():
+    first = Deck(rng=SeedSequence(9).generator()).random_deal(10)
+    second = Deck(rng=random.Random(SeedSequence(9).generate_state())).random_deal(10)
+    assert first == second
@@ -0,0 +1,159 @@
+import asyncio
+
+from poker_game import Card
+from server import PokerServer
+
+
+async def read_until(reader, prefix):
+    lines = []
+    while True:
+        line = (await reader.readline()).decode().rstrip("\n")
+        assert line, f"connection closed before {prefix}: {lines}"
+        lines.append(line)
+        if line.startswith(prefix):
+            return lines
+
+
+async def join(path, table, variant, seats, name):
+    reader, writer = await asyncio.open_unix_connection(path)
+    await read_until(reader, "WELCOME")
+    writer.write(f"JOIN {table} {variant} {seats} {name}\n".encode())
+    return reader, writer
+
+
+def cards_in(line):
+    # "HAND One Pair: Q♥ Q♦ ..." -> the five cards typed as qh, qd, ...
+    symbols = {symbol: suit for suit, symbol in Card.SUIT_SYMBOLS.items()}
+    return [card[:-1].lower() + symbols[card[-1]] for card in line.split(": ", 1)[1].split()]
+
+
+def test_draw_table(tmp_path):
+    path = str(tmp_path / "poker.sock")
+
+    async def scenario():
+        listener = await PokerServer(seed=1).start(path=path)
+        async with listener:
+            ann = await join(path, "t1", "draw", 2, "Ann")
+            bob = await join(path, "t1", "draw", 2, "Bob")
+            ann_lines = await read_until(ann[0], "TRADE?")
+            await read_until(bob[0], "TRADE?")
+            hand = cards_in(next(line for line in ann_lines if line.startswith("HAND")))
+
+            ann[1].write(b"TRADE zz\n")
+            assert (await read_until(ann[0], "ERROR"))[-1].startswith("ERROR Invalid card")
+            ann[1].write(f"TRADE {hand[0]} {hand[1]}\n".encode())
+            bob[1].write(b"TRADE\n")
+
+            ann_lines = await read_until(ann[0], "END")
+            bob_lines = await read_until(bob[0], "END")
+            new_hand = cards_in(next(line for line in ann_lines if line.startswith("HAND")))
+            assert hand[0] not in new_hand and hand[2] in new_hand
+            showdown = [line for line in bob_lines if line.startswith("SHOWDOWN")]
+            assert [line.split()[1] for line in showdown] == ["Ann", "Bob"]
+            assert bob_lines[-2].startswith("WINNER")
+            for _, writer in (ann, bob):
+                writer.write(b"QUIT\n")
+                writer.close()
+
+    asyncio.run(scenario())
+
+
+def test_join_errors(tmp_path):
+    path = str(tmp_path / "poker.sock")
+
+    async def scenario():
+        server = PokerServer()
+        listener = await server.start(path=path)
+        async with listener:
+            reader, writer = await join(path, "t1", "draw", 9, "Ann")
+            error = (await read_until(reader, "ERROR"))[-1]
+            assert error == "ERROR There must be 2 to 6 players in a game of 5 card draw."
+            writer.write(b"JOIN t1 poker 2 Ann\n")
+            assert "Unknown variant" in (await read_until(reader, "ERROR"))[-1]
+            writer.write(b"JOIN t1 stud 3 Ann\n")
+            await read_until(reader, "SEATED t1 0 3")
+            other_reader, other_writer = await join(path, "t1", "draw", 3, "Bob")
+            assert "plays stud with 3 seats" in (await read_until(other_reader, "ERROR"))[-1]
+            assert list(server.tables) == ["t1"]
+            for w in (writer, other_writer):
+                w.close()
+
+    asyncio.run(scenario())
+
+
+def test_many_tables(tmp_path):
+    path = str(tmp_path / "poker.sock")
+    num_tables = 150
+
+    async def scenario():
+        server = PokerServer(seed=2)
+        listener = await server.start(path=path)
+        async with listener:
+            # Idle tables wait with one player seated.
+            idle = [await join(path, f"idle{i}", "stud", 2, "Ann") for i in range(num_tables)]
+            clients = []
+            for i in range(num_tables):
+                variant = ("stud", "holdem")[i % 2]
+                for name in ("Ann", "Bob", "Cy"):
+                    clients.append(await join(path, f"t{i}", variant, 3, name))
+            results = await asyncio.gather(*(read_until(reader, "END") for reader, _ in clients))
+            assert all(any(line.startswith("WINNER") for line in lines) for lines in results)
+            assert sum(line.startswith("RIVER") for lines in results for line in lines) == num_tables // 2 * 3
+            assert len(server.tables) == num_tables
+            for _, writer in idle + clients:
+                writer.close()
+
+    asyncio.run(scenario())
+
+
+def test_tcp_table():
+    async def scenario():
+        listener = await PokerServer(seed=3).start(port=0)
+        port = listener.sockets[0].getsockname()[1]
+        async with listener:
+            clients = [await asyncio.open_connection("127.0.0.1", port) for _ in range(2)]
+            for i, (_, writer) in enumerate(clients):
+                writer.write(f"JOIN t holdem 2 P{i}\n".encode())
+            lines = await read_until(clients[0][0], "END")
+            assert sum(line.startswith(("HOLE", "FLOP", "TURN", "RIVER")) for line in lines) == 4
+            for _, writer in clients:
+                writer.close()
+
+    asyncio.run(scenario())
+
+
+def test_disconnect_before_table_fills(tmp_path):
+    path = str(tmp_path / "poker.sock")
+
+    async def wait_for(condition):
+        for _ in range(200):
+            if condition():
+                return
+            await asyncio.sleep(0.01)
+        raise AssertionError("condition never became true")
+
+    async def scenario():
+        server = PokerServer(seed=4)
+        listener = await server.start(path=path)
+        async with listener:
+            # A table left empty is closed.
+            ghost = await join(path, "t1", "stud", 2, "Ghost")
+            await read_until(ghost[0], "SEATED t1 0 2")
+            ghost[1].close()
+            await wait_for(lambda: not server.tables)
+
+            # A player who leaves gives back their seat and is not dealt in.
+            ann = await join(path, "t2", "stud", 3, "Ann")
+            ghost = await join(path, "t2", "stud", 3, "Ghost")
+            await read_until(ghost[0], "SEATED t2 1 3")
+            ghost[1].write(b"QUIT\n")
+            await wait_for(lambda: len(server.tables["t2"].seats) == 1)
+            clients = [ann, await join(path, "t2", "stud", 3, "Bob"), await join(path, "t2", "stud", 3, "Cy")]
+            lines = await read_until(ann[0], "END")
+            showdown = [line.split()[1] for line in lines if line.startswith("SHOWDOWN")]
+            assert showdown == ["Ann", "Bob", "Cy"]
+            assert not any("Ghost" in line for line in lines)
+            for _, writer in clients:
+                writer.close()
+
+    asyncio.run(scenario())
@@ -0,0 +1,103 @@
+import json
+
+import pytest
+
+import simulate
+from hand_history import SHOWDOWN, HandHistory
+from poker_game import Card, GameResult, Player, PokerHand
+
+
+def test_simulate_summary_totals():
+    summary = simulate.simulate(1000, 4, seed=1, processes=1)
+    assert summary.games == 1000
+    assert sum(summary.categories) == 4000
+    assert sum(summary.winning_categories) + summary.tied_games == 1000
+    assert sum(summary.seat_wins) + summary.tied_games == 1000
+
+
+def test_simulate_reproducible_across_processes():
+    games = []
+    serial = simulate.simulate(1200, 3, draw=True, policy="random", seed=5, processes=1, on_game=games.append)
+    parallel_games = []
+    parallel = simulate.simulate(
+        1200, 3, draw=True, policy="random", seed=5, processes=2, chunk_size=256, on_game=parallel_games.append
+    )
+    assert games == parallel_games
+    assert [game["game"] for game in games] == list(range(1200))
+    assert serial.categories == parallel.categories
+    assert serial.seat_wins == parallel.seat_wins
+
+
+def test_summary_wins_leave_out_split_pots():
+    players = [Player("Ann"), Player("Bob"), Player("Cy")]
+    straights = [
+        PokerHand([Card("9", suit), Card("8", "c"), Card("7", "d"), Card("6", "h"), Card("5", "s")])
+        for suit in ("h", "s")
+    ]
+    pair = PokerHand([Card("k", "h"), Card("k", "d"), Card("9", "c"), Card("4", "h"), Card("2", "d")])
+    summary = simulate.SimulationSummary(3)
+    summary.add(GameResult(players, [], [], [*straights, pair], [0, 1]))
+    summary.add(GameResult(players, [], [], [pair, straights[0], pair], [1]))
+    assert summary.winning_categories[PokerHand.STRAIGHT] == 1
+    assert summary.stats.ties[PokerHand.STRAIGHT] == 2
+    assert sum(summary.winning_categories) == summary.games - summary.tied_games == 1
+    assert summary.seat_wins == [0, 1, 0]
+    assert summary.seat_ties == [1, 1, 0]
+
+
+def test_advisor_loaded_on_first_use(monkeypatch):
+    monkeypatch.setattr(simulate, "_advisor", None)
+    simulate.simulate(20, 2, draw=True, policy="keep-pairs", seed=1, processes=1)
+    assert simulate._advisor is None
+    simulate.simulate(20, 2, draw=True, policy="advisor", seed=1, processes=1)
+    assert simulate._advisor is not None
+
+
+def test_keep_pairs_policy():
+    hand = PokerHand([Card("q", "h"), Card("q", "d"), Card("9", "c"), Card("4", "h"), Card("2", "d")])
+    assert simulate.keep_pairs(None, hand) == [Card("2", "d"), Card("4", "h"), Card("9", "c")]
+    straight = PokerHand([Card("9", "h"), Card("8", "c"), Card("7", "d"), Card("6", "s"), Card("5", "h")])
+    assert simulate.keep_pairs(None, straight) == []
+
+
+def test_main_streams_games(tmp_path, capsys):
+    path = tmp_path / "games.jsonl"
+    simulate.main(["--games", "50", "--players", "2", "--seed", "3", "--processes", "1", "--stream", str(path)])
+    lines = path.read_text(encoding="utf-8").splitlines()
+    assert len(lines) == 50
+    game = json.loads(lines[0])
+    assert len(game["hands"]) == 2
+    assert "games/s" in capsys.readouterr().out
+
+
+def test_main_rejects_bad_player_count():
+    with pytest.raises(SystemExit):
+        simulate.main(["--players", "7", "--variant", "draw"])
+
+
+def test_advisor_policy_beats_standing_pat():
+    advisor = simulate.simulate(300, 2, draw=True, policy="advisor", seed=4, processes=1)
+    stand = simulate.simulate(300, 2, draw=True, policy="stand", seed=4, processes=1)
+    assert advisor.categories[PokerHand.HIGH_CARD] < stand.categories[PokerHand.HIGH_CARD]
+
+
+def test_main_writes_hand_history(tmp_path, capsys):
+    path = tmp_path / "games.phh"
+    args = ["--games", "600", "--players", "3", "--variant", "draw", "--policy", "random", "--seed", "2"]
+    simulate.main([*args, "--processes", "2", "--chunk-size", "256", "--history", str(path)])
+    with HandHistory(str(path)) as history:
+        games = [record.game for record in history if record.kind == SHOWDOWN]
+        assert games == sorted(games) and len(games) == 1800
+        assert sum(record.is_winner for record in history) >= 600
+    simulate.main([*args, "--processes", "2", "--chunk-size", "256", "--history", str(path)])
+    with HandHistory(str(path)) as history:
+        games = [record.game for record in history if record.kind == SHOWDOWN]
+        assert games == [game // 3 for game in range(3600)]
+
+
+def test_simulate_with_cache_matches_uncached():
+    plain = simulate.simulate(600, 3, draw=True, policy="keep-pairs", seed=7, processes=1)
+    cached = simulate.simulate(600, 3, draw=True, policy="keep-pairs", seed=7, processes=1, cache=500)
+    assert cached.categories == plain.categories
+    assert cached.seat_wins == plain.seat_wins
+    assert PokerHand._cache is None
@@ -0,0 +1,62 @@
+import io
+import os
+
+from poker_game import PokerGame
+from terminal import CLEAR, Screen
+
+
+class CountingStream(io.StringIO):
+    def __init__(self) -> None:
+        super().__init__()
+        self.writes = 0
+
+    def write(self, text: str) -> int:
+        self.writes += 1
+        return super().write(text)
+
+
+def test_one_write_per_screen(monkeypatch):
+    monkeypatch.setattr("builtins.input", lambda _: "")
+    out = CountingStream()
+    screen = Screen(out, tty=True)
+    screen.print("Ann with", "One Pair")
+    screen.print("Bob", end="")
+    assert out.writes == 0
+    screen.input("Press Enter ...")
+    assert out.writes == 1
+    assert out.getvalue() == "Ann with One Pair\nBob"
+
+
+def test_clear_drops_pending_output():
+    out = io.StringIO()
+    screen = Screen(out, tty=True)
+    screen.print("secret cards")
+    screen.clear()
+    screen.print("next player")
+    screen.flush()
+    assert out.getvalue() == CLEAR + "next player\n"
+
+
+def test_no_tty_never_clears():
+    out = io.StringIO()
+    screen = Screen(out)
+    assert not screen.tty
+    screen.print("cards")
+    screen.clear()
+    screen.flush()
+    assert out.getvalue() == "cards\n"
+
+
+def test_game_clears_without_subprocess(monkeypatch):
+    inputs = iter(["n", "2", "Player1", "Player2"] + [""] * 4)
+    monkeypatch.setattr("builtins.input", lambda _: next(inputs))
+    monkeypatch.setattr(os, "system", lambda command: (_ for _ in ()).throw(AssertionError(command)))
+    out = CountingStream()
+    game = PokerGame(screen=Screen(out, tty=True))
+    game.deal_cards(5)
+    game.show_all_hands()
+    game._screen.flush()
+    assert out.getvalue().count(CLEAR) == 2
+    assert "Player2 with" in out.getvalue()
+    # One write for each of the four screens shown before a prompt, plus the final clear.
+    assert out.writes == 5